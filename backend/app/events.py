@@ -0,0 +1,143 @@
+"""Fan-out of job progress events to the API's SSE streams.
+
+Each API process holds a single pattern subscription to ``job-progress:*`` and
+hands every event to the in-memory queues of the streams watching that job, so
+Redis sees one pub/sub connection per process however many browser tabs are
+open. The number of open streams per process is capped, and so is each
+stream's backlog: a client that reads slower than events arrive skips the
+oldest ones, since every progress event supersedes the previous one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Optional
+
+from redis.exceptions import RedisError
+
+from config.progress import CHANNEL_PREFIX, last_event_key
+
+# How long a new stream waits for the shared subscription to (re)connect.
+CONNECT_TIMEOUT_SECONDS = 2.0
+# Undelivered events kept per stream.
+QUEUE_SIZE = 16
+_RECONNECT_SECONDS = 1.0
+_POLL_SECONDS = 1.0
+
+
+class SubscriberLimitReached(Exception):
+    """The process already serves its maximum number of event streams."""
+
+
+class Subscription:
+    """One stream's view of a job's events; close it when the stream ends."""
+
+    def __init__(self, hub: "ProgressHub", job_id: str) -> None:
+        self.job_id = job_id
+        self._hub = hub
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    async def get(self, timeout: float):
+        """The next event published for the job, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._hub._remove(self)
+
+    def _put(self, event) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()  # drop the oldest; the newest (possibly terminal) event always fits
+        self._queue.put_nowait(event)
+
+
+class ProgressHub:
+    def __init__(self, client_factory: Callable, max_subscribers: int) -> None:
+        self._client_factory = client_factory
+        self.max_subscribers = max_subscribers
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self._count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+
+    async def subscribe(self, job_id: str) -> Subscription:
+        """Register for `job_id`'s events once the shared subscription is live.
+
+        Raises SubscriberLimitReached when the process is full and RedisError
+        when the shared subscription cannot be established.
+        """
+        if self._count >= self.max_subscribers:
+            raise SubscriberLimitReached(f"{self._count} job event streams are already open.")
+        await self._ensure_reader()
+        subscription = Subscription(self, job_id)
+        self._subscriptions.setdefault(job_id, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def _remove(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.job_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.job_id]
+        self._count -= 1
+
+    async def _ensure_reader(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._reader is None or self._reader.done() or self._loop is not loop:
+            self._loop = loop
+            self._ready = asyncio.Event()
+            self._reader = loop.create_task(self._read())
+        try:
+            await asyncio.wait_for(self._ready.wait(), CONNECT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise RedisError("The job progress subscription is not connected.") from None
+
+    def _dispatch(self, channel, data) -> None:
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        job_id = channel[len(CHANNEL_PREFIX) + 1:]
+        for subscription in self._subscriptions.get(job_id, ()):
+            subscription._put(data)
+
+    async def _replay_last_events(self, client) -> None:
+        """Hands every watched job its latest event after a reconnect, since events published meanwhile were lost."""
+        for job_id in list(self._subscriptions):
+            event = await client.get(last_event_key(job_id))
+            if event is not None:
+                self._dispatch(f"{CHANNEL_PREFIX}:{job_id}", event)
+
+    async def _read(self) -> None:
+        reconnecting = False
+        while True:
+            pubsub = None
+            try:
+                client = self._client_factory()
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}:*")
+                if reconnecting:
+                    await self._replay_last_events(client)
+                self._ready.set()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_POLL_SECONDS)
+                    if message is not None:
+                        self._dispatch(message["channel"], message["data"])
+            except RedisError as exc:
+                print(f"Job progress subscription lost: {exc}")
+                self._ready.clear()
+                reconnecting = True
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except RedisError:
+                        pass
+            await asyncio.sleep(_RECONNECT_SECONDS)
@@ -1,30 +1,39 @@
+import os
+import time
 import uuid
+import hashlib
 import json
-import csv
+import asyncio
 import shutil
 import datetime
 from pathlib import Path
 from typing import List, Optional
-from io import StringIO # Import StringIO for in-memory file handling
-from fastapi import FastAPI, File, UploadFile, Form, status, HTTPException
-from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi import FastAPI, File, UploadFile, Form, Request, Response, status, HTTPException
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from celery.states import READY_STATES
 from google.cloud import storage
 from google.auth.exceptions import DefaultCredentialsError
 import google.auth
+import redis.asyncio as aioredis
 import requests
-from google.cloud.exceptions import NotFound
-
-from worker.celery_app import (
-    celery as celery_app,
-    enhance_ppt_task, 
-    generate_slide_plan_task, 
-    build_ppt_from_plan_task
-)
+from redis.exceptions import RedisError
+from google.cloud.exceptions import NotFound, PreconditionFailed
 
 from config import settings
+from config.celery_app import celery as celery_app
+from config.admission import admission, estimate_build, estimate_enhancement, estimate_slide_plan, scan_pptx
+from config.dedup import dedup_index
+from config.feedback import FeedbackStore
+from config.lazy import Lazy
+from config.progress import TERMINAL_STAGES, last_event_key
 from config.storage import LocalStorageClient
+from config.tracing import TRACEPARENT_HEADER, span, start_span
+from .cache import CacheStats, TTLCache
+from .events import ProgressHub, SubscriberLimitReached
 
 # --- Configuration ---
 
@@ -40,7 +49,11 @@ def _create_storage_client() -> storage.Client:
         raise
 
 
-storage_client = _create_storage_client()
+storage_client = Lazy(_create_storage_client)
+# Tasks are sent by name; the worker's pptx/PIL/Gemini stack is never imported here.
+enhance_ppt_task = celery_app.signature("enhance_ppt_task")
+generate_slide_plan_task = celery_app.signature("generate_slide_plan_task")
+build_ppt_from_plan_task = celery_app.signature("build_ppt_from_plan_task")
 GCS_BUCKET_NAME = settings.gcs_bucket_name
 app = FastAPI(title="PPT Studio API")
 
@@ -58,6 +71,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def trace_write_requests(request: Request, call_next):
+    """Opens the root span for uploads and job submissions (config/tracing.py).
+
+    Reads are not traced; status polling would drown the export file.
+    """
+    if request.method not in ("POST", "PUT"):
+        return await call_next(request)
+    request_span = start_span(
+        "http.request", request.headers.get(TRACEPARENT_HEADER),
+        method=request.method, path=request.url.path,
+    )
+    try:
+        response = await call_next(request)
+        request_span.set_attribute("status_code", response.status_code)
+        return response
+    except Exception as exc:
+        request_span.record_error(exc)
+        raise
+    finally:
+        request_span.end()
+
 # --- Pydantic Models & Helper Functions ---
 class Feedback(BaseModel):
     name: Optional[str] = None
@@ -65,6 +101,42 @@ class Feedback(BaseModel):
     feedback_type: str
     message: str
 
+class UploadFileSpec(BaseModel):
+    filename: str
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    # Enhancer sessions only: "ppt_file" or "logo_file".
+    role: Optional[str] = None
+
+class UploadSessionRequest(BaseModel):
+    kind: str  # "enhancer" or "creator"
+    files: List[UploadFileSpec]
+    credits_text: Optional[str] = None
+
+UPLOAD_SESSION_PREFIX = "upload-sessions"
+
+class BulkStatusRequest(BaseModel):
+    job_ids: List[str]
+    include_result: bool = False
+
+MAX_BULK_STATUS_JOBS = 1000
+
+_signer_email_cache = TTLCache(maxsize=1)
+_signed_url_cache = TTLCache(maxsize=settings.signed_url_cache_size)
+signed_url_stats = CacheStats()
+
+
+def _get_signer_email() -> str | None:
+    """Runtime service account email, resolved once and refreshed periodically."""
+    cached = _signer_email_cache.get("email")
+    if cached is not None:
+        return cached or None
+    email = _get_runtime_service_account_email()
+    # Cache failures too (as ""), so a missing metadata server is not retried per request.
+    _signer_email_cache.set("email", email or "", settings.signer_email_refresh_seconds)
+    return email
+
+
 def _get_runtime_service_account_email() -> str | None:
     # Prefer explicit env override if present
     env_email = settings.service_account_email
@@ -93,11 +165,17 @@ def _get_runtime_service_account_email() -> str | None:
 def generate_download_signed_url_v4(blob_name):
     """Generates a secure, temporary URL to download a file from GCS.
     Returns a signed URL string or raises HTTPException with details.
+    URLs are cached per blob until shortly before they expire.
     """
     if settings.use_local_storage:
         raise HTTPException(status_code=501, detail="Signed URLs unavailable in local storage mode")
     if not GCS_BUCKET_NAME:
         raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME environment variable not set.")
+    cached_url = _signed_url_cache.get(blob_name)
+    if cached_url is not None:
+        signed_url_stats.record_hit()
+        return cached_url
+    started = time.perf_counter()
     try:
         bucket = storage_client.bucket(GCS_BUCKET_NAME)
         blob = bucket.blob(blob_name)
@@ -105,13 +183,18 @@ def generate_download_signed_url_v4(blob_name):
         if not blob.exists():
             raise HTTPException(status_code=404, detail=f"File not found: {blob_name}")
         # Ensure we have a signer email when running on Cloud Run without a private key
-        signer_email = _get_runtime_service_account_email()
+        signer_email = _get_signer_email()
+        expiry = datetime.timedelta(minutes=settings.signed_url_expiry_minutes)
         url = blob.generate_signed_url(
             version="v4",
-            expiration=datetime.timedelta(minutes=15),
+            expiration=expiry,
             method="GET",
             service_account_email=signer_email,
         )
+        _signed_url_cache.set(
+            blob_name, url, expiry.total_seconds() - settings.signed_url_refresh_margin_seconds
+        )
+        signed_url_stats.record_miss(time.perf_counter() - started)
         return url
     except HTTPException:
         raise
@@ -120,25 +203,257 @@ def generate_download_signed_url_v4(blob_name):
         raise HTTPException(status_code=500, detail=f"Failed to generate signed URL: {e}")
 
 
-def _stream_blob_response(blob_name: str, download_filename: str):
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _parse_byte_range(range_header: Optional[str], size: int):
+    """Returns an inclusive (start, end) for a single `bytes=` range, or None to serve the whole file."""
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, _, last = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _stream_blob_response(blob_name: str, download_filename: str, request: Optional[Request] = None):
+    """Serves a stored file with Content-Length, ETag, If-None-Match and single byte-range support.
+
+    Local storage files are handed to FileResponse, which lets the server use
+    sendfile instead of copying every byte through Python.
+    """
     bucket = storage_client.bucket(GCS_BUCKET_NAME)
     blob = bucket.blob(blob_name)
-    if not blob.exists():
+    req_headers = request.headers if request is not None else {}
+
+    if settings.use_local_storage:
+        if not blob.exists():
+            raise HTTPException(status_code=404, detail=f"File not found: {blob_name}")
+        response = FileResponse(
+            blob.path, media_type=PPTX_MEDIA_TYPE, filename=download_filename, stat_result=os.stat(blob.path)
+        )
+        if _etag_matches(req_headers.get("if-none-match"), response.headers["etag"]):
+            return Response(status_code=304, headers={"ETag": response.headers["etag"]})
+        return response
+
+    try:
+        blob.reload()  # one metadata call gives existence, size and generation
+    except NotFound:
         raise HTTPException(status_code=404, detail=f"File not found: {blob_name}")
+    size = blob.size or 0
+    etag = f'"{blob.generation}"'
+    headers = {
+        "Content-Disposition": f"attachment; filename=\"{download_filename}\"",
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+    }
+    if _etag_matches(req_headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    byte_range = None
+    if_range = req_headers.get("if-range")
+    if if_range is None or if_range == etag:
+        byte_range = _parse_byte_range(req_headers.get("range"), size)
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    status_code = 200
+    if byte_range:
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    # The reader is pinned to the generation the ETag and Range were computed
+    # for: presentation.pptx is rebuilt in place. The first chunk is read up
+    # front so a rebuild since the reload() can still be answered with a 412;
+    # one during the transfer aborts it short of Content-Length instead.
+    chunk_size = 1024 * 1024
+    fh = blob.open("rb", if_generation_match=blob.generation)
+    try:
+        fh.seek(start)
+        first = fh.read(min(chunk_size, end - start + 1))
+    except (PreconditionFailed, NotFound):
+        fh.close()
+        raise HTTPException(status_code=412, detail=f"{blob_name} changed while it was being served; retry the download.")
 
-    def iter_chunks(chunk_size=1024 * 1024):
-        with blob.open("rb") as fh:
-            while True:
-                data = fh.read(chunk_size)
+    def iter_chunks():
+        remaining = end - start + 1 - len(first)
+        try:
+            yield first
+            while remaining > 0:
+                data = fh.read(min(chunk_size, remaining))
                 if not data:
                     break
+                remaining -= len(data)
                 yield data
+        finally:
+            fh.close()
 
-    headers = {
-        "Content-Disposition": f"attachment; filename=\"{download_filename}\""
-    }
-    media_type = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
-    return StreamingResponse(iter_chunks(), media_type=media_type, headers=headers)
+    return StreamingResponse(iter_chunks(), status_code=status_code, media_type=PPTX_MEDIA_TYPE, headers=headers)
+
+
+async def _upload_file(bucket, blob_name: str, upload: UploadFile):
+    """Uploads an incoming file to storage without blocking the event loop."""
+    blob = bucket.blob(blob_name)
+    with span("storage.upload", blob=blob_name, bytes=upload.size):
+        await run_in_threadpool(blob.upload_from_file, upload.file, content_type=upload.content_type)
+
+
+async def _upload_string(bucket, blob_name: str, data: str, content_type: str):
+    blob = bucket.blob(blob_name)
+    with span("storage.upload", blob=blob_name, bytes=len(data)):
+        await run_in_threadpool(blob.upload_from_string, data, content_type=content_type)
+
+def _client_id(request: Request) -> str:
+    """Identifies the submitter for fair scheduling.
+
+    Only the X-Forwarded-For entries appended by our own proxies are trusted:
+    the client can put anything to their left, and would otherwise reset its
+    fair share by rotating them.
+    """
+    hops = settings.trusted_proxy_hops
+    forwarded = [entry.strip() for entry in request.headers.get("x-forwarded-for", "").split(",") if entry.strip()]
+    if hops > 0 and len(forwarded) >= hops:
+        return forwarded[-hops]
+    return request.client.host if request.client else "anonymous"
+
+
+def _scan_deck(file_obj) -> dict:
+    """Reads only the zip central directory, then rewinds for the upload."""
+    file_obj.seek(0)
+    try:
+        with span("scan_deck"):
+            return scan_pptx(file_obj)
+    finally:
+        file_obj.seek(0)
+
+
+def _enqueue_enhancement(
+    job_id: str, ppt_filename: str, logo_blob_name: Optional[str], credits_text: Optional[str],
+    dedup_key: Optional[str] = None, routing: Optional[dict] = None,
+):
+    input_blob_name = f"{job_id}/{ppt_filename}"
+    output_filename = f"enhanced_{ppt_filename}"
+    output_blob_name = f"{job_id}/{output_filename}"
+    with span("enqueue", task="enhance_ppt_task", job_id=job_id):
+        enhance_ppt_task.apply_async(
+            args=[input_blob_name, output_blob_name, logo_blob_name, credits_text],
+            kwargs={"dedup_key": dedup_key} if dedup_key else {},
+            task_id=job_id,
+            **(routing or {}),
+        )
+    return {"job_id": job_id, "output_filename": output_filename}
+
+
+def _file_sha256(file_obj, chunk_size=1024 * 1024) -> bytes:
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    while chunk := file_obj.read(chunk_size):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.digest()
+
+
+def _enhancement_dedup_key(ppt_file: UploadFile, logo_file: Optional[UploadFile], credits_text: Optional[str]) -> str:
+    """SHA-256 over the deck, the logo and the options; bump the version tag when the pipeline output changes.
+
+    Starlette has already spooled the uploads before the endpoint runs, so this
+    is a second read of the (usually in-memory or page-cached) spool; hashing
+    in the upload pass instead would upload every duplicate before finding it.
+    """
+    digest = hashlib.sha256(b"enhance:v1\0")
+    for upload in (ppt_file, logo_file):
+        digest.update(_file_sha256(upload.file) if upload and upload.filename else b"-")
+    digest.update((credits_text or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _mark_job_complete(job_id: str, result: dict) -> None:
+    # Results expire from the backend; re-store so status polls for a reused job still succeed.
+    try:
+        celery_app.backend.store_result(job_id, result, "SUCCESS")
+    except Exception as exc:
+        print(f"Could not store result for deduplicated job {job_id}: {exc}")
+
+
+def _find_duplicate_enhancement(bucket, dedup_key: str, job_id: str, ppt_filename: str) -> Optional[dict]:
+    """Returns the response for an identical finished or running job, or None after claiming `dedup_key`."""
+    done = dedup_index.lookup(dedup_key)
+    if done:
+        if bucket.blob(done["output_blob"]).exists():
+            _mark_job_complete(done["job_id"], {"status": "complete", "output_blob": done["output_blob"]})
+            return {"job_id": done["job_id"], "output_filename": done["output_filename"], "deduplicated": True}
+        dedup_index.forget(dedup_key)
+    running = dedup_index.claim(dedup_key, {"job_id": job_id, "output_filename": f"enhanced_{ppt_filename}"})
+    if running:
+        return {**running, "deduplicated": True}
+    return None
+
+
+def _enqueue_slide_plan(job_id: str, image_filenames: List[str], routing: Optional[dict] = None):
+    with span("enqueue", task="generate_slide_plan_task", job_id=job_id):
+        generate_slide_plan_task.apply_async(args=[job_id, image_filenames], task_id=job_id, **(routing or {}))
+    return {"job_id": job_id}
+
+
+def _scan_stored_deck(bucket, blob_name: str) -> dict:
+    # Blob readers are seekable, so on GCS this is a couple of ranged reads near the end of the object.
+    with span("scan_deck", blob=blob_name), bucket.blob(blob_name).open("rb") as fh:
+        return scan_pptx(fh)
+
+
+def _upload_session_blob(bucket, session_id: str):
+    # Kept outside the job prefix: the creator tasks treat every blob under
+    # "{job_id}/" as a job input.
+    return bucket.blob(f"{UPLOAD_SESSION_PREFIX}/{session_id}.json")
+
+
+def _load_upload_session(bucket, session_id: str) -> dict:
+    try:
+        return json.loads(_upload_session_blob(bucket, session_id).download_as_text())
+    except (NotFound, FileNotFoundError):
+        raise HTTPException(status_code=404, detail=f"Upload session not found: {session_id}")
+
+
+def _create_upload_url(bucket, blob_name: str, spec: UploadFileSpec, origin: Optional[str]) -> str:
+    """Returns a URL the client can PUT the file to, in chunks, without going through the API."""
+    if settings.use_local_storage:
+        return f"/api/v1/uploads/local/{blob_name}"
+    blob = bucket.blob(blob_name)
+    return blob.create_resumable_upload_session(content_type=spec.content_type, size=spec.size, origin=origin)
+
+
+def _stored_size(bucket, blob_name: str) -> Optional[int]:
+    """Size of an uploaded object, or None if it does not exist (yet)."""
+    blob = bucket.blob(blob_name)
+    try:
+        blob.reload()
+    except (NotFound, FileNotFoundError):
+        return None
+    return blob.size
+
+
+def _parse_content_range(header: Optional[str]):
+    """Parses `bytes start-end/total` or `bytes */total` into (start, total)."""
+    if not header or not header.startswith("bytes "):
+        return 0, None
+    span, _, total = header[len("bytes "):].partition("/")
+    total = None if total in ("", "*") else int(total)
+    start = 0 if span == "*" else int(span.split("-")[0])
+    return start, total
 
 # --- API Endpoints ---
 @app.get("/health", tags=["Health Check"])
@@ -147,6 +462,7 @@ def health_check():
 
 @app.post("/api/v1/enhancer/process", status_code=status.HTTP_202_ACCEPTED, tags=["PPT Enhancer"])
 async def process_enhancement(
+    request: Request,
     ppt_file: UploadFile = File(...),
     logo_file: Optional[UploadFile] = File(None),
     credits_text: Optional[str] = Form(None)
@@ -155,34 +471,50 @@ async def process_enhancement(
         raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME is not configured.")
     job_id = str(uuid.uuid4())
     bucket = storage_client.bucket(GCS_BUCKET_NAME)
+
+    dedup_key = None
+    if settings.enable_job_dedup:
+        with span("dedup"):
+            dedup_key = await run_in_threadpool(_enhancement_dedup_key, ppt_file, logo_file, credits_text)
+            duplicate = await run_in_threadpool(_find_duplicate_enhancement, bucket, dedup_key, job_id, ppt_file.filename)
+        if duplicate:
+            return duplicate
     
-    input_blob_name = f"{job_id}/{ppt_file.filename}"
-    bucket.blob(input_blob_name).upload_from_file(ppt_file.file, content_type=ppt_file.content_type)
+    # From here on this request holds the dedup claim; give it back if the
+    # job never gets enqueued, or identical submissions would be pointed at it.
+    try:
+        input_blob_name = f"{job_id}/{ppt_file.filename}"
+        uploads = [_upload_file(bucket, input_blob_name, ppt_file)]
 
-    logo_blob_name = None
-    if logo_file and logo_file.filename:
-        logo_blob_name = f"{job_id}/{logo_file.filename}"
-        bucket.blob(logo_blob_name).upload_from_file(logo_file.file, content_type=logo_file.content_type)
+        logo_blob_name = None
+        if logo_file and logo_file.filename:
+            logo_blob_name = f"{job_id}/{logo_file.filename}"
+            uploads.append(_upload_file(bucket, logo_blob_name, logo_file))
+        await asyncio.gather(*uploads)
 
-    output_filename = f"enhanced_{ppt_file.filename}"
-    output_blob_name = f"{job_id}/{output_filename}"
-    
-    enhance_ppt_task.apply_async(args=[input_blob_name, output_blob_name, logo_blob_name, credits_text], task_id=job_id)
-    return {"job_id": job_id, "output_filename": output_filename}
+        estimate = estimate_enhancement(await run_in_threadpool(_scan_deck, ppt_file.file))
+        routing = await run_in_threadpool(
+            admission.admit, job_id, _client_id(request), settings.celery_cpu_queue, estimate
+        )
+        return _enqueue_enhancement(job_id, ppt_file.filename, logo_blob_name, credits_text, dedup_key, routing)
+    except BaseException:
+        if dedup_key:
+            dedup_index.release(dedup_key)
+        raise
 
 @app.get("/api/v1/enhancer/download/{job_id}/{filename}", tags=["PPT Enhancer"])
-def download_enhanced_ppt(job_id: str, filename: str):
+def download_enhanced_ppt(job_id: str, filename: str, request: Request):
     """Return a redirect to a signed URL when possible; otherwise stream directly from GCS.
     This avoids requiring a private key in environments where IAM SignBlob is unavailable.
     """
     blob_name = f"{job_id}/{filename}"
     if settings.use_local_storage:
-        return _stream_blob_response(blob_name, filename)
+        return _stream_blob_response(blob_name, filename, request)
     try:
         url = generate_download_signed_url_v4(blob_name)
         return RedirectResponse(url=url)
     except HTTPException:
-        return _stream_blob_response(blob_name, filename)
+        return _stream_blob_response(blob_name, filename, request)
 
 @app.get("/api/v1/enhancer/download-url/{job_id}/{filename}", tags=["PPT Enhancer"])
 def get_enhanced_download_url(job_id: str, filename: str):
@@ -193,41 +525,63 @@ def get_enhanced_download_url(job_id: str, filename: str):
     return {"url": url}
 
 @app.post("/api/v1/creator/generate-plan", status_code=status.HTTP_202_ACCEPTED, tags=["PPT Creator"])
-async def generate_plan(files: List[UploadFile] = File(...)):
+async def generate_plan(request: Request, files: List[UploadFile] = File(...)):
     if not GCS_BUCKET_NAME:
         raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME is not configured.")
     job_id = str(uuid.uuid4())
     bucket = storage_client.bucket(GCS_BUCKET_NAME)
     image_filenames = []
+    uploads = []
+    source_bytes = 0
     for file in files:
         if file.content_type and file.content_type.startswith('image/'):
             image_filenames.append(file.filename)
-        bucket.blob(f"{job_id}/{file.filename}").upload_from_file(file.file, content_type=file.content_type)
-    
-    generate_slide_plan_task.apply_async(args=[job_id, image_filenames], task_id=job_id)
-    return {"job_id": job_id}
+        else:
+            source_bytes += file.size or 0
+        uploads.append(_upload_file(bucket, f"{job_id}/{file.filename}", file))
+    await asyncio.gather(*uploads)
+
+    estimate = estimate_slide_plan(source_bytes, len(image_filenames))
+    routing = await run_in_threadpool(
+        admission.admit, job_id, _client_id(request), settings.celery_io_queue, estimate
+    )
+    return _enqueue_slide_plan(job_id, image_filenames, routing)
 
 @app.post("/api/v1/creator/build/{job_id}", status_code=status.HTTP_202_ACCEPTED, tags=["PPT Creator"])
-async def build_presentation(job_id: str, slide_plan: List[dict]):
+async def build_presentation(job_id: str, slide_plan: List[dict], request: Request):
     if not GCS_BUCKET_NAME:
         raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME is not configured.")
     bucket = storage_client.bucket(GCS_BUCKET_NAME)
-    bucket.blob(f"{job_id}/slides.json").upload_from_string(json.dumps(slide_plan, indent=2), content_type='application/json')
+    await _upload_string(bucket, f"{job_id}/slides.json", json.dumps(slide_plan, indent=2), 'application/json')
     build_task_id = str(uuid.uuid4())
-    build_ppt_from_plan_task.apply_async(args=[job_id], task_id=build_task_id)
+    routing = await run_in_threadpool(
+        admission.admit, build_task_id, _client_id(request), settings.celery_cpu_queue, estimate_build(len(slide_plan))
+    )
+    with span("enqueue", task="build_ppt_from_plan_task", job_id=build_task_id):
+        build_ppt_from_plan_task.apply_async(args=[job_id], task_id=build_task_id, **routing)
     return {"message": "Presentation build has been queued.", "build_job_id": build_task_id}
 
+@app.get("/api/v1/creator/plan/{job_id}", tags=["PPT Creator"])
+def get_slide_plan(job_id: str):
+    """The generated slide plan; job results only carry a pointer to it."""
+    blob = storage_client.bucket(GCS_BUCKET_NAME).blob(f"{job_id}/slides.json")
+    try:
+        plan = blob.download_as_text()
+    except (NotFound, FileNotFoundError):
+        raise HTTPException(status_code=404, detail=f"No slide plan for job {job_id}")
+    return Response(content=plan, media_type="application/json")
+
 @app.get("/api/v1/creator/download/{job_id}", tags=["PPT Creator"])
-def download_created_ppt(job_id: str):
+def download_created_ppt(job_id: str, request: Request):
     """Return redirect to signed URL if possible; otherwise stream from GCS."""
     blob_name = f"{job_id}/presentation.pptx"
     if settings.use_local_storage:
-        return _stream_blob_response(blob_name, "presentation.pptx")
+        return _stream_blob_response(blob_name, "presentation.pptx", request)
     try:
         url = generate_download_signed_url_v4(blob_name)
         return RedirectResponse(url=url)
     except HTTPException:
-        return _stream_blob_response(blob_name, "presentation.pptx")
+        return _stream_blob_response(blob_name, "presentation.pptx", request)
 
 @app.get("/api/v1/creator/download-url/{job_id}", tags=["PPT Creator"])
 def creator_download_url(job_id: str):
@@ -237,10 +591,269 @@ def creator_download_url(job_id: str):
     url = generate_download_signed_url_v4(f"{job_id}/presentation.pptx")
     return {"url": url}
 
+@app.post("/api/v1/uploads/sessions", status_code=status.HTTP_201_CREATED, tags=["Uploads"])
+async def create_upload_session(session: UploadSessionRequest, request: Request):
+    """Issues one resumable upload URL per file so clients can upload straight to the bucket.
+
+    Once every file is uploaded, `POST /api/v1/uploads/sessions/{session_id}/commit`
+    enqueues the enhancer or creator job exactly as the multipart endpoints do.
+    """
+    if not GCS_BUCKET_NAME:
+        raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME is not configured.")
+    if session.kind not in ("enhancer", "creator"):
+        raise HTTPException(status_code=422, detail="kind must be 'enhancer' or 'creator'.")
+    if not session.files:
+        raise HTTPException(status_code=422, detail="At least one file is required.")
+    if any("/" in f.filename or f.filename in ("", ".", "..") for f in session.files):
+        raise HTTPException(status_code=422, detail="Filenames must not contain path separators.")
+    if session.kind == "enhancer" and [f.role for f in session.files].count("ppt_file") != 1:
+        raise HTTPException(status_code=422, detail="Enhancer sessions need exactly one file with role 'ppt_file'.")
+
+    job_id = str(uuid.uuid4())
+    bucket = storage_client.bucket(GCS_BUCKET_NAME)
+    origin = request.headers.get("origin")
+    urls = await asyncio.gather(*(
+        run_in_threadpool(_create_upload_url, bucket, f"{job_id}/{spec.filename}", spec, origin)
+        for spec in session.files
+    ))
+    manifest = {
+        "kind": session.kind,
+        "credits_text": session.credits_text,
+        "files": [spec.model_dump() for spec in session.files],
+    }
+    await run_in_threadpool(
+        _upload_session_blob(bucket, job_id).upload_from_string, json.dumps(manifest), content_type="application/json"
+    )
+    uploads = [
+        {"filename": spec.filename, "blob_name": f"{job_id}/{spec.filename}", "upload_url": url}
+        for spec, url in zip(session.files, urls)
+    ]
+    return {"session_id": job_id, "uploads": uploads}
+
+@app.put("/api/v1/uploads/local/{job_id}/{filename}", tags=["Uploads"])
+async def upload_local_chunk(job_id: str, filename: str, request: Request):
+    """Local-storage stand-in for a GCS resumable upload session.
+
+    Accepts chunks with a `Content-Range: bytes start-end/total` header and answers
+    308 with a `Range` header until the last byte arrives, like GCS does. A PUT
+    without `Content-Range` is a whole upload in one request and completes it.
+    """
+    if not settings.use_local_storage:
+        raise HTTPException(status_code=404, detail="Local uploads are only available in local storage mode")
+    bucket = storage_client.bucket(GCS_BUCKET_NAME)
+    manifest = await run_in_threadpool(_load_upload_session, bucket, job_id)
+    if filename not in {f["filename"] for f in manifest["files"]}:
+        raise HTTPException(status_code=404, detail=f"{filename} is not part of upload session {job_id}")
+
+    content_range = request.headers.get("content-range")
+    start, total = _parse_content_range(content_range)
+    blob = bucket.blob(f"{job_id}/{filename}")
+    if content_range is None:
+        # Single-shot upload: replaces anything a previous attempt left.
+        await run_in_threadpool(blob.delete)
+    offset = start
+    async for piece in request.stream():
+        if piece:
+            await run_in_threadpool(blob.write_range, piece, offset)
+            offset += len(piece)
+    if content_range is None and offset == 0:
+        await run_in_threadpool(blob.write_range, b"", 0)
+
+    stored = blob.size or 0
+    if content_range is None or (total is not None and stored >= total):
+        return {"blob_name": blob.name, "size": stored}
+    headers = {"Range": f"bytes=0-{stored - 1}"} if stored else {}
+    return Response(status_code=308, headers=headers)
+
+@app.post("/api/v1/uploads/sessions/{session_id}/commit", status_code=status.HTTP_202_ACCEPTED, tags=["Uploads"])
+async def commit_upload_session(session_id: str, request: Request):
+    if not GCS_BUCKET_NAME:
+        raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME is not configured.")
+    bucket = storage_client.bucket(GCS_BUCKET_NAME)
+    manifest = await run_in_threadpool(_load_upload_session, bucket, session_id)
+    files = manifest["files"]
+
+    # Local uploads create the object on the first chunk, so presence alone
+    # does not mean finished; the declared size does, when the client gave one.
+    sizes = await asyncio.gather(*(
+        run_in_threadpool(_stored_size, bucket, f"{session_id}/{f['filename']}") for f in files
+    ))
+    missing = [
+        f["filename"] for f, size in zip(files, sizes)
+        if size is None or (f.get("size") is not None and size != f["size"])
+    ]
+    if missing:
+        raise HTTPException(status_code=409, detail=f"Uploads not finished: {', '.join(missing)}")
+
+    client_id = _client_id(request)
+    if manifest["kind"] == "enhancer":
+        ppt_filename = next(f["filename"] for f in files if f.get("role") == "ppt_file")
+        logo = next((f["filename"] for f in files if f.get("role") == "logo_file"), None)
+        logo_blob_name = f"{session_id}/{logo}" if logo else None
+        estimate = estimate_enhancement(await run_in_threadpool(_scan_stored_deck, bucket, f"{session_id}/{ppt_filename}"))
+        routing = await run_in_threadpool(admission.admit, session_id, client_id, settings.celery_cpu_queue, estimate)
+        response = _enqueue_enhancement(session_id, ppt_filename, logo_blob_name, manifest.get("credits_text"), routing=routing)
+    else:
+        images = [f for f in files if f.get("content_type") and f["content_type"].startswith("image/")]
+        source_bytes = sum(f.get("size") or 0 for f in files if f not in images)
+        estimate = estimate_slide_plan(source_bytes, len(images))
+        routing = await run_in_threadpool(admission.admit, session_id, client_id, settings.celery_io_queue, estimate)
+        response = _enqueue_slide_plan(session_id, [f["filename"] for f in images], routing)
+    # Only now: a failure above leaves the session in place to commit again.
+    await run_in_threadpool(_upload_session_blob(bucket, session_id).delete)
+    return response
+
 @app.get("/api/v1/jobs/status/{job_id}", tags=["Jobs"])
 def get_status(job_id: str):
     task_result = celery_app.AsyncResult(job_id)
-    return {"job_id": job_id, "status": task_result.status, "result": task_result.result if task_result.ready() else None}
+    if task_result.ready():
+        return {"job_id": job_id, "status": task_result.status, "result": task_result.result}
+    response = {"job_id": job_id, "status": task_result.status, "result": None}
+    estimate = admission.estimates([job_id])[0]
+    if estimate:
+        response["estimate"] = estimate
+    return response
+
+def _result_backend():
+    return celery_app.backend
+
+
+def _fetch_task_metas(job_ids: List[str]) -> List[Optional[dict]]:
+    """Reads the result-backend entries of many tasks; one MGET round trip on Redis backends."""
+    backend = _result_backend()
+    if hasattr(backend, "mget") and hasattr(backend, "get_key_for_task"):
+        values = backend.mget([backend.get_key_for_task(job_id) for job_id in job_ids])
+        return [backend.decode_result(value) if value else None for value in values]
+    metas = []
+    for job_id in job_ids:
+        task_result = celery_app.AsyncResult(job_id)
+        metas.append({"status": task_result.status, "result": task_result.result if task_result.ready() else None})
+    return metas
+
+
+def _compact_status(job_id: str, meta: Optional[dict], include_result: bool) -> dict:
+    if meta is None:
+        return {"job_id": job_id, "status": "PENDING"}
+    record = {"job_id": job_id, "status": meta.get("status", "PENDING")}
+    result = meta.get("result")
+    if isinstance(result, BaseException):
+        record["error"] = repr(result)
+    elif isinstance(result, dict):
+        if include_result:
+            record["result"] = result
+        else:
+            record["result"] = {k: v for k, v in result.items() if k != "slide_plan"}
+            if isinstance(result.get("slide_plan"), list):
+                record["result"]["slide_count"] = len(result["slide_plan"])
+    elif result is not None:
+        record["result"] = result
+    return record
+
+@app.post("/api/v1/jobs/status", tags=["Jobs"])
+def get_bulk_status(request: BulkStatusRequest):
+    """Status of many jobs in one call, read with a single pipelined Redis round trip.
+
+    Results are compact by default: `slide_plan` is replaced by `slide_count`
+    unless `include_result` is set.
+    """
+    if len(request.job_ids) > MAX_BULK_STATUS_JOBS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BULK_STATUS_JOBS} job ids per request.")
+    job_ids = list(dict.fromkeys(request.job_ids))
+    try:
+        metas = _fetch_task_metas(job_ids) if job_ids else []
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Result backend is unavailable.")
+    records = [_compact_status(job_id, meta, request.include_result) for job_id, meta in zip(job_ids, metas)]
+    unfinished = [record for record in records if record["status"] not in READY_STATES]
+    for record, estimate in zip(unfinished, admission.estimates([r["job_id"] for r in unfinished])):
+        if estimate:
+            record["estimate"] = estimate
+    return {"jobs": records}
+
+SSE_HEARTBEAT_SECONDS = 15.0
+_progress_redis = None
+
+
+def _get_progress_redis():
+    global _progress_redis
+    if _progress_redis is None:
+        _progress_redis = aioredis.from_url(settings.redis_url)
+    return _progress_redis
+
+
+# One shared pattern subscription per process feeds every open event stream.
+progress_hub = ProgressHub(lambda: _get_progress_redis(), settings.sse_max_subscribers)
+
+
+def _sse(data) -> str:
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return f"data: {data}\n\n"
+
+
+def _finished_event(job_id: str) -> Optional[str]:
+    """Synthesizes a terminal event for jobs whose progress events already expired."""
+    try:
+        state = celery_app.AsyncResult(job_id).state
+    except Exception:
+        return None
+    if state == "SUCCESS":
+        return json.dumps({"job_id": job_id, "stage": "complete"})
+    if state == "FAILURE":
+        return json.dumps({"job_id": job_id, "stage": "failed"})
+    return None
+
+@app.get("/api/v1/jobs/events/{job_id}", tags=["Jobs"])
+async def job_events(job_id: str, request: Request):
+    """Server-Sent Events stream of a job's stage progress, closed after the final event.
+
+    Each event is the JSON published by the worker, e.g.
+    `{"job_id": ..., "stage": "notes", "current": 12, "total": 60}`. The stream
+    ends with a `complete` or `failed` stage; fetch the result from the status
+    endpoint once at that point instead of polling it.
+    """
+    try:
+        subscription = await progress_hub.subscribe(job_id)
+    except SubscriberLimitReached:
+        raise HTTPException(status_code=503, detail="Too many job event streams are open; poll the status endpoint.")
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Job progress events are unavailable.")
+    try:
+        # Subscribed before reading the last event so nothing published in between is lost.
+        last_event = await _get_progress_redis().get(last_event_key(job_id))
+    except RedisError:
+        subscription.close()
+        raise HTTPException(status_code=503, detail="Job progress events are unavailable.")
+    if last_event is None:
+        last_event = await run_in_threadpool(_finished_event, job_id)
+
+    async def event_stream():
+        try:
+            if last_event is not None:
+                yield _sse(last_event)
+                if json.loads(last_event)["stage"] in TERMINAL_STAGES:
+                    return
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+                if json.loads(event)["stage"] in TERMINAL_STAGES:
+                    return
+        finally:
+            subscription.close()
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    # The background close also covers streams that end before the generator starts.
+    return StreamingResponse(
+        event_stream(), media_type="text/event-stream", headers=headers, background=BackgroundTask(subscription.close)
+    )
+
+@app.get("/api/v1/metrics/signed-urls", tags=["Metrics"])
+def signed_url_metrics():
+    """Hit rate of the signed URL cache and the signing time it saved on the download path."""
+    return {**signed_url_stats.snapshot(), "cached_urls": len(_signed_url_cache)}
 
 @app.post("/api/v1/feedback", status_code=status.HTTP_201_CREATED, tags=["Feedback"])
 async def receive_feedback(feedback: Feedback):
@@ -248,35 +861,18 @@ async def receive_feedback(feedback: Feedback):
         raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME is not configured.")
     
     try:
-        bucket = storage_client.bucket(GCS_BUCKET_NAME)
-        feedback_blob = bucket.blob("feedback/feedback.csv")
-        
-        # Download existing content if the file exists
-        try:
-            content = feedback_blob.download_as_text()
-            file_exists = True
-        except NotFound:
-            content = ""
-            file_exists = False
-            
-        # Use StringIO to handle CSV writing in memory
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write header only if the file is new
-        if not file_exists:
-            writer.writerow(["name", "email", "feedback_type", "message"])
-            
-        # Write the new feedback row
-        writer.writerow([feedback.name, feedback.email, feedback.feedback_type, feedback.message])
-        
-        # Prepend the new content to the existing content
-        new_content = content + output.getvalue()
-        
-        # Upload the updated content back to GCS
-        feedback_blob.upload_from_string(new_content, content_type="text/csv")
-
+        store = FeedbackStore(storage_client.bucket(GCS_BUCKET_NAME))
+        await run_in_threadpool(store.append, feedback.model_dump())
         return {"message": "Feedback received successfully."}
     except Exception as e:
         # Log the exception e for debugging
         raise HTTPException(status_code=500, detail="Could not save feedback.")
+
+@app.get("/api/v1/feedback/export", tags=["Feedback"])
+def export_feedback():
+    """Streams all feedback as CSV, including submissions not yet compacted."""
+    if not GCS_BUCKET_NAME:
+        raise HTTPException(status_code=500, detail="GCS_BUCKET_NAME is not configured.")
+    store = FeedbackStore(storage_client.bucket(GCS_BUCKET_NAME))
+    headers = {"Content-Disposition": "attachment; filename=\"feedback.csv\""}
+    return StreamingResponse(store.iter_csv(), media_type="text/csv", headers=headers)
@@ -0,0 +1,179 @@
+"""Time the creator pipeline end to end on synthetic sources and image sets.
+
+For every combination of ``--formats``, ``--pages`` and ``--images`` this
+uploads a generated source document and image set to a throwaway
+``LocalStorageClient`` bucket. It then runs ``generate_slide_plan_task`` and
+``build_ppt_from_plan_task`` in Celery eager mode. The plan comes from a fake
+model that echoes the source text, with optional per-batch latency.
+
+Inside the tasks it times ``extract_text_from_document``, the plan batches
+(``generate_content_for_batch``) and ``build_presentation_from_plan``, and
+records each stage's peak RSS. The task totals add the storage transfers and
+bookkeeping around those stages.
+
+    cd backend && python -m benchmarks.creator --formats pdf docx txt --pages 1 100 1000 --images 20
+    cd backend && python -m benchmarks.creator --pages 50 --images 10 100 400 --image-scale 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import itertools
+import json
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from config import settings
+from config.lazy import Lazy
+from config.storage import LocalStorageClient
+from worker import celery_app as worker
+from worker import creator_logic
+
+from .documents import FORMATS, write_images, write_source
+from .enhancer import PeakRss
+
+STAGES = ("extract", "plan", "build")
+_MB = 1024 * 1024
+
+
+class FakePlanModel:
+    """Returns one slide per attached image, with bullets drawn from the source text."""
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    def generate_content(self, prompt_parts):
+        self.calls += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        prompt, images = prompt_parts[0], len(prompt_parts) - 1
+        source = prompt.split("**SOURCE MATERIAL:**", 1)[-1].split()
+        slides = []
+        for index in range(images):
+            words = source[index * 24:(index + 1) * 24] or ["Summary"]
+            slides.append({
+                "slide_title": " ".join(words[:3]).title(),
+                "slide_content": [" ".join(words[i:i + 6]) for i in range(3, len(words), 6)][:4] or ["Overview"],
+                "speaker_notes": " ".join(words),
+            })
+        return SimpleNamespace(text=json.dumps(slides))
+
+
+def _timed(stage: str, fn, timings: dict):
+    """Wrap `fn` so every call adds its time to timings[stage] and raises its peak RSS."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        monitor = PeakRss()
+        with monitor.watch():
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            seconds = time.perf_counter() - started
+        entry = timings.setdefault(stage, {"seconds": 0.0, "calls": 0, "peak_rss": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+        entry["peak_rss"] = max(entry["peak_rss"], monitor.peak)
+        return result
+
+    return wrapper
+
+
+def run_case(fmt: str, pages: int, images: int, workdir: Path, image_scale: float = 1.0, latency_ms: float = 0.0) -> dict:
+    """Generate one source/image set, push it through both creator tasks and measure each stage."""
+    job_id = f"bench-{uuid.uuid4().hex[:12]}"
+    inputs = workdir / job_id
+    inputs.mkdir()
+    source = write_source(inputs / f"source.{fmt}", fmt, pages)
+    image_set = write_images(inputs, images, image_scale)
+
+    bucket = LocalStorageClient(str(workdir / "storage")).bucket(settings.gcs_bucket_name)
+    timings = {}
+    eager = worker.celery.conf.task_always_eager
+    worker.celery.conf.task_always_eager = True
+    with patch.object(worker, "_bucket", bucket), patch.object(worker, "blob_cache", None), \
+         patch.object(creator_logic, "model", Lazy(lambda: FakePlanModel(latency_ms / 1000))), \
+         patch.object(worker, "extract_text_from_document", _timed("extract", worker.extract_text_from_document, timings)), \
+         patch.object(worker, "generate_content_for_batch", _timed("plan", worker.generate_content_for_batch, timings)), \
+         patch.object(worker, "build_presentation_from_plan", _timed("build", worker.build_presentation_from_plan, timings)):
+        worker.upload_blob(str(inputs / f"source.{fmt}"), f"{job_id}/source.{fmt}")
+        for name in image_set["names"]:
+            worker.upload_blob(str(inputs / name), f"{job_id}/{name}")
+
+        try:
+            started = time.perf_counter()
+            plan = worker.generate_slide_plan_task.apply(args=(job_id, image_set["names"])).get()
+            plan_task_seconds = time.perf_counter() - started
+            if "error" in plan:
+                raise RuntimeError(f"{fmt}/{pages}p/{images}img: {plan['error']}")
+            started = time.perf_counter()
+            built = worker.build_ppt_from_plan_task.apply(args=(job_id,)).get()
+            build_task_seconds = time.perf_counter() - started
+        finally:
+            worker.celery.conf.task_always_eager = eager
+        output_bytes = bucket.blob(built["output_file"]).size
+
+    stages = {
+        name: {
+            "seconds": round(entry["seconds"], 4),
+            "calls": entry["calls"],
+            "peak_rss_mb": round(entry["peak_rss"] / _MB, 1),
+        }
+        for name, entry in ((name, timings[name]) for name in STAGES)
+    }
+    return {
+        "format": fmt,
+        "pages": pages,
+        "images": images,
+        "source_bytes": source["bytes"],
+        "image_bytes": image_set["bytes"],
+        "slides": plan["slide_count"],
+        "output_bytes": output_bytes,
+        "stages": stages,
+        "plan_task_seconds": round(plan_task_seconds, 4),
+        "build_task_seconds": round(build_task_seconds, 4),
+        "peak_rss_mb": round(max(built["memory"]["peak_rss_bytes"], plan["memory"]["peak_rss_bytes"]) / _MB, 1),
+    }
+
+
+def _print(results: list) -> None:
+    header = (
+        f"{'format':<6}{'pages':>7}{'images':>8}{'source MB':>11}{'extract s':>11}{'plan s':>9}"
+        f"{'build s':>9}{'tasks s':>9}{'peak MB':>9}{'output MB':>11}"
+    )
+    print(header)
+    for r in results:
+        stages = r["stages"]
+        print(
+            f"{r['format']:<6}{r['pages']:>7}{r['images']:>8}{r['source_bytes'] / _MB:>11.2f}"
+            f"{stages['extract']['seconds']:>11.3f}{stages['plan']['seconds']:>9.3f}{stages['build']['seconds']:>9.3f}"
+            f"{r['plan_task_seconds'] + r['build_task_seconds']:>9.3f}{r['peak_rss_mb']:>9.1f}{r['output_bytes'] / _MB:>11.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--pages", nargs="+", type=int, default=[1, 50, 200])
+    parser.add_argument("--images", nargs="+", type=int, default=[10])
+    parser.add_argument("--image-scale", type=float, default=1.0, help="multiplies every image's dimensions")
+    parser.add_argument("--plan-latency-ms", type=float, default=0.0, help="simulated model latency per plan batch")
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, pages, images in itertools.product(args.formats, args.pages, args.images):
+            results.append(run_case(fmt, pages, images, Path(tmp), args.image_scale, args.plan_latency_ms))
+    _print(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
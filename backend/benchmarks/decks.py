@@ -0,0 +1,135 @@
+"""Synthetic decks that exercise every enhancer stage.
+
+Each slide gets a title and body text (input for the notes stage) and a unique
+photo-like picture. The optional extras are:
+
+* a repeated logo, which ``remove_frequent_images`` should strip;
+* a group of small pictures, which is walked recursively;
+* a "CONFIDENTIAL" text box, which branding removes.
+
+A master watermark is added for ``remove_watermarks_from_masters``. Picture
+content is seeded noise, so the pictures do not compress away and
+``media_kb`` roughly sets the media volume.
+
+    cd backend && python -m benchmarks.decks /tmp/deck.pptx --slides 200 --media-kb 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import io
+import random
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+WATERMARK_TEXT = "CONFIDENTIAL - DRAFT"
+_JPEG_BYTES_PER_PIXEL = 0.47  # measured for _photo() at quality 90
+
+# Named profiles shared by the benchmark and its stored baseline.
+PRESETS = {
+    "small": {"slides": 10, "media_kb": 60, "group_every": 3, "watermark_every": 2},
+    "medium": {"slides": 60, "media_kb": 150, "group_every": 4, "watermark_every": 3},
+    "large": {"slides": 200, "media_kb": 400, "group_every": 4, "watermark_every": 3},
+}
+
+
+def _photo(rng: random.Random, target_kb: int) -> bytes:
+    """A JPEG of roughly `target_kb`: smooth gradients plus noise, like a real photo."""
+    side = max(64, int((target_kb * 1024 / _JPEG_BYTES_PER_PIXEL) ** 0.5))
+    image = Image.effect_noise((side, side), rng.uniform(30, 90)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        x, y = rng.randrange(side), rng.randrange(side)
+        draw.ellipse((x, y, x + side // 3, y + side // 3), fill=tuple(rng.randrange(256) for _ in range(3)))
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def _logo() -> bytes:
+    image = Image.new("RGB", (160, 160), "white")
+    ImageDraw.Draw(image).rectangle((20, 20, 140, 140), fill=(200, 30, 30))
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+def _add_master_watermark(prs: Presentation, donor_slide) -> None:
+    # Master shape collections have no add_* methods; borrow a text box's XML.
+    box = donor_slide.shapes.add_textbox(Inches(3), Inches(3), Inches(4), Inches(1))
+    box.text_frame.text = WATERMARK_TEXT
+    prs.slide_master.shapes._spTree.append(copy.deepcopy(box.element))
+    box.element.getparent().remove(box.element)
+
+
+def build_deck(
+    path,
+    slides: int = 60,
+    media_kb: int = 150,
+    logo: bool = True,
+    group_every: int = 4,
+    watermark_every: int = 3,
+    seed: int = 7,
+) -> dict:
+    """Write a deck to `path`; returns what was put in it."""
+    rng = random.Random(seed)
+    prs = Presentation()
+    layout = prs.slide_layouts[5]  # title only
+    logo_bytes = _logo()
+    stats = {"slides": slides, "pictures": 0, "groups": 0, "watermarks": 0}
+    for index in range(slides):
+        slide = prs.slides.add_slide(layout)
+        if index == 0:
+            _add_master_watermark(prs, slide)
+        slide.shapes.title.text = f"Section {index // 10 + 1}: topic {index + 1}"
+        body = slide.shapes.add_textbox(Inches(0.5), Inches(1.6), Inches(4.5), Inches(4)).text_frame
+        body.text = f"Key point {index + 1}"
+        for line in range(3):
+            body.add_paragraph().text = f"Supporting detail {line + 1} for slide {index + 1}"
+        slide.shapes.add_picture(io.BytesIO(_photo(rng, media_kb)), Inches(5.2), Inches(1.6), width=Inches(4.3))
+        stats["pictures"] += 1
+        if logo:
+            slide.shapes.add_picture(io.BytesIO(logo_bytes), Inches(8.8), Inches(6.6), width=Inches(0.8))
+            stats["pictures"] += 1
+        if group_every and index % group_every == 0:
+            group = slide.shapes.add_group_shape()
+            for column in range(3):
+                group.shapes.add_picture(
+                    io.BytesIO(_photo(rng, max(8, media_kb // 8))),
+                    Inches(0.5 + column * 1.5), Inches(5.7), width=Inches(1.3),
+                )
+            stats["groups"] += 1
+            stats["pictures"] += 3
+        if watermark_every and index % watermark_every == 0:
+            mark = slide.shapes.add_textbox(Inches(2), Inches(6.8), Inches(4), Inches(0.5)).text_frame
+            mark.text = WATERMARK_TEXT
+            mark.paragraphs[0].runs[0].font.size = Pt(28)
+            stats["watermarks"] += 1
+    prs.save(str(path))
+    stats["bytes"] = Path(path).stat().st_size
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium")
+    parser.add_argument("--slides", type=int)
+    parser.add_argument("--media-kb", type=int)
+    parser.add_argument("--no-logo", action="store_true")
+    args = parser.parse_args()
+
+    spec = dict(PRESETS[args.preset])
+    if args.slides is not None:
+        spec["slides"] = args.slides
+    if args.media_kb is not None:
+        spec["media_kb"] = args.media_kb
+    print(build_deck(args.path, logo=not args.no_logo, **spec))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Synthetic creator inputs: source documents and image sets.
+
+Sources are PDF (written with PyMuPDF), DOCX or TXT, with ``pages`` pages of
+seeded prose. A page holds about 45 lines, close to a dense report page, so
+the extracted text grows linearly with ``pages``. Image sets mix the four
+size classes ``ppt_builder.classify_image`` distinguishes, so every slide
+layout is built.
+
+    cd backend && python -m benchmarks.documents /tmp/creator --format pdf --pages 200 --images 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from pathlib import Path
+
+import docx
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw
+
+FORMATS = ("pdf", "docx", "txt")
+LINES_PER_PAGE = 45
+# (width, height) in pixels: small-small, large-small, small-large, large-large
+# for ppt_builder's half-slide thresholds (480 x 360 px).
+IMAGE_SIZES = ((400, 300), (1280, 320), (360, 900), (1600, 1200))
+_WORDS = (
+    "revenue pipeline customer platform quarterly margin growth latency rollout "
+    "adoption retention forecast segment budget roadmap migration region partner "
+    "capacity onboarding analytics pricing channel milestone integration risk"
+).split()
+
+
+def _lines(rng: random.Random, pages: int):
+    for page in range(pages):
+        for line in range(LINES_PER_PAGE):
+            words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 14)))
+            yield page, f"{words.capitalize()}."
+
+
+def write_source(path, fmt: str, pages: int, seed: int = 11) -> dict:
+    """Write a `pages`-page source document to `path`; returns its size and page count."""
+    rng = random.Random(seed)
+    path = Path(path)
+    if fmt == "pdf":
+        doc = fitz.open()
+        lines_by_page = [[] for _ in range(pages)]
+        for page, line in _lines(rng, pages):
+            lines_by_page[page].append(line)
+        for lines in lines_by_page:
+            doc.new_page().insert_text((48, 56), "\n".join(lines), fontsize=9)
+        doc.save(str(path))
+        doc.close()
+    elif fmt == "docx":
+        document = docx.Document()
+        for page, line in _lines(rng, pages):
+            document.add_paragraph(line)
+        document.save(str(path))
+    elif fmt == "txt":
+        path.write_text("\n".join(line for _, line in _lines(rng, pages)) + "\n", encoding="utf-8")
+    else:
+        raise ValueError(f"Unsupported source format: {fmt}")
+    return {"format": fmt, "pages": pages, "bytes": path.stat().st_size}
+
+
+def write_images(directory, count: int, scale: float = 1.0, seed: int = 13) -> dict:
+    """Write `count` JPEGs cycling through IMAGE_SIZES (times `scale`); returns their names and bytes."""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    names, total = [], 0
+    for index in range(count):
+        width, height = (max(16, int(side * scale)) for side in IMAGE_SIZES[index % len(IMAGE_SIZES)])
+        image = Image.effect_noise((width, height), rng.uniform(30, 90)).convert("RGB")
+        draw = ImageDraw.Draw(image)
+        for _ in range(4):
+            x, y = rng.randrange(width), rng.randrange(height)
+            draw.rectangle((x, y, x + width // 4, y + height // 4), fill=tuple(rng.randrange(256) for _ in range(3)))
+        name = f"image_{index:04d}.jpg"
+        image.save(directory / name, format="JPEG", quality=85)
+        total += (directory / name).stat().st_size
+        names.append(name)
+    return {"images": count, "names": names, "bytes": total}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--format", choices=FORMATS, default="pdf")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--images", type=int, default=10)
+    parser.add_argument("--image-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    args.directory.mkdir(parents=True, exist_ok=True)
+    print(write_source(args.directory / f"source.{args.format}", args.format, args.pages))
+    images = write_images(args.directory, args.images, args.image_scale)
+    print({"images": images["images"], "bytes": images["bytes"]})
+
+
+if __name__ == "__main__":
+    main()
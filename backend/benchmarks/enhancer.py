@@ -0,0 +1,228 @@
+"""Time the enhancer's stages on synthetic decks and flag regressions.
+
+Runs the stages in ``enhance_ppt_task`` order on a deck from
+``benchmarks/decks.py``: ``Presentation`` load, ``remove_watermarks_from_masters``,
+``remove_frequent_images``, branding, speaker notes and save. Notes use a
+fake model, with optional simulated latency. For each stage it reports the
+median wall time over ``--repeat`` runs, the slides per second, and the peak
+RSS sampled every few milliseconds.
+
+Results are compared with the preset's entry in ``baselines/enhancer.json``.
+The run exits 1 when a stage is slower than its baseline by more than
+``--time-threshold``, or the peak RSS has grown by more than
+``--memory-threshold``. Baselines depend on the machine, so refresh them with
+``--write-baseline`` on the machine that runs the comparison.
+
+    cd backend && python -m benchmarks.enhancer --preset medium
+    cd backend && python -m benchmarks.enhancer --preset large --write-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from pptx import Presentation
+
+from config.lazy import Lazy
+from worker import celery_app as enhancer
+from worker.memory import rss_bytes
+
+from .decks import PRESETS, _logo, build_deck
+
+BASELINE_PATH = Path(__file__).with_name("baselines") / "enhancer.json"
+STAGES = ("load", "remove_watermarks_from_masters", "remove_frequent_images", "branding", "notes", "save")
+# Stages faster than this are dominated by timer and scheduler noise.
+MIN_COMPARABLE_SECONDS = 0.02
+_MB = 1024 * 1024
+
+
+class FakeNotesModel:
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    def generate_content(self, prompt: str):
+        self.calls += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return SimpleNamespace(text=f"Walk the audience through: {prompt[-80:]}")
+
+
+class PeakRss:
+    """Samples this process's RSS on a background thread while a stage runs."""
+
+    def __init__(self, interval_seconds: float = 0.005) -> None:
+        self._interval = interval_seconds
+        self.peak = 0
+
+    @contextmanager
+    def watch(self):
+        self.peak = rss_bytes()
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(self._interval):
+                self.peak = max(self.peak, rss_bytes())
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            yield self
+        finally:
+            done.set()
+            sampler.join()
+            self.peak = max(self.peak, rss_bytes())
+
+
+def run_once(deck_path: Path, workdir: Path, logo_path: Path) -> dict:
+    """One pass over every stage; returns {stage: (seconds, peak_rss_bytes)}."""
+    timings = {}
+    prs = None
+    monitor = PeakRss()
+
+    def stage(name, fn):
+        nonlocal prs
+        with monitor.watch():
+            started = time.perf_counter()
+            result = fn()
+            timings[name] = (time.perf_counter() - started, monitor.peak)
+        return result
+
+    prs = stage("load", lambda: Presentation(str(deck_path)))
+    stage("remove_watermarks_from_masters", lambda: enhancer.remove_watermarks_from_masters(prs))
+    stage("remove_frequent_images", lambda: enhancer.remove_frequent_images(prs, min_occurrences=3, hash_tolerance=5))
+    stage("branding", lambda: enhancer.brand_slides(prs, str(logo_path), "Processed by PPT Studio", "https://www.example.com"))
+    stage("notes", lambda: [enhancer.generate_and_add_speaker_notes(slide) for slide in prs.slides])
+    stage("save", lambda: prs.save(str(workdir / "enhanced.pptx")))
+    return timings
+
+
+def run_benchmark(spec: dict, repeat: int = 3, notes_latency_ms: float = 0.0) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        deck_path = workdir / "deck.pptx"
+        deck = build_deck(deck_path, **spec)
+        logo_path = workdir / "logo.png"
+        logo_path.write_bytes(_logo())
+        fake_model = FakeNotesModel(notes_latency_ms / 1000)
+        with patch.object(enhancer, "model", Lazy(lambda: fake_model)):
+            runs = [run_once(deck_path, workdir, logo_path) for _ in range(repeat)]
+
+    slides = deck["slides"]
+    stages = {}
+    for name in STAGES:
+        seconds = statistics.median(run[name][0] for run in runs)
+        stages[name] = {
+            "seconds": round(seconds, 4),
+            "slides_per_second": round(slides / seconds, 1) if seconds else None,
+            "peak_rss_mb": round(max(run[name][1] for run in runs) / _MB, 1),
+        }
+    total = sum(stage["seconds"] for stage in stages.values())
+    return {
+        "deck": deck,
+        "repeat": repeat,
+        "notes_latency_ms": notes_latency_ms,
+        "stages": stages,
+        "total_seconds": round(total, 4),
+        "slides_per_second": round(slides / total, 1),
+        "peak_rss_mb": max(stage["peak_rss_mb"] for stage in stages.values()),
+    }
+
+
+def compare(result: dict, baseline: dict, time_threshold: float, memory_threshold: float) -> list:
+    """Human-readable regressions of `result` against `baseline`; empty when within thresholds."""
+    regressions = []
+    for name, stage in result["stages"].items():
+        base = baseline["stages"].get(name)
+        if not base or base["seconds"] < MIN_COMPARABLE_SECONDS:
+            continue
+        if stage["seconds"] > base["seconds"] * (1 + time_threshold):
+            regressions.append(
+                f"{name}: {stage['seconds']:.3f}s vs baseline {base['seconds']:.3f}s "
+                f"(+{(stage['seconds'] / base['seconds'] - 1) * 100:.0f}%)"
+            )
+    if result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + memory_threshold):
+        regressions.append(f"peak RSS: {result['peak_rss_mb']:.0f} MB vs baseline {baseline['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def _print(result: dict) -> None:
+    deck = result["deck"]
+    print(
+        f"deck: {deck['slides']} slides, {deck['pictures']} pictures, {deck['groups']} groups, "
+        f"{deck['watermarks']} watermarks, {deck['bytes'] / _MB:.1f} MB; median of {result['repeat']} runs"
+    )
+    print(f"{'stage':<32}{'seconds':>10}{'slides/s':>12}{'peak MB':>10}")
+    for name, stage in result["stages"].items():
+        rate = stage["slides_per_second"]
+        print(f"{name:<32}{stage['seconds']:>10.3f}{rate if rate is not None else '-':>12}{stage['peak_rss_mb']:>10.1f}")
+    print(f"{'total':<32}{result['total_seconds']:>10.3f}{result['slides_per_second']:>12}{result['peak_rss_mb']:>10.1f}")
+
+
+def _load_baselines(path: Path) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium")
+    parser.add_argument("--slides", type=int, help="override the preset's slide count (not comparable to baselines)")
+    parser.add_argument("--media-kb", type=int, help="override the preset's picture size (not comparable to baselines)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--notes-latency-ms", type=float, default=0.0)
+    parser.add_argument("--time-threshold", type=float, default=0.30)
+    parser.add_argument("--memory-threshold", type=float, default=0.25)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--json", type=Path, help="also write the result here")
+    args = parser.parse_args()
+
+    spec = dict(PRESETS[args.preset])
+    custom = args.slides is not None or args.media_kb is not None
+    if args.slides is not None:
+        spec["slides"] = args.slides
+    if args.media_kb is not None:
+        spec["media_kb"] = args.media_kb
+
+    result = run_benchmark(spec, repeat=args.repeat, notes_latency_ms=args.notes_latency_ms)
+    _print(result)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+
+    baselines = _load_baselines(args.baseline)
+    if args.write_baseline:
+        if custom:
+            sys.exit("--write-baseline only records presets; drop --slides/--media-kb")
+        baselines[args.preset] = {
+            **result,
+            "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"baseline for {args.preset!r} written to {args.baseline}")
+        return
+    if custom or args.preset not in baselines:
+        print("no comparable baseline; skipping the regression check")
+        return
+    regressions = compare(result, baselines[args.preset], args.time_threshold, args.memory_threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        sys.exit(1)
+    print(f"within {args.time_threshold:.0%} time / {args.memory_threshold:.0%} memory of the {args.preset!r} baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""Load-test the API, workers and storage together against a local stack.
+
+By default this starts the stack itself:
+- ``redis-server`` on a free port, unless ``--redis-url`` points at one;
+- one ``benchmarks.load_worker`` per ``--worker-roles`` entry, with fake
+  LLMs;
+- ``uvicorn app.main:app`` using ``LocalStorageClient`` in a temporary
+  directory.
+
+``--base-url`` targets a stack that is already running instead.
+
+Enhancer and creator jobs arrive as open-loop Poisson processes at
+``--enhancer-rate`` and ``--creator-rate`` jobs per second for
+``--duration`` seconds. Each job goes through the client's full flow:
+- enhancer: submit, poll status, download;
+- creator: submit the source and images, poll, fetch the plan, build, poll,
+  download.
+
+Submissions are spread over ``--clients`` X-Forwarded-For addresses, as the
+trusted proxy would append them, so the fair scheduler sees several tenants. Every enhancer job has its own credits
+text, so deduplication does not collapse them.
+
+The report gives p50/p95/p99 latency and the error rate per endpoint. It
+also gives completed jobs per second and end-to-end job time per workflow.
+
+    cd backend && python -m benchmarks.load --enhancer-rate 1 --creator-rate 0.2 --duration 120
+    cd backend && python -m benchmarks.load --base-url http://localhost:8000 --enhancer-rate 4 --clients 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+import redis
+
+from .decks import PRESETS, build_deck
+from .documents import write_images, write_source
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PPTX_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+TERMINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+
+def _percentile(values, q: float):
+    """Nearest-rank percentile; None for no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+
+class Recorder:
+    """Per-endpoint latencies and errors plus per-workflow job outcomes."""
+
+    def __init__(self) -> None:
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.jobs = defaultdict(lambda: {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "seconds": []})
+
+    async def request(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs):
+        """Send one request; returns the response, or None if it failed or returned an error status."""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.latencies[endpoint].append(time.perf_counter() - started)
+        if response is None or response.status_code >= 400:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+    def report(self, wall_seconds: float) -> dict:
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": self.errors[endpoint],
+                "error_rate": round(self.errors[endpoint] / len(samples), 4),
+                **{f"p{q}_ms": round(_percentile(samples, q) * 1000, 1) for q in (50, 95, 99)},
+            }
+        jobs = {}
+        for kind, outcome in sorted(self.jobs.items()):
+            seconds = outcome["seconds"]
+            jobs[kind] = {
+                **{key: outcome[key] for key in ("submitted", "completed", "failed", "timed_out")},
+                "jobs_per_second": round(outcome["completed"] / wall_seconds, 3) if wall_seconds else None,
+                "p50_seconds": round(_percentile(seconds, 50), 2) if seconds else None,
+                "p95_seconds": round(_percentile(seconds, 95), 2) if seconds else None,
+            }
+        return {"wall_seconds": round(wall_seconds, 2), "endpoints": endpoints, "jobs": jobs}
+
+
+async def _wait_for_job(client, recorder: Recorder, job_id: str, options, headers):
+    """Polls until the job reaches a terminal state; returns its status body, or None on timeout."""
+    deadline = time.monotonic() + options.job_timeout
+    while time.monotonic() < deadline:
+        response = await recorder.request(client, "GET /jobs/status", "GET", f"/api/v1/jobs/status/{job_id}", headers=headers)
+        if response is not None:
+            body = response.json()
+            if body["status"] in TERMINAL_STATES:
+                return body
+        await asyncio.sleep(options.poll_interval)
+    return None
+
+
+def _succeeded(recorder: Recorder, kind: str, status) -> bool:
+    """Counts a timed-out or failed job; True when `status` is a successful result."""
+    outcome = recorder.jobs[kind]
+    if status is None:
+        outcome["timed_out"] += 1
+        return False
+    if status["status"] != "SUCCESS" or (isinstance(status.get("result"), dict) and "error" in status["result"]):
+        outcome["failed"] += 1
+        return False
+    return True
+
+
+async def enhancer_job(client, recorder: Recorder, inputs: dict, options, number: int) -> None:
+    headers = {"X-Forwarded-For": f"10.0.0.{number % options.clients + 1}"}
+    recorder.jobs["enhancer"]["submitted"] += 1
+    started = time.perf_counter()
+    submitted = await recorder.request(
+        client, "POST /enhancer/process", "POST", "/api/v1/enhancer/process", headers=headers,
+        files={"ppt_file": ("deck.pptx", inputs["deck"], PPTX_TYPE)},
+        data={"credits_text": f"Load test job {number}"},
+    )
+    if submitted is None:
+        recorder.jobs["enhancer"]["failed"] += 1
+        return
+    job = submitted.json()
+    if not _succeeded(recorder, "enhancer", await _wait_for_job(client, recorder, job["job_id"], options, headers)):
+        return
+    downloaded = await recorder.request(
+        client, "GET /enhancer/download", "GET",
+        f"/api/v1/enhancer/download/{job['job_id']}/{job['output_filename']}", headers=headers,
+    )
+    _complete(recorder, "enhancer", started, downloaded)
+
+
+async def creator_job(client, recorder: Recorder, inputs: dict, options, number: int) -> None:
+    headers = {"X-Forwarded-For": f"10.0.0.{number % options.clients + 1}"}
+    recorder.jobs["creator"]["submitted"] += 1
+    started = time.perf_counter()
+    files = [("files", ("source.pdf", inputs["source"], "application/pdf"))]
+    files += [("files", (name, data, "image/jpeg")) for name, data in inputs["images"]]
+    submitted = await recorder.request(
+        client, "POST /creator/generate-plan", "POST", "/api/v1/creator/generate-plan", headers=headers, files=files,
+    )
+    if submitted is None:
+        recorder.jobs["creator"]["failed"] += 1
+        return
+    job_id = submitted.json()["job_id"]
+    if not _succeeded(recorder, "creator", await _wait_for_job(client, recorder, job_id, options, headers)):
+        return
+    plan = await recorder.request(client, "GET /creator/plan", "GET", f"/api/v1/creator/plan/{job_id}", headers=headers)
+    if plan is not None:
+        build = await recorder.request(
+            client, "POST /creator/build", "POST", f"/api/v1/creator/build/{job_id}", headers=headers, json=plan.json(),
+        )
+    if plan is None or build is None:
+        recorder.jobs["creator"]["failed"] += 1
+        return
+    build_job_id = build.json()["build_job_id"]
+    if not _succeeded(recorder, "creator", await _wait_for_job(client, recorder, build_job_id, options, headers)):
+        return
+    downloaded = await recorder.request(client, "GET /creator/download", "GET", f"/api/v1/creator/download/{job_id}", headers=headers)
+    _complete(recorder, "creator", started, downloaded)
+
+
+def _complete(recorder: Recorder, kind: str, started: float, downloaded) -> None:
+    if downloaded is None or not downloaded.content:
+        recorder.jobs[kind]["failed"] += 1
+        return
+    recorder.jobs[kind]["completed"] += 1
+    recorder.jobs[kind]["seconds"].append(time.perf_counter() - started)
+
+
+async def _arrivals(rate: float, duration: float, seed: int, spawn) -> list:
+    """Starts spawn(n) at Poisson arrival times for `duration` seconds; returns the started tasks."""
+    if rate <= 0:
+        return []
+    rng = random.Random(seed)
+    started = time.monotonic()
+    at, number, tasks = 0.0, 0, []
+    while True:
+        at += rng.expovariate(rate)
+        if at > duration:
+            return tasks
+        await asyncio.sleep(max(0.0, started + at - time.monotonic()))
+        tasks.append(asyncio.create_task(spawn(number)))
+        number += 1
+
+
+async def run_load(client: httpx.AsyncClient, inputs: dict, options) -> dict:
+    """Drives both workflows through `client` and waits for every started job to finish."""
+    recorder = Recorder()
+    started = time.monotonic()
+    arrivals = await asyncio.gather(
+        _arrivals(options.enhancer_rate, options.duration, options.seed,
+                  lambda n: enhancer_job(client, recorder, inputs, options, n)),
+        _arrivals(options.creator_rate, options.duration, options.seed + 1,
+                  lambda n: creator_job(client, recorder, inputs, options, n)),
+    )
+    await asyncio.gather(*(task for tasks in arrivals for task in tasks))
+    return recorder.report(time.monotonic() - started)
+
+
+def build_inputs(workdir: Path, preset: str, source_pages: int, images: int) -> dict:
+    workdir.mkdir(parents=True, exist_ok=True)
+    build_deck(workdir / "deck.pptx", **PRESETS[preset])
+    write_source(workdir / "source.pdf", "pdf", source_pages)
+    image_set = write_images(workdir / "images", images)
+    return {
+        "deck": (workdir / "deck.pptx").read_bytes(),
+        "source": (workdir / "source.pdf").read_bytes(),
+        "images": [(name, (workdir / "images" / name).read_bytes()) for name in image_set["names"]],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalStack:
+    """Redis, workers and the API as child processes; logs go to `workdir/logs`."""
+
+    def __init__(self, workdir: Path, options) -> None:
+        self.workdir = workdir
+        self.options = options
+        self.processes = []
+        self.base_url = f"http://127.0.0.1:{_free_port()}"
+
+    def _spawn(self, name: str, command: list, env: dict) -> subprocess.Popen:
+        log = open(self.workdir / "logs" / f"{name}.log", "w")
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        self.processes.append((name, process, log))
+        return process
+
+    def _wait(self, what: str, ready, timeout: float = 60) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for name, process, _log in self.processes:
+                if process.poll() is not None:
+                    raise RuntimeError(f"{name} exited with {process.returncode}; see {self.workdir / 'logs' / name}.log")
+            try:
+                if ready():
+                    return
+            except Exception:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"{what} was not ready after {timeout:.0f}s; logs are in {self.workdir / 'logs'}")
+
+    def __enter__(self) -> "LocalStack":
+        (self.workdir / "logs").mkdir(parents=True, exist_ok=True)
+        try:
+            self._start()
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def _start(self) -> None:
+        redis_url = self.options.redis_url
+        if not redis_url:
+            if not shutil.which("redis-server"):
+                raise RuntimeError("redis-server is not on PATH; install it or pass --redis-url")
+            port = _free_port()
+            self._spawn("redis", ["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"], os.environ.copy())
+            redis_url = f"redis://127.0.0.1:{port}/0"
+        self._wait("Redis", lambda: redis.from_url(redis_url, socket_connect_timeout=1).ping())
+
+        env = {
+            **os.environ,
+            "APP_ENV": "development",
+            "REDIS_URL": redis_url,
+            "CELERY_BROKER_URL": redis_url,
+            "CELERY_ENABLE_RESULT_BACKEND": "true",
+            "USE_LOCAL_STORAGE": "true",
+            "LOCAL_STORAGE_PATH": str(self.workdir / "storage"),
+            "GCS_BUCKET_NAME": os.getenv("GCS_BUCKET_NAME", "load-test"),
+            "GOOGLE_API_KEY": os.getenv("GOOGLE_API_KEY", "load-test"),
+            "LOAD_FAKE_LLM_LATENCY_MS": str(self.options.fake_llm_latency_ms),
+        }
+        for role in self.options.worker_roles:
+            self._spawn(f"worker-{role}", [sys.executable, "-m", "benchmarks.load_worker", role], env)
+        port = self.base_url.rsplit(":", 1)[1]
+        self._spawn("api", [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", port,
+            "--workers", str(self.options.api_workers), "--log-level", "warning",
+        ], env)
+        self._wait("API", lambda: httpx.get(f"{self.base_url}/health", timeout=1).status_code == 200)
+        for role in self.options.worker_roles:
+            log = self.workdir / "logs" / f"worker-{role}.log"
+            self._wait(f"{role} worker", lambda: " ready." in log.read_text())
+
+    def __exit__(self, *_exc) -> None:
+        for _name, process, _log in reversed(self.processes):
+            process.terminate()
+        for _name, process, log in reversed(self.processes):
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            log.close()
+
+
+def _print(report: dict) -> None:
+    print(f"{'endpoint':<30}{'requests':>10}{'errors':>8}{'err %':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:<30}{row['requests']:>10}{row['errors']:>8}{row['error_rate'] * 100:>8.1f}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        )
+    print()
+    print(f"{'workflow':<12}{'submitted':>11}{'completed':>11}{'failed':>8}{'timed out':>11}{'jobs/s':>9}{'p50 s':>8}{'p95 s':>8}")
+    for kind, row in report["jobs"].items():
+        print(
+            f"{kind:<12}{row['submitted']:>11}{row['completed']:>11}{row['failed']:>8}{row['timed_out']:>11}"
+            f"{row['jobs_per_second'] or 0:>9.3f}{row['p50_seconds'] or 0:>8.2f}{row['p95_seconds'] or 0:>8.2f}"
+        )
+    print(f"\nwall time {report['wall_seconds']:.1f}s (arrivals plus draining every started job)")
+
+
+async def _drive(base_url: str, inputs: dict, options) -> dict:
+    limits = httpx.Limits(max_connections=options.max_connections)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=options.request_timeout) as client:
+        return await run_load(client, inputs, options)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="target a running stack instead of starting one")
+    parser.add_argument("--redis-url", help="use this Redis instead of starting redis-server")
+    parser.add_argument("--worker-roles", nargs="+", default=["io", "cpu"], choices=["io", "cpu", "all"])
+    parser.add_argument("--api-workers", type=int, default=1)
+    parser.add_argument("--fake-llm-latency-ms", type=float, default=500.0)
+    parser.add_argument("--enhancer-rate", type=float, default=0.5, help="enhancer jobs per second")
+    parser.add_argument("--creator-rate", type=float, default=0.1, help="creator jobs per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of arrivals")
+    parser.add_argument("--clients", type=int, default=4, help="distinct X-Forwarded-For addresses")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--job-timeout", type=float, default=300.0)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small", help="enhancer deck")
+    parser.add_argument("--source-pages", type=int, default=20)
+    parser.add_argument("--images", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="also write the report here")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        inputs = build_inputs(workdir / "inputs", options.preset, options.source_pages, options.images)
+        if options.base_url:
+            report = asyncio.run(_drive(options.base_url, inputs, options))
+        else:
+            with LocalStack(workdir / "stack", options) as stack:
+                report = asyncio.run(_drive(stack.base_url, inputs, options))
+    _print(report)
+    if options.json:
+        options.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""A Celery worker for load tests: the real tasks with fake LLMs.
+
+Replaces the speaker-notes model and the creator's plan model with the
+benchmark fakes, then starts the worker with the same pool options as
+``worker_entrypoint.sh``. The fakes are installed before the pool forks, so
+prefork children inherit them. ``LOAD_FAKE_LLM_LATENCY_MS`` simulates the
+model's latency per call.
+
+    cd backend && python -m benchmarks.load_worker cpu
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+from config.lazy import Lazy
+from worker import celery_app as worker
+from worker import creator_logic
+from worker.pools import worker_args
+
+from .creator import FakePlanModel
+from .enhancer import FakeNotesModel
+
+
+def main() -> None:
+    role = sys.argv[1] if len(sys.argv) > 1 else "all"
+    latency = float(os.getenv("LOAD_FAKE_LLM_LATENCY_MS", "0")) / 1000
+    worker.model = Lazy(lambda: FakeNotesModel(latency))
+    creator_logic.model = Lazy(lambda: FakePlanModel(latency))
+    worker.celery.worker_main(["worker", *worker_args(role), "--loglevel=info"])
+
+
+if __name__ == "__main__":
+    main()
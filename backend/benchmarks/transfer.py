@@ -0,0 +1,88 @@
+"""Compare single-stream and parallel blob transfers.
+
+Always measures ``LocalStorageClient``. When ``STORAGE_EMULATOR_HOST`` points
+at a fake GCS server (e.g. ``docker run -p 4443:4443 fsouza/fake-gcs-server
+-scheme http``), the same file is also moved through the real GCS client, once
+below and once above the parallel threshold.
+
+    cd backend && python -m benchmarks.transfer --size-mb 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from config import settings
+from config.storage import LocalStorageClient
+from worker import transfer
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _run(label: str, bucket, source: Path, workdir: Path, parallel: bool) -> None:
+    threshold = 0 if parallel else 1 << 62
+    name = f"bench/{label}-{'parallel' if parallel else 'single'}.bin"
+    with patch.object(settings, "transfer_parallel_threshold_bytes", threshold):
+        blob = bucket.blob(name)
+        up = _time(lambda: transfer.upload_file(str(source), blob))
+        blob = bucket.blob(name)
+        blob.reload()
+        target = workdir / f"{label}-{parallel}.bin"
+        down = _time(lambda: transfer.download_file(blob, str(target)))
+    mb = source.stat().st_size / 1024**2
+    mode = "parallel" if parallel else "single"
+    print(f"{label:<6} {mode:<9} upload {mb / up:8.1f} MB/s   download {mb / down:8.1f} MB/s")
+    assert target.stat().st_size == source.stat().st_size
+    blob.delete()
+
+
+def _emulator_bucket(name: str):
+    from google.auth.credentials import AnonymousCredentials
+    from google.cloud import storage
+
+    client = storage.Client(credentials=AnonymousCredentials(), project="benchmark")
+    transfer.configure_connection_pool(client, settings.transfer_max_workers)
+    bucket = client.bucket(name)
+    if not bucket.exists():
+        bucket = client.create_bucket(name)
+    return bucket
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--bucket", default="transfer-benchmark")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        source = workdir / "payload.bin"
+        with open(source, "wb") as fh:
+            for _ in range(args.size_mb):
+                fh.write(os.urandom(1024**2))
+
+        local = LocalStorageClient(str(workdir / "storage")).bucket(args.bucket)
+        _run("local", local, source, workdir, parallel=False)
+
+        if os.getenv("STORAGE_EMULATOR_HOST"):
+            gcs = _emulator_bucket(args.bucket)
+            for parallel in (False, True):
+                try:
+                    _run("gcs", gcs, source, workdir, parallel)
+                except Exception as exc:  # emulators differ in XML multipart support
+                    print(f"gcs    {'parallel' if parallel else 'single':<9} failed: {exc}")
+        else:
+            print("STORAGE_EMULATOR_HOST not set; skipping the GCS comparison")
+
+
+if __name__ == "__main__":
+    main()
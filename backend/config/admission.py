@@ -0,0 +1,169 @@
+"""Submission-time cost estimates, lane routing and per-client fairness.
+
+The API pre-scans each job before enqueueing it: for decks only the zip
+central directory is read (slide and media counts, uncompressed media size),
+for creator jobs the upload sizes. The estimate picks a lane - jobs expected
+to run for ``settings.large_job_seconds`` or longer, or to peak above
+``settings.large_job_memory_bytes``, go to the ``-large`` twin of their queue,
+so workers alternating between the two never leave small jobs stuck behind a
+backlog of huge decks - and a broker priority that drops one
+step for every ``settings.fair_share_seconds`` of work the same client
+submitted within the admission window (``config/celery_app.py`` gives the
+Redis transport all ten priority levels, so every step counts). Estimates are stored per job so the
+status endpoints can report an ETA. Redis problems degrade to "no fairness,
+no ETA", never to errors.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+import zipfile
+from typing import List, Optional
+
+import redis
+
+from .settings import settings
+from .tracing import span
+
+KEY_PREFIX = "admission"
+LARGE_SUFFIX = "-large"
+LOWEST_PRIORITY = 9  # Redis transport: 0 is served first
+
+# Rough per-unit costs, in seconds, measured on a prefork worker with Gemini
+# notes; they only need to be right relative to each other.
+BASE_SECONDS = 5.0
+NOTES_SECONDS_PER_SLIDE = 2.5
+HASH_SECONDS_PER_MEDIA_MB = 0.2
+PLAN_SECONDS_PER_IMAGE = 4.0
+PLAN_SECONDS_PER_SOURCE_MB = 1.5
+BUILD_SECONDS_PER_SLIDE = 0.15
+
+# Rough peak-RSS model for one task, in bytes. python-pptx keeps every part of
+# the package in memory and prs.save serializes a second copy; the creator
+# decodes one batch of images at a time. Compare against the peak_rss_bytes
+# that tasks report in their results when tuning these.
+BASE_MEMORY_BYTES = 200 * 1024 * 1024
+MEMORY_PER_SLIDE_BYTES = 1024 * 1024
+MEMORY_PER_MEDIA_BYTE = 3
+MEMORY_PER_IMAGE_BYTES = 48 * 1024 * 1024
+MEMORY_PER_SOURCE_BYTE = 4
+
+_SLIDE_PART = re.compile(r"^ppt/slides/slide\d+\.xml$")
+_MB = 1024 * 1024
+
+
+def scan_pptx(file_obj) -> dict:
+    """Slide and media counts of a deck, read from the zip central directory only."""
+    try:
+        entries = zipfile.ZipFile(file_obj).infolist()
+    except (zipfile.BadZipFile, OSError, ValueError):
+        return {"slides": 0, "media": 0, "media_bytes": 0}
+    media = [e for e in entries if e.filename.startswith("ppt/media/")]
+    return {
+        "slides": sum(1 for e in entries if _SLIDE_PART.match(e.filename)),
+        "media": len(media),
+        "media_bytes": sum(e.file_size for e in media),
+    }
+
+
+def _estimate(seconds: float, memory_bytes: float, **profile) -> dict:
+    large = seconds >= settings.large_job_seconds or memory_bytes >= settings.large_job_memory_bytes
+    return {
+        "estimated_seconds": round(seconds, 1),
+        "estimated_memory_bytes": int(memory_bytes),
+        "lane": "large" if large else "small",
+        **profile,
+    }
+
+
+def estimate_enhancement(deck: dict) -> dict:
+    seconds = (
+        BASE_SECONDS
+        + deck["slides"] * NOTES_SECONDS_PER_SLIDE
+        + deck["media_bytes"] / _MB * HASH_SECONDS_PER_MEDIA_MB
+    )
+    memory = BASE_MEMORY_BYTES + deck["slides"] * MEMORY_PER_SLIDE_BYTES + deck["media_bytes"] * MEMORY_PER_MEDIA_BYTE
+    return _estimate(seconds, memory, **deck)
+
+
+def estimate_slide_plan(source_bytes: int, image_count: int) -> dict:
+    seconds = BASE_SECONDS + image_count * PLAN_SECONDS_PER_IMAGE + source_bytes / _MB * PLAN_SECONDS_PER_SOURCE_MB
+    batch = min(image_count, settings.plan_batch_size) if settings.plan_batch_size > 0 else image_count
+    memory = BASE_MEMORY_BYTES + batch * MEMORY_PER_IMAGE_BYTES + source_bytes * MEMORY_PER_SOURCE_BYTE
+    return _estimate(seconds, memory, images=image_count, source_bytes=source_bytes)
+
+
+def estimate_build(slide_count: int) -> dict:
+    memory = BASE_MEMORY_BYTES + slide_count * MEMORY_PER_SLIDE_BYTES
+    return _estimate(BASE_SECONDS + slide_count * BUILD_SECONDS_PER_SLIDE, memory, slides=slide_count)
+
+
+def lane_queue(base_queue: str, lane: str) -> str:
+    return f"{base_queue}{LARGE_SUFFIX}" if lane == "large" else base_queue
+
+
+def lane_of(queue: Optional[str]) -> str:
+    return "large" if queue and queue.endswith(LARGE_SUFFIX) else "small"
+
+
+class AdmissionController:
+    def __init__(self, redis_url: str, window_seconds: int, client=None) -> None:
+        self._redis_url = redis_url
+        self._window_seconds = window_seconds
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = redis.from_url(self._redis_url, socket_connect_timeout=1, socket_timeout=2)
+        return self._client
+
+    @staticmethod
+    def _client_key(client_id: str) -> str:
+        return f"{KEY_PREFIX}:client:{client_id}"
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{KEY_PREFIX}:job:{job_id}"
+
+    def admit(self, job_id: str, client_id: str, base_queue: str, estimate: dict) -> dict:
+        """Record the estimate for `job_id` and return its ``apply_async`` routing options."""
+        record = {**estimate, "submitted_at": time.time()}
+        recent = 0.0
+        with span("admission", lane=estimate["lane"], estimated_seconds=estimate["estimated_seconds"]) as admitted:
+            try:
+                pipe = self._get_client().pipeline(transaction=False)
+                pipe.incrbyfloat(self._client_key(client_id), estimate["estimated_seconds"])
+                pipe.expire(self._client_key(client_id), self._window_seconds)
+                pipe.set(self._job_key(job_id), json.dumps(record), ex=settings.celery_result_expires)
+                total, _, _ = pipe.execute()
+                recent = float(total) - estimate["estimated_seconds"]
+            except redis.RedisError as exc:
+                print(f"Admission bookkeeping unavailable for {job_id}: {exc}")
+            priority = min(LOWEST_PRIORITY, int(recent // settings.fair_share_seconds))
+            admitted.set_attribute("priority", priority)
+        return {"queue": lane_queue(base_queue, estimate["lane"]), "priority": priority}
+
+    def estimates(self, job_ids: List[str], now: Optional[float] = None) -> List[Optional[dict]]:
+        """Stored estimates with a remaining-time ``eta_seconds``, one MGET for all ids."""
+        if not job_ids:
+            return []
+        try:
+            values = self._get_client().mget([self._job_key(job_id) for job_id in job_ids])
+        except redis.RedisError:
+            return [None] * len(job_ids)
+        now = now or time.time()
+        results = []
+        for value in values:
+            if not value:
+                results.append(None)
+                continue
+            record = json.loads(value)
+            elapsed = now - record["submitted_at"]
+            record["eta_seconds"] = round(max(0.0, record["estimated_seconds"] - elapsed), 1)
+            results.append(record)
+        return results
+
+
+admission = AdmissionController(settings.redis_url, settings.admission_window_seconds)
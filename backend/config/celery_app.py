@@ -0,0 +1,79 @@
+"""Celery application shared by the API (producer) and the worker (consumer).
+
+Only broker, backend, serialization and routing configuration lives here; the
+tasks are registered by ``worker.celery_app``. The API enqueues by task name
+through this app, so it never imports the worker's pptx/PIL/Gemini stack.
+"""
+
+from __future__ import annotations
+
+import time
+
+from celery import Celery
+from celery.signals import before_task_publish
+from kombu import Queue
+
+from .admission import LOWEST_PRIORITY, lane_queue
+from .serialization import register_compact_serializers
+from .settings import settings
+from .tracing import TRACEPARENT_HEADER, current_traceparent
+
+celery_backend = settings.celery_backend_url
+celery = Celery("tasks", broker=settings.celery_broker_url, backend=celery_backend or None)
+compact_serializers = register_compact_serializers()
+serializer = compact_serializers[0] if settings.celery_compact_serialization else "json"
+celery.conf.update(
+    task_serializer=serializer,
+    accept_content=["json", *compact_serializers],
+    result_serializer=serializer,
+    result_accept_content=["json", *compact_serializers],
+    result_expires=settings.celery_result_expires,
+)
+if not celery_backend:
+    celery.conf.update(result_backend=None, task_ignore_result=True)
+# A worker started without -Q consumes every queue; see worker/pools.py for
+# the per-pool command lines. Each queue has a "-large" lane twin that the API
+# routes expensive jobs to (config/admission.py), and broker priorities order
+# jobs within a lane. The Redis transport only keeps priorities 0/3/6/9 by
+# default and rounds the rest down, which would spare a client its first
+# three fair-share steps; all ten levels get their own list instead. Queues
+# are polled round-robin (kombu's default); the "priority" strategy would
+# drain them in listed order and starve the large lanes, and the io queues on
+# workers that consume everything.
+celery.conf.update(
+    broker_transport_options={"priority_steps": list(range(LOWEST_PRIORITY + 1))},
+    task_queues=tuple(
+        Queue(lane_queue(base, lane))
+        for base in (settings.celery_cpu_queue, settings.celery_io_queue)
+        for lane in ("small", "large")
+    ),
+    worker_prefetch_multiplier=1,
+    task_default_queue=settings.celery_cpu_queue,
+    task_routes={
+        "generate_slide_plan_task": {"queue": settings.celery_io_queue},
+        "add_speaker_notes_task": {"queue": settings.celery_io_queue},
+        "compact_feedback_task": {"queue": settings.celery_io_queue},
+        "enhance_ppt_task": {"queue": settings.celery_cpu_queue},
+        "build_ppt_from_plan_task": {"queue": settings.celery_cpu_queue},
+    },
+)
+# Run a single `celery -A worker.celery_app.celery beat` process to drive this.
+celery.conf.beat_schedule = {
+    "compact-feedback": {
+        "task": "compact_feedback_task",
+        "schedule": settings.feedback_compaction_interval_seconds,
+    },
+}
+
+
+@before_task_publish.connect(dispatch_uid="ppt-studio-stamp-headers")
+def _stamp_headers(headers=None, **_kwargs):
+    # Read back by the worker: the publish time measures queue wait
+    # (config/metrics.py) and the traceparent parents its task span
+    # (config/tracing.py).
+    if headers is None:
+        return
+    headers["published_at"] = time.time()
+    traceparent = current_traceparent()
+    if traceparent:
+        headers[TRACEPARENT_HEADER] = traceparent
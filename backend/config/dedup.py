@@ -0,0 +1,100 @@
+"""Content-hash index used to deduplicate identical job submissions.
+
+The API derives a key from the SHA-256 of the uploaded files plus the job
+options. ``claim`` lets exactly one request per key enqueue a task while
+identical concurrent submissions are pointed at that in-flight job; the worker
+``refresh``-es the claim whenever the task starts and calls ``complete`` when
+the artifact is uploaded so later submissions can return it immediately. Redis problems degrade to "no dedup", never to errors.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+import redis
+
+from .settings import settings
+
+KEY_PREFIX = "dedup"
+
+
+class JobDedupIndex:
+    def __init__(self, redis_url: str, ttl_seconds: int, client=None) -> None:
+        self._redis_url = redis_url
+        self._ttl_seconds = ttl_seconds
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = redis.from_url(self._redis_url, socket_connect_timeout=1, socket_timeout=2)
+        return self._client
+
+    @staticmethod
+    def _done_key(key: str) -> str:
+        return f"{KEY_PREFIX}:{key}"
+
+    @staticmethod
+    def _inflight_key(key: str) -> str:
+        return f"{KEY_PREFIX}:{key}:inflight"
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Finished job recorded for `key`, if any."""
+        try:
+            value = self._get_client().get(self._done_key(key))
+        except redis.RedisError:
+            return None
+        return json.loads(value) if value else None
+
+    @staticmethod
+    def _claim_ttl() -> int:
+        # A worker killed past its except block never releases the claim, so
+        # it must expire: after the longest queue wait plus the task's hard
+        # time limit the job is gone either way.
+        return settings.dedup_queue_wait_seconds + settings.task_time_limit_seconds
+
+    def claim(self, key: str, record: dict) -> Optional[dict]:
+        """Mark `record` as the in-flight job for `key`.
+
+        Returns None when the claim succeeded (the caller should enqueue), or the
+        record of the identical job that is already running.
+        """
+        try:
+            client = self._get_client()
+            if client.set(self._inflight_key(key), json.dumps(record), nx=True, ex=self._claim_ttl()):
+                return None
+            value = client.get(self._inflight_key(key))
+        except redis.RedisError:
+            return None
+        return json.loads(value) if value else None
+
+    def refresh(self, key: str) -> None:
+        """Restart the in-flight claim's expiry; called each time the job's task starts."""
+        try:
+            self._get_client().expire(self._inflight_key(key), self._claim_ttl())
+        except redis.RedisError:
+            pass
+
+    def complete(self, key: str, record: dict) -> None:
+        try:
+            client = self._get_client()
+            client.set(self._done_key(key), json.dumps(record), ex=self._ttl_seconds)
+            client.delete(self._inflight_key(key))
+        except redis.RedisError as exc:
+            print(f"Could not record dedup entry {key}: {exc}")
+
+    def release(self, key: str) -> None:
+        """Forget an in-flight claim, e.g. after the job failed."""
+        try:
+            self._get_client().delete(self._inflight_key(key))
+        except redis.RedisError:
+            pass
+
+    def forget(self, key: str) -> None:
+        try:
+            self._get_client().delete(self._done_key(key))
+        except redis.RedisError:
+            pass
+
+
+dedup_index = JobDedupIndex(settings.redis_url, settings.dedup_ttl_seconds)
@@ -0,0 +1,116 @@
+"""Append-only feedback store backed by time-sharded objects.
+
+Each submission is written as its own small JSON-lines object under
+``feedback/shards/YYYY/MM/DD/HH/`` (or appended to an hourly log file when the
+bucket supports appends, as ``LocalStorageClient`` does), so a write never reads
+or rewrites earlier feedback. ``compact()`` periodically folds closed hourly
+shards into the consolidated ``feedback/feedback.csv``. Each merged row keeps
+the name of the shard it came from, so compaction is idempotent: a run that
+stopped between writing the CSV and deleting the shards does not merge them
+twice.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional
+
+from google.cloud.exceptions import NotFound
+
+FEEDBACK_CSV = "feedback/feedback.csv"
+SHARD_PREFIX = "feedback/shards/"
+FIELDS = ["name", "email", "feedback_type", "message", "submitted_at"]
+# The consolidated CSV's extra bookkeeping column; exports leave it out.
+SHARD_FIELD = "shard"
+_HOUR_FORMAT = "%Y/%m/%d/%H"
+
+
+def _csv_line(values: Iterable) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+class FeedbackStore:
+    def __init__(self, bucket) -> None:
+        self._bucket = bucket
+
+    def append(self, entry: dict, now: Optional[datetime] = None) -> None:
+        """Record one submission; cost is independent of how much feedback exists."""
+        now = now or datetime.now(timezone.utc)
+        record = {field: entry.get(field) for field in FIELDS}
+        record["submitted_at"] = now.isoformat()
+        line = json.dumps(record) + "\n"
+        hour_prefix = f"{SHARD_PREFIX}{now.strftime(_HOUR_FORMAT)}/"
+        log_blob = self._bucket.blob(f"{hour_prefix}log.jsonl")
+        if hasattr(log_blob, "append_text"):
+            log_blob.append_text(line)
+            return
+        shard_name = f"{hour_prefix}{now.strftime('%M%S%f')}-{uuid.uuid4().hex}.jsonl"
+        self._bucket.blob(shard_name).upload_from_string(line, content_type="application/x-ndjson")
+
+    def compact(self, now: Optional[datetime] = None) -> int:
+        """Merge shards from hours that have ended into the consolidated CSV.
+
+        The current hour is left alone because it may still receive appends.
+        Returns the number of submissions merged.
+        """
+        now = now or datetime.now(timezone.utc)
+        open_hour = f"{SHARD_PREFIX}{now.strftime(_HOUR_FORMAT)}/"
+        shards = sorted(
+            (b for b in self._bucket.list_blobs(prefix=SHARD_PREFIX) if b.name < open_hour),
+            key=lambda b: b.name,
+        )
+        if not shards:
+            return 0
+        consolidated = list(self._iter_consolidated())
+        merged = {row.get(SHARD_FIELD) for row in consolidated}
+        records = [
+            {**record, SHARD_FIELD: shard.name}
+            for shard in shards if shard.name not in merged
+            for record in self._read_shard(shard)
+        ]
+        records.sort(key=lambda r: r.get("submitted_at") or "")
+
+        if records:
+            # Rewritten whole so files from before submitted_at existed get the new header.
+            output = io.StringIO()
+            writer = csv.DictWriter(output, fieldnames=FIELDS + [SHARD_FIELD], extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(consolidated)
+            writer.writerows(records)
+            self._bucket.blob(FEEDBACK_CSV).upload_from_string(output.getvalue(), content_type="text/csv")
+        # Only now that the CSV names every shard is it safe to drop them.
+        for shard in shards:
+            shard.delete()
+        return len(records)
+
+    def iter_csv(self) -> Iterator[str]:
+        """Stream every submission as CSV: the consolidated file, then pending shards."""
+        yield _csv_line(FIELDS)
+        for row in self._iter_consolidated():
+            yield _csv_line(row.get(field) for field in FIELDS)
+        shards = sorted(self._bucket.list_blobs(prefix=SHARD_PREFIX), key=lambda b: b.name)
+        for shard in shards:
+            for record in self._read_shard(shard):
+                yield _csv_line(record.get(field) for field in FIELDS)
+
+    def _iter_consolidated(self) -> Iterator[dict]:
+        blob = self._bucket.blob(FEEDBACK_CSV)
+        try:
+            with blob.open("r", encoding="utf-8", newline="") as fh:
+                yield from csv.DictReader(fh)
+        except (NotFound, FileNotFoundError):
+            return
+
+    @staticmethod
+    def _read_shard(blob) -> list:
+        try:
+            text = blob.download_as_text()
+        except (NotFound, FileNotFoundError):
+            return []
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
@@ -0,0 +1,32 @@
+"""On-first-use construction of clients and models.
+
+Creating a storage client or a Gemini model at import time costs every cold
+start (and, in a prefork parent, hands connections to forked children).
+``Lazy(factory)`` builds the object the first time an attribute is used, once
+per process, and otherwise behaves like it.
+"""
+
+from __future__ import annotations
+
+import threading
+
+
+class Lazy:
+    def __init__(self, factory) -> None:
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
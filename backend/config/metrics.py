@@ -0,0 +1,222 @@
+"""Autoscaling metrics in the Prometheus text format.
+
+Workers record task runtimes, queue waits and Gemini call latencies into Redis
+hashes (one per histogram, one field per label set and bucket) and keep the
+tasks they are running in a sorted set. The worker health server renders those,
+plus the broker's per-queue depth, at ``/metrics``. A scrape costs a handful of
+pipelined Redis reads and is cached for ``settings.metrics_cache_seconds``, so
+every replica can be scraped often. Recording is best-effort like progress
+events: an unreachable Redis never fails a task.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import redis
+
+from .settings import settings
+
+KEY_PREFIX = "metrics"
+NAMESPACE = "ppt_studio"
+# kombu's Redis transport keeps one list per priority step; see
+# kombu.transport.redis.Channel._q_for_pri.
+_PRIORITY_SEP = "\x06\x16"
+_PRIORITY_STEPS = (0, 3, 6, 9)
+# In-flight entries older than this belong to a worker that died mid-task.
+_IN_FLIGHT_MAX_AGE_SECONDS = 6 * 3600
+_RETRY_AFTER_SECONDS = 30
+
+HISTOGRAMS = {
+    "task_runtime_seconds": (
+        "Task execution time by task name.",
+        (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800),
+    ),
+    "task_queue_wait_seconds": (
+        "Time from publish (or ETA) until a worker started the task.",
+        (0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 1800),
+    ),
+    "llm_call_seconds": (
+        "Gemini generate_content latency, excluding limiter waits.",
+        (0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+    ),
+}
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in sorted(labels.items()))
+
+
+def _bucket_field(labels: str, bounds: Iterable[float], value: float) -> str:
+    for bound in bounds:
+        if value <= bound:
+            return f"{labels}|{bound:g}"
+    return f"{labels}|+Inf"
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class MetricsStore:
+    def __init__(self, redis_url: str, broker_url: Optional[str] = None, client=None, broker_client=None) -> None:
+        self._redis_url = redis_url
+        self._broker_url = broker_url or redis_url
+        self._client = client
+        self._broker_client = broker_client
+        self._disabled_until = 0.0
+        self._cache_lock = threading.Lock()
+        self._cached_text: Optional[str] = None
+        self._cached_at = 0.0
+
+    def _key(self, suffix: str) -> str:
+        return f"{KEY_PREFIX}:{suffix}"
+
+    def _get_client(self):
+        if self._client is None and time.monotonic() >= self._disabled_until:
+            self._client = redis.from_url(self._redis_url, socket_connect_timeout=1, socket_timeout=2)
+        return self._client
+
+    def _get_broker_client(self):
+        if self._broker_client is None:
+            if self._broker_url == self._redis_url:
+                return self._get_client()
+            self._broker_client = redis.from_url(self._broker_url, socket_connect_timeout=1, socket_timeout=2)
+        return self._broker_client
+
+    def _disable(self, exc: Exception) -> None:
+        print(f"Metrics store unavailable: {exc}")
+        self._client = None
+        self._disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+
+    # --- Recording (workers) ---
+
+    def observe(self, metric: str, value: float, **labels) -> None:
+        _, bounds = HISTOGRAMS[metric]
+        client = self._get_client()
+        if client is None:
+            return
+        label_str = _labels(**labels)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrby(self._key(metric), _bucket_field(label_str, bounds, value), 1)
+            pipe.hincrby(self._key(metric), f"{label_str}|count", 1)
+            pipe.hincrbyfloat(self._key(metric), f"{label_str}|sum", value)
+            pipe.execute()
+        except redis.RedisError as exc:
+            self._disable(exc)
+
+    def task_started(self, task_id: str, task_name: str) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.zadd(self._key("in-flight"), {f"{task_name}|{task_id}": time.time()})
+        except redis.RedisError as exc:
+            self._disable(exc)
+
+    def task_finished(self, task_id: str, task_name: str) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.zrem(self._key("in-flight"), f"{task_name}|{task_id}")
+        except redis.RedisError as exc:
+            self._disable(exc)
+
+    # --- Reading (health server) ---
+
+    @staticmethod
+    def _reader(client):
+        if client is None:
+            raise redis.ConnectionError("Redis is unavailable; retrying shortly")
+        return client
+
+    def queue_depths(self, queues: Iterable[str]) -> Dict[str, int]:
+        """Messages waiting per queue, summed over the broker's priority lists."""
+        queues = list(queues)
+        pipe = self._reader(self._get_broker_client()).pipeline(transaction=False)
+        for queue in queues:
+            for step in _PRIORITY_STEPS:
+                pipe.llen(f"{queue}{_PRIORITY_SEP}{step}" if step else queue)
+        lengths = pipe.execute()
+        steps = len(_PRIORITY_STEPS)
+        return {queue: sum(lengths[i * steps:(i + 1) * steps]) for i, queue in enumerate(queues)}
+
+    def in_flight(self) -> Dict[str, int]:
+        key = self._key("in-flight")
+        pipe = self._reader(self._get_client()).pipeline(transaction=False)
+        pipe.zremrangebyscore(key, "-inf", time.time() - _IN_FLIGHT_MAX_AGE_SECONDS)
+        pipe.zrange(key, 0, -1)
+        _, members = pipe.execute()
+        counts: Dict[str, int] = {}
+        for member in members:
+            task_name = _decode(member).split("|", 1)[0]
+            counts[task_name] = counts.get(task_name, 0) + 1
+        return counts
+
+    def histograms(self) -> Dict[str, Dict[str, str]]:
+        pipe = self._reader(self._get_client()).pipeline(transaction=False)
+        for metric in HISTOGRAMS:
+            pipe.hgetall(self._key(metric))
+        return {
+            metric: {_decode(k): _decode(v) for k, v in raw.items()}
+            for metric, raw in zip(HISTOGRAMS, pipe.execute())
+        }
+
+    def render(self, queues: Iterable[str]) -> str:
+        """The Prometheus exposition, rebuilt at most once per cache interval."""
+        with self._cache_lock:
+            now = time.monotonic()
+            if self._cached_text is None or now - self._cached_at >= settings.metrics_cache_seconds:
+                self._cached_text = self._render(list(queues))
+                self._cached_at = now
+            return self._cached_text
+
+    def _render(self, queues: List[str]) -> str:
+        lines: List[str] = []
+
+        def gauge(name: str, help_text: str, samples: Dict[str, float]) -> None:
+            lines.append(f"# HELP {NAMESPACE}_{name} {help_text}")
+            lines.append(f"# TYPE {NAMESPACE}_{name} gauge")
+            for labels, value in samples.items():
+                lines.append(f"{NAMESPACE}_{name}{{{labels}}} {value}" if labels else f"{NAMESPACE}_{name} {value}")
+
+        try:
+            depths = self.queue_depths(queues)
+        except redis.RedisError as exc:
+            print(f"Could not read queue depths: {exc}")
+            depths = None
+        gauge("broker_up", "Whether the broker could be read for this scrape.", {"": 0 if depths is None else 1})
+        if depths is not None:
+            gauge("queue_depth", "Messages waiting in the broker queue.",
+                  {_labels(queue=queue): depth for queue, depth in depths.items()})
+
+        try:
+            in_flight = self.in_flight()
+            histograms = self.histograms()
+        except redis.RedisError as exc:
+            print(f"Could not read task metrics: {exc}")
+            return "\n".join(lines) + "\n"
+        gauge("tasks_in_flight", "Tasks currently executing on a worker.",
+              {_labels(task=name): count for name, count in sorted(in_flight.items())})
+
+        for metric, (help_text, bounds) in HISTOGRAMS.items():
+            lines.append(f"# HELP {NAMESPACE}_{metric} {help_text}")
+            lines.append(f"# TYPE {NAMESPACE}_{metric} histogram")
+            fields = histograms.get(metric, {})
+            label_sets = sorted({field.rsplit("|", 1)[0] for field in fields})
+            for labels in label_sets:
+                prefix = f"{labels}," if labels else ""
+                cumulative = 0
+                for bound in [f"{b:g}" for b in bounds] + ["+Inf"]:
+                    cumulative += int(fields.get(f"{labels}|{bound}", 0))
+                    lines.append(f'{NAMESPACE}_{metric}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f"{NAMESPACE}_{metric}_sum{{{labels}}} {float(fields.get(f'{labels}|sum', 0))}")
+                lines.append(f"{NAMESPACE}_{metric}_count{{{labels}}} {int(fields.get(f'{labels}|count', 0))}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsStore(settings.redis_url, settings.celery_broker_url)
@@ -0,0 +1,71 @@
+"""Job progress events shared by the worker (publisher) and the API (subscriber).
+
+Workers publish stage-level events for a task id on a Redis pub/sub channel and
+keep the most recent event under a short-lived key, so a client that subscribes
+late still learns the current stage. Publishing is best-effort: a missing or
+unreachable Redis never fails a task.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Optional
+
+import redis
+
+from .settings import settings
+
+CHANNEL_PREFIX = "job-progress"
+LAST_EVENT_TTL_SECONDS = 3600
+TERMINAL_STAGES = {"complete", "failed"}
+# After a failed connection attempt, skip publishing for this long instead of
+# paying the connect timeout on every event.
+_RETRY_AFTER_SECONDS = 30
+
+
+def progress_channel(job_id: str) -> str:
+    return f"{CHANNEL_PREFIX}:{job_id}"
+
+
+def last_event_key(job_id: str) -> str:
+    return f"{CHANNEL_PREFIX}:last:{job_id}"
+
+
+class ProgressPublisher:
+    def __init__(self, redis_url: str) -> None:
+        self._redis_url = redis_url
+        self._client: Optional[redis.Redis] = None
+        self._disabled_until = 0.0
+
+    def _get_client(self) -> Optional[redis.Redis]:
+        if self._client is None and time.monotonic() >= self._disabled_until:
+            self._client = redis.from_url(
+                self._redis_url, socket_connect_timeout=1, socket_timeout=2
+            )
+        return self._client
+
+    def publish(self, job_id: Optional[str], stage: str, **data) -> None:
+        if not job_id:
+            return
+        client = self._get_client()
+        if client is None:
+            return
+        event = json.dumps({"job_id": job_id, "stage": stage, "ts": time.time(), **data})
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(last_event_key(job_id), event, ex=LAST_EVENT_TTL_SECONDS)
+            pipe.publish(progress_channel(job_id), event)
+            pipe.execute()
+        except redis.RedisError as exc:
+            print(f"Could not publish progress for {job_id}: {exc}")
+            self._client = None
+            self._disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+
+
+progress = ProgressPublisher(settings.redis_url)
+
+
+def publish_progress(job_id: Optional[str], stage: str, **data) -> None:
+    """Publish a stage event such as ``publish_progress(job_id, "notes", current=12, total=60)``."""
+    progress.publish(job_id, stage, **data)
@@ -0,0 +1,69 @@
+"""Compact kombu serializers for Celery task messages and results.
+
+``msgpack-zstd`` is registered when msgpack and zstandard are installed; the
+stdlib ``json-zlib`` is always available as a fallback. Both are accepted by
+every process regardless of ``CELERY_COMPACT_SERIALIZATION``, so workers and
+API instances can switch serializers during a rolling deploy.
+"""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+import zlib
+from typing import List
+
+from kombu.serialization import register
+from kombu.utils import json as kombu_json
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:  # optional: compact mode falls back to json-zlib
+    msgpack = None
+    zstandard = None
+
+MSGPACK_ZSTD = "msgpack-zstd"
+JSON_ZLIB = "json-zlib"
+
+
+def _json_zlib_dumps(obj) -> bytes:
+    return zlib.compress(kombu_json.dumps(obj).encode("utf-8"))
+
+
+def _json_zlib_loads(data: bytes):
+    return kombu_json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _msgpack_zstd_dumps(obj) -> bytes:
+    packed = msgpack.packb(obj, use_bin_type=True, default=_msgpack_default)
+    return zstandard.ZstdCompressor(level=3).compress(packed)
+
+
+def _msgpack_zstd_loads(data: bytes):
+    return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(data), raw=False)
+
+
+def register_compact_serializers() -> List[str]:
+    """Register the available compact serializers, preferred first."""
+    names = []
+    if msgpack is not None and zstandard is not None:
+        register(
+            MSGPACK_ZSTD, _msgpack_zstd_dumps, _msgpack_zstd_loads,
+            content_type="application/x-msgpack+zstd", content_encoding="binary",
+        )
+        names.append(MSGPACK_ZSTD)
+    register(
+        JSON_ZLIB, _json_zlib_dumps, _json_zlib_loads,
+        content_type="application/x-json+zlib", content_encoding="binary",
+    )
+    names.append(JSON_ZLIB)
+    return names
@@ -33,6 +33,9 @@ class Settings:
         self.celery_result_expires = int(
             os.getenv("CELERY_RESULT_EXPIRES", str(default_expiry))
         )
+        # Serialize task messages and results with msgpack+zstd (or json+zlib
+        # when those packages are missing) instead of plain JSON.
+        self.celery_compact_serialization = _env_bool("CELERY_COMPACT_SERIALIZATION", False)
 
         self.gcs_bucket_name = os.getenv("GCS_BUCKET_NAME")
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
@@ -40,8 +43,111 @@ class Settings:
         self.use_local_storage = _env_bool(
             "USE_LOCAL_STORAGE", self.is_development
         )
+        self.signed_url_expiry_minutes = int(os.getenv("SIGNED_URL_EXPIRY_MINUTES", "15"))
+        # Cached signed URLs are dropped this long before they actually expire.
+        self.signed_url_refresh_margin_seconds = int(
+            os.getenv("SIGNED_URL_REFRESH_MARGIN_SECONDS", "120")
+        )
+        self.signed_url_cache_size = int(os.getenv("SIGNED_URL_CACHE_SIZE", "1024"))
+        self.signer_email_refresh_seconds = int(
+            os.getenv("SIGNER_EMAIL_REFRESH_SECONDS", "3600")
+        )
 
         self.port = int(os.getenv("PORT", "8080"))
+        # Open job-progress SSE streams per API process; more get a 503.
+        self.sse_max_subscribers = int(os.getenv("SSE_MAX_SUBSCRIBERS", "1000"))
+        # Worker-local blob cache shared by the prefork children; 0 bytes disables it.
+        self.worker_blob_cache_dir = os.getenv("WORKER_BLOB_CACHE_DIR", "/tmp/ppt-studio-blob-cache")
+        self.worker_blob_cache_bytes = int(
+            os.getenv("WORKER_BLOB_CACHE_BYTES", str(2 * 1024**3))
+        )
+        # GCS objects at least this large move as parallel ranged downloads and
+        # multipart uploads of `transfer_chunk_bytes` parts.
+        self.transfer_parallel_threshold_bytes = int(
+            os.getenv("TRANSFER_PARALLEL_THRESHOLD_BYTES", str(64 * 1024**2))
+        )
+        self.transfer_chunk_bytes = int(os.getenv("TRANSFER_CHUNK_BYTES", str(16 * 1024**2)))
+        self.transfer_max_workers = int(os.getenv("TRANSFER_MAX_WORKERS", "8"))
+        # Off by default in development so repeated local runs always reprocess.
+        self.enable_job_dedup = _env_bool("ENABLE_JOB_DEDUP", not self.is_development)
+        self.dedup_ttl_seconds = int(os.getenv("DEDUP_TTL_SECONDS", "86400"))
+        # Hard time limit of the checkpointing worker tasks.
+        self.task_time_limit_seconds = int(os.getenv("TASK_TIME_LIMIT_SECONDS", "1800"))
+        # How long an in-flight dedup claim may wait in the queue (including
+        # memory deferrals) on top of that limit; refreshed at each task start.
+        self.dedup_queue_wait_seconds = int(os.getenv("DEDUP_QUEUE_WAIT_SECONDS", "3600"))
+        # Redeliveries of one checkpointing task message after its worker died
+        # (e.g. OOM-killed) before the job is failed instead of retried again.
+        self.max_worker_lost_redeliveries = int(os.getenv("MAX_WORKER_LOST_REDELIVERIES", "2"))
+        self.feedback_compaction_interval_seconds = int(
+            os.getenv("FEEDBACK_COMPACTION_INTERVAL_SECONDS", "3600")
+        )
+
+        # Task routing: LLM/network-bound work goes to the I/O queue (thread or
+        # gevent pool, high concurrency), image hashing and pptx builds to the
+        # CPU queue (prefork, one child per core by default).
+        self.celery_io_queue = os.getenv("CELERY_IO_QUEUE", "io")
+        self.celery_cpu_queue = os.getenv("CELERY_CPU_QUEUE", "cpu")
+        self.worker_io_pool = os.getenv("WORKER_IO_POOL", "threads")
+        self.worker_io_concurrency = int(os.getenv("WORKER_IO_CONCURRENCY", "32"))
+        self.worker_cpu_concurrency = int(os.getenv("WORKER_CPU_CONCURRENCY", "0")) or os.cpu_count() or 1
+        # Admission: jobs estimated to run this long go to the "-large" lane,
+        # and a client's priority drops one step per `fair_share_seconds` of
+        # work it submitted within the admission window.
+        self.large_job_seconds = int(os.getenv("LARGE_JOB_SECONDS", "300"))
+        self.fair_share_seconds = int(os.getenv("FAIR_SHARE_SECONDS", "600"))
+        self.admission_window_seconds = int(os.getenv("ADMISSION_WINDOW_SECONDS", "3600"))
+        # Proxies in front of the API that append to X-Forwarded-For (Cloud
+        # Run's front end adds one). The client is the address the outermost
+        # of them saw; entries left of it are client-supplied. 0 ignores the header.
+        self.trusted_proxy_hops = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+        # Jobs predicted to peak above this much memory also take the large
+        # lane. Workers defer a task whose prediction exceeds their current
+        # headroom, up to `memory_max_deferrals` times `memory_defer_seconds`
+        # apart, before running it anyway (worker/memory.py).
+        self.large_job_memory_bytes = int(os.getenv("LARGE_JOB_MEMORY_BYTES", str(1024**3)))
+        self.memory_defer_seconds = int(os.getenv("MEMORY_DEFER_SECONDS", "30"))
+        self.memory_max_deferrals = int(os.getenv("MEMORY_MAX_DEFERRALS", "5"))
+        # Prefork children are replaced after a task leaves them above this RSS.
+        self.worker_max_memory_per_child_kb = int(os.getenv("WORKER_MAX_MEMORY_PER_CHILD_KB", "500000"))
+        # Hand the enhancer's speaker-notes stage to the I/O queue instead of
+        # generating notes while holding a CPU worker.
+        self.enhancer_notes_on_io_queue = _env_bool("ENHANCER_NOTES_ON_IO_QUEUE", True)
+
+        # Cluster-wide Gemini limiter (worker/llm_limiter.py): a token bucket at
+        # the per-model quota plus an AIMD concurrency limit between the bounds.
+        self.llm_requests_per_minute = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+        self.llm_burst = int(os.getenv("LLM_BURST", "5"))
+        self.llm_initial_concurrency = int(os.getenv("LLM_INITIAL_CONCURRENCY", "4"))
+        self.llm_min_concurrency = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+        self.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+        self.llm_backoff_cooldown_seconds = int(os.getenv("LLM_BACKOFF_COOLDOWN_SECONDS", "5"))
+        self.llm_max_retries = int(os.getenv("LLM_MAX_RETRIES", "5"))
+        self.llm_call_timeout_seconds = int(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "300"))
+
+        # The worker health server's /metrics output (config/metrics.py) is
+        # rebuilt at most this often, however often it is scraped.
+        self.metrics_cache_seconds = float(os.getenv("METRICS_CACHE_SECONDS", "5"))
+
+        # How often the worker health server refreshes the dependency checks
+        # behind /readyz.
+        self.health_check_interval_seconds = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "15"))
+
+        # Append finished tracing spans (config/tracing.py) to this JSON lines
+        # file; empty disables tracing.
+        self.trace_export_path = os.getenv("TRACE_EXPORT_PATH", "")
+
+        # Images per plan-generation request; each batch is checkpointed. The
+        # default 0 sends all images in one request: every batch resends the
+        # full source text and the model loses flow across batches, so
+        # batching is opt-in for jobs too large to risk redoing in one call.
+        self.plan_batch_size = int(os.getenv("PLAN_BATCH_SIZE", "0"))
+
+        # Plans with at least this many slides are built with the streaming
+        # pptx writer; 0 disables streaming builds.
+        self.pptx_streaming_min_slides = int(
+            os.getenv("PPTX_STREAMING_MIN_SLIDES", "40")
+        )
 
     @property
     def is_development(self) -> bool:
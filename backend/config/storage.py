@@ -4,11 +4,65 @@ from __future__ import annotations
 
 import os
 import shutil
+import uuid
 from pathlib import Path
 from typing import Iterable, Iterator
 
 from google.cloud import storage
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl: share extents copy-on-write (btrfs, XFS, ...)
+# Staging area for link-then-rename uploads; kept at the bucket root so prefix
+# listings of job directories never see half-written files.
+_INCOMING_DIR = ".incoming"
+
+
+def clone_or_copy(src: Path, dst: Path) -> None:
+    """Copy `src` to `dst` without moving bytes through Python.
+
+    Tries a reflink first, then in-kernel `copy_file_range`, and only then a
+    regular buffered copy.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            return
+        except (AttributeError, OSError):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+
+
+def _link_or_copy(src: Path, dst: Path, staging_dir: Path) -> None:
+    """Place `src` at `dst`, hardlinking when both live on the same filesystem.
+
+    The link is created under `staging_dir` and renamed over `dst`, so readers
+    never see a partial file and any previous inode at `dst` is left untouched.
+    """
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    tmp = staging_dir / uuid.uuid4().hex
+    try:
+        os.link(src, tmp)
+    except OSError:
+        clone_or_copy(src, tmp)
+    os.replace(tmp, dst)
+
 
 class LocalBlob:
     def __init__(self, root: Path, name: str) -> None:
@@ -26,14 +80,53 @@ class LocalBlob:
             file_obj.seek(0)
 
     def upload_from_filename(self, filename: str) -> None:
-        shutil.copyfile(filename, self._path)
+        # The worker never rewrites a file after uploading it, so sharing the inode is safe.
+        _link_or_copy(Path(filename), self._path, self._root / _INCOMING_DIR)
 
     def upload_from_string(self, data: str, content_type: str | None = None) -> None:
         with open(self._path, "w", encoding="utf-8") as fh:
             fh.write(data)
 
+    def write_range(self, data: bytes, offset: int) -> int:
+        """Write one chunk of a resumable upload at `offset`; return bytes stored."""
+        mode = "r+b" if self._path.exists() else "wb"
+        with open(self._path, mode) as fh:
+            fh.seek(offset)
+            fh.write(data)
+        return self._path.stat().st_size
+
+    @property
+    def path(self) -> Path:
+        """Location of the blob on disk, for sendfile-style serving."""
+        return self._path
+
+    @property
+    def generation(self) -> str | None:
+        """Changes whenever the file is replaced or rewritten, like a GCS generation."""
+        if not self._path.exists():
+            return None
+        st = self._path.stat()
+        return f"{st.st_ino}-{st.st_mtime_ns}-{st.st_size}"
+
+    def reload(self) -> None:
+        if not self._path.exists():
+            raise FileNotFoundError(self._path)
+
+    @property
+    def size(self) -> int | None:
+        return self._path.stat().st_size if self._path.exists() else None
+
+    def append_text(self, data: str) -> None:
+        """Append `data` with a single O_APPEND write, safe for concurrent writers."""
+        fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode("utf-8"))
+        finally:
+            os.close(fd)
+
     def download_to_filename(self, filename: str) -> None:
-        shutil.copyfile(self._path, filename)
+        # Not hardlinked: tasks may modify their local copies in place.
+        clone_or_copy(self._path, Path(filename))
 
     def download_as_text(self) -> str:
         with open(self._path, "r", encoding="utf-8") as fh:
@@ -46,8 +139,8 @@ class LocalBlob:
     def exists(self) -> bool:
         return self._path.exists()
 
-    def open(self, mode: str = "rb"):
-        return open(self._path, mode)
+    def open(self, mode: str = "rb", **kwargs):
+        return open(self._path, mode, **kwargs)
 
     def generate_signed_url(self, **_: object) -> str:
         return f"file://{self._path}"
@@ -63,12 +156,27 @@ class LocalBucket:
         return LocalBlob(self._root, name)
 
     def list_blobs(self, prefix: str | None = None) -> Iterator[LocalBlob]:
+        """Yield blobs under `prefix` in name order, walking only the matching directory."""
         prefix = prefix or ""
-        for path in self._root.rglob("*"):
-            if path.is_file():
-                rel = path.relative_to(self._root).as_posix()
-                if rel.startswith(prefix):
-                    yield LocalBlob(self._root, rel)
+        dir_part, _, name_part = prefix.rpartition("/")
+        start = self._root / dir_part if dir_part else self._root
+        if not start.is_dir():
+            return
+        rel_base = f"{dir_part}/" if dir_part else ""
+        yield from self._walk(start, rel_base, name_part)
+
+    def _walk(self, directory: Path, rel_base: str, name_prefix: str = "") -> Iterator[LocalBlob]:
+        with os.scandir(directory) as it:
+            entries = sorted(
+                (e for e in it if e.name.startswith(name_prefix)), key=lambda e: e.name
+            )
+        for entry in entries:
+            if not rel_base and entry.name == _INCOMING_DIR:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._walk(Path(entry.path), f"{rel_base}{entry.name}/")
+            elif entry.is_file():
+                yield LocalBlob(self._root, f"{rel_base}{entry.name}")
 
     def exists(self) -> bool:
         return self._root.exists()
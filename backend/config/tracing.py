@@ -0,0 +1,142 @@
+"""Stage-level tracing spans shared by the API and the worker.
+
+Spans follow the OpenTelemetry data model: a trace id shared by every span
+of a job, a span id, the parent span id, wall-clock start and end, attributes
+and an ok/error status. The API's request span travels to the worker as a W3C
+``traceparent`` header on the Celery message (see config/celery_app.py), so
+one trace covers the upload, the queue hop and every worker stage, including
+the notes task that replaces the enhancement task.
+
+Finished spans are appended as JSON lines to ``settings.trace_export_path``.
+Inspect them with ``jq`` or load them into anything that reads OTLP-shaped
+JSON. With no path configured, spans are not created, and ``span()`` costs
+only a context-manager enter and exit.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from .settings import settings
+
+TRACEPARENT_HEADER = "traceparent"
+
+_current: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_export_lock = threading.Lock()
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: dict) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.time()
+        self._token = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error"] = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def end(self) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        end = time.time()
+        _export({
+            "trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id,
+            "name": self.name, "start": self.start, "end": end,
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "status": self.status, "attributes": self.attributes, "pid": os.getpid(),
+        })
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def record_error(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def enabled() -> bool:
+    return bool(settings.trace_export_path)
+
+
+def _export(record: dict) -> None:
+    line = json.dumps(record, default=str) + "\n"
+    try:
+        with _export_lock, open(settings.trace_export_path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+    except OSError as exc:
+        print(f"Could not export span {record['name']}: {exc}")
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(trace id, parent span id) from a W3C traceparent header, or None."""
+    parts = (value or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def start_span(name: str, traceparent: Optional[str] = None, **attributes):
+    """Open a span and make it current until ``end()``.
+
+    The parent is ``traceparent`` when given, otherwise the current span.
+    Without either, the span starts a new trace. For stages that fit in a
+    ``with`` block, use ``span()`` instead.
+    """
+    if not enabled():
+        return _NOOP
+    remote = parse_traceparent(traceparent)
+    parent = _current.get()
+    if remote:
+        trace_id, parent_id = remote
+    elif parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+    opened = Span(name, trace_id, parent_id, attributes)
+    opened._token = _current.set(opened)
+    return opened
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """``with span("remove_frequent_images", slides=n):`` times one stage."""
+    opened = start_span(name, **attributes)
+    try:
+        yield opened
+    except BaseException as exc:
+        opened.record_error(exc)
+        raise
+    finally:
+        opened.end()
+
+
+def current_traceparent() -> Optional[str]:
+    current = _current.get()
+    return current.traceparent if current is not None else None
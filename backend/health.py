@@ -1,7 +1,11 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
 import uvicorn
 import os
 import sys
+import time
+import threading
 import redis
 import psutil
 from google.cloud import storage
@@ -9,8 +13,115 @@ from datetime import datetime
 import traceback
 
 from config import settings
+from config.storage import LocalStorageClient
 
-app = FastAPI(title="PPT Studio Worker Health Check")
+# Readiness is reported as failed when the background checker has not
+# finished a round for this many intervals (hung or dead thread).
+READINESS_STALE_INTERVALS = 3
+
+
+class ReadinessMonitor:
+    """Runs dependency checks on a background thread and caches the outcome.
+
+    Probes read the cached result, so their rate never turns into load on
+    Redis or the bucket. The checks reuse pooled clients and only read.
+    """
+
+    def __init__(self, checks, interval_seconds: float) -> None:
+        self._checks = checks
+        self._interval = interval_seconds
+        self._lock = threading.Lock()
+        self._result = None
+        self._checked_at = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_checks(self) -> dict:
+        results = {}
+        for name, check in self._checks.items():
+            started = time.monotonic()
+            try:
+                check()
+                results[name] = {"status": "ok"}
+            except Exception as exc:
+                results[name] = {"status": "failed", "error": str(exc)}
+            results[name]["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        result = {
+            "ready": all(check["status"] == "ok" for check in results.values()),
+            "checked_at": datetime.utcnow().isoformat(),
+            "checks": results,
+        }
+        with self._lock:
+            self._result, self._checked_at = result, time.monotonic()
+        return result
+
+    def _loop(self) -> None:
+        while True:
+            self.run_checks()
+            if self._stop.wait(self._interval):
+                return
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="readiness-checks", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result, checked_at = self._result, self._checked_at
+        if result is None:
+            return {"ready": False, "reason": "first check has not finished"}
+        age = time.monotonic() - checked_at
+        if age > self._interval * READINESS_STALE_INTERVALS:
+            return {**result, "ready": False, "reason": f"last check is {age:.0f}s old"}
+        return result
+
+
+_clients = {}
+
+
+def _redis_client(url: str):
+    # One pooled client per URL for the life of the server.
+    if url not in _clients:
+        _clients[url] = redis.from_url(url, socket_connect_timeout=2, socket_timeout=2)
+    return _clients[url]
+
+
+def _bucket():
+    if "bucket" not in _clients:
+        client = LocalStorageClient() if settings.use_local_storage else storage.Client()
+        _clients["bucket"] = client.bucket(settings.gcs_bucket_name)
+    return _clients["bucket"]
+
+
+def _check_bucket() -> None:
+    if not settings.gcs_bucket_name:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+    if not _bucket().exists():  # a metadata read; nothing is written
+        raise RuntimeError(f"Bucket {settings.gcs_bucket_name} does not exist or is not accessible")
+
+
+_readiness_checks = {
+    "redis": lambda: _redis_client(settings.redis_url).ping(),
+    "storage": _check_bucket,
+}
+if settings.celery_broker_url != settings.redis_url:
+    _readiness_checks["broker"] = lambda: _redis_client(settings.celery_broker_url).ping()
+readiness = ReadinessMonitor(_readiness_checks, settings.health_check_interval_seconds)
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    readiness.start()
+    yield
+    readiness.stop()
+
+
+app = FastAPI(title="PPT Studio Worker Health Check", lifespan=lifespan)
 
 @app.get("/")
 def health():
@@ -21,8 +132,20 @@ def health():
         "version": "1.0"
     }
 
+@app.get("/livez")
+def liveness():
+    """Answers from memory: the process is up and serving."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readiness_probe():
+    """Cached result of the background dependency checks; 503 while not ready."""
+    result = readiness.snapshot()
+    return JSONResponse(result, status_code=200 if result["ready"] else 503)
+
 @app.get("/health")
 def detailed_health():
+    """On-demand diagnostics with write round-trips; point probes at /livez and /readyz instead."""
     health_status = {
         "status": "ok", 
         "timestamp": datetime.utcnow().isoformat(),
@@ -168,6 +291,36 @@ def detailed_health():
     
     return health_status
 
+@app.get("/blob-cache")
+def blob_cache_stats():
+    """Hit rate and bytes saved by the worker-local blob cache."""
+    if settings.worker_blob_cache_bytes <= 0:
+        return {"enabled": False}
+    from worker.blob_cache import BlobCache
+
+    cache = BlobCache(settings.worker_blob_cache_dir, settings.worker_blob_cache_bytes)
+    return {"enabled": True, **cache.stats()}
+
+@app.get("/llm-limiter")
+def llm_limiter_stats():
+    """Cluster-wide limiter state: time spent waiting, 429s seen and the current AIMD limit."""
+    from worker.llm_limiter import LLMLimiter
+
+    client = _redis_client(settings.redis_url)
+    return {
+        name: LLMLimiter(name, settings.redis_url, client=client).stats()
+        for name in ("gemini-1.5-flash", "gemini-2.0-flash")
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Queue depth, in-flight tasks and latency histograms for the autoscaler (Prometheus text format)."""
+    from config.celery_app import celery
+    from config.metrics import metrics
+
+    queues = [queue.name for queue in celery.conf.task_queues]
+    return PlainTextResponse(metrics.render(queues), media_type="text/plain; version=0.0.4")
+
 @app.get("/debug")
 def debug_info():
     """Detailed debug information for troubleshooting"""
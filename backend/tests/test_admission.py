@@ -0,0 +1,126 @@
+import io
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from backend.app.main import app, settings
+from config.admission import LOWEST_PRIORITY, AdmissionController, estimate_enhancement, scan_pptx
+
+client = TestClient(app)
+
+
+class InMemoryRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._results = []
+
+    def incrbyfloat(self, key, amount):
+        self._redis.data[key] = float(self._redis.data.get(key, 0)) + amount
+        self._results.append(self._redis.data[key])
+
+    def expire(self, key, seconds):
+        self._results.append(True)
+
+    def set(self, key, value, ex=None):
+        self._redis.data[key] = value
+        self._results.append(True)
+
+    def execute(self):
+        return self._results
+
+
+def _deck_bytes(slides: int) -> bytes:
+    image = io.BytesIO()
+    Image.new("RGB", (64, 64), "red").save(image, format="PNG")
+    prs = Presentation()
+    for _ in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        image.seek(0)
+        slide.shapes.add_picture(image, Inches(1), Inches(1))
+    out = io.BytesIO()
+    prs.save(out)
+    return out.getvalue()
+
+
+def test_scan_reads_slide_and_media_counts_from_central_directory():
+    profile = scan_pptx(io.BytesIO(_deck_bytes(3)))
+
+    assert profile["slides"] == 3
+    assert profile["media"] == 1  # python-pptx stores identical images once
+    assert profile["media_bytes"] > 0
+    assert scan_pptx(io.BytesIO(b"not a zip")) == {"slides": 0, "media": 0, "media_bytes": 0}
+
+
+def test_large_decks_take_the_large_lane_and_heavy_clients_lose_priority():
+    controller = AdmissionController("redis://unused", window_seconds=60, client=InMemoryRedis())
+    with patch.object(settings, "large_job_seconds", 20), \
+         patch.object(settings, "fair_share_seconds", 20), \
+         patch("backend.app.main.admission", controller), \
+         patch("backend.app.main.enhance_ppt_task.apply_async") as mock_task, \
+         patch("backend.app.main.celery_app.AsyncResult") as mock_result:
+        mock_result.return_value.ready.return_value = False
+        mock_result.return_value.status = "PENDING"
+        routes = []
+        for attempt, (name, slides) in enumerate([("big.pptx", 12), ("small.pptx", 1), ("small2.pptx", 1)]):
+            # Rotating the client-supplied part of the header must not reset
+            # the fair share; only the proxy-appended address counts.
+            response = client.post(
+                "/api/v1/enhancer/process",
+                files={"ppt_file": (name, _deck_bytes(slides), "application/octet-stream")},
+                headers={"X-Forwarded-For": f"10.9.9.{attempt}, 203.0.113.7"},
+            )
+            assert response.status_code == 202
+            routes.append(mock_task.call_args.kwargs)
+        other = client.post(
+            "/api/v1/enhancer/process",
+            files={"ppt_file": ("other.pptx", _deck_bytes(1), "application/octet-stream")},
+            headers={"X-Forwarded-For": "198.51.100.2"},
+        )
+        routes.append(mock_task.call_args.kwargs)
+        status = client.get(f"/api/v1/jobs/status/{routes[0]['task_id']}").json()
+
+    cpu = settings.celery_cpu_queue
+    assert [r["queue"] for r in routes] == [f"{cpu}-large", cpu, cpu, cpu]
+    # The first client already has a large deck admitted, so its later jobs
+    # queue behind the newcomer's.
+    assert routes[1]["priority"] > routes[3]["priority"] == 0
+    assert other.status_code == 202
+    assert status["estimate"]["lane"] == "large"
+    assert status["estimate"]["slides"] == 12
+    assert 0 < status["estimate"]["eta_seconds"] <= estimate_enhancement(
+        {"slides": 12, "media": 1, "media_bytes": status["estimate"]["media_bytes"]}
+    )["estimated_seconds"]
+
+
+def test_workers_poll_their_queues_round_robin():
+    from config.celery_app import celery
+
+    # kombu's "priority" strategy drains queues in listed order and starves
+    # the "-large" lanes (and io, on workers that consume every queue).
+    assert celery.conf.broker_transport_options.get("queue_order_strategy", "round_robin") == "round_robin"
+
+
+def test_every_fair_share_step_reaches_the_broker():
+    from types import SimpleNamespace
+    from kombu.transport.redis import Channel
+    from config.celery_app import celery
+
+    options = celery.conf.broker_transport_options
+    assert "priority_steps" in Channel.from_transport_options
+    channel = SimpleNamespace(priority_steps=options["priority_steps"])
+    # kombu's own mapping from a message priority to the list it is pushed to.
+    assert [Channel.priority(channel, p) for p in range(LOWEST_PRIORITY + 1)] == list(range(LOWEST_PRIORITY + 1))
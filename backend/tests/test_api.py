@@ -50,3 +50,159 @@ def test_submit_ppt_for_enhancement_with_branding():
         assert "test.pptx" in args[0]  # input_path
         assert "custom_logo.png" in args[2]  # logo_path
         assert args[3] == custom_credits  # credits_text
+
+def test_slow_upload_does_not_block_other_requests():
+    """
+    Storage uploads run off the event loop, so a slow upload must not delay
+    unrelated requests served by the same app instance.
+    """
+    import asyncio
+    import time
+    import httpx
+
+    def slow_upload(*_args, **_kwargs):
+        time.sleep(0.5)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            started = time.perf_counter()
+            upload = asyncio.create_task(ac.post(
+                "/api/v1/enhancer/process",
+                files={"ppt_file": ("slow.pptx", b"fake pptx content", "application/octet-stream")},
+            ))
+            await asyncio.sleep(0.1)
+            health = await ac.get("/health")
+            health_elapsed = time.perf_counter() - started
+            return health, health_elapsed, await upload
+
+    with patch('backend.app.main.enhance_ppt_task.apply_async'), \
+         patch('config.storage.LocalBlob.upload_from_file', side_effect=slow_upload):
+        health, health_elapsed, upload = asyncio.run(scenario())
+
+    assert health.status_code == 200
+    assert upload.status_code == 202
+    assert health_elapsed < 0.4
+
+def test_bulk_status_reads_all_jobs_in_one_round_trip():
+    """
+    Tests that the bulk status endpoint issues a single MGET and returns
+    compact records without the slide plan unless asked.
+    """
+    from unittest.mock import MagicMock
+
+    backend = MagicMock()
+    backend.get_key_for_task.side_effect = lambda job_id: f"celery-task-meta-{job_id}"
+    backend.mget.return_value = [b"plan", None, b"enhance"]
+    backend.decode_result.side_effect = lambda value: {
+        b"plan": {"status": "SUCCESS", "result": {"status": "complete", "slide_plan": [{}, {}, {}]}},
+        b"enhance": {"status": "SUCCESS", "result": {"status": "complete", "output_blob": "j/out.pptx"}},
+    }[value]
+
+    with patch('backend.app.main._result_backend', return_value=backend):
+        compact = client.post("/api/v1/jobs/status", json={"job_ids": ["plan", "queued", "enhance"]}).json()
+        full = client.post("/api/v1/jobs/status", json={"job_ids": ["plan"], "include_result": True}).json()
+
+    assert backend.mget.call_count == 2
+    backend.mget.assert_any_call(["celery-task-meta-plan", "celery-task-meta-queued", "celery-task-meta-enhance"])
+    assert compact["jobs"] == [
+        {"job_id": "plan", "status": "SUCCESS", "result": {"status": "complete", "slide_count": 3}},
+        {"job_id": "queued", "status": "PENDING"},
+        {"job_id": "enhance", "status": "SUCCESS", "result": {"status": "complete", "output_blob": "j/out.pptx"}},
+    ]
+    assert len(full["jobs"][0]["result"]["slide_plan"]) == 3
+
+class InMemoryRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_identical_enhancement_submissions_are_deduplicated():
+    """
+    Tests that a resubmitted deck with the same logo and credits is coalesced
+    onto the in-flight job, and served from the finished artifact afterwards.
+    """
+    from config.dedup import JobDedupIndex
+    from backend.app.main import storage_client, settings, GCS_BUCKET_NAME
+
+    index = JobDedupIndex("redis://unused", ttl_seconds=60, client=InMemoryRedis())
+    files = {
+        "ppt_file": ("dup.pptx", b"identical deck bytes", "application/octet-stream"),
+        "logo_file": ("logo.png", b"identical logo", "image/png"),
+    }
+    with patch.object(settings, 'enable_job_dedup', True), \
+         patch('backend.app.main.dedup_index', index), \
+         patch('backend.app.main._mark_job_complete') as mock_mark, \
+         patch('backend.app.main.enhance_ppt_task.apply_async') as mock_task:
+        first = client.post("/api/v1/enhancer/process", files=files, data={"credits_text": "Team"}).json()
+        second = client.post("/api/v1/enhancer/process", files=files, data={"credits_text": "Team"}).json()
+        other = client.post("/api/v1/enhancer/process", files=files, data={"credits_text": "Other"}).json()
+
+        assert mock_task.call_count == 2
+        assert second == {**first, "deduplicated": True}
+        assert other["job_id"] != first["job_id"]
+
+        dedup_key = mock_task.call_args_list[0].kwargs["kwargs"]["dedup_key"]
+        output_blob = f"{first['job_id']}/{first['output_filename']}"
+        storage_client.bucket(GCS_BUCKET_NAME).blob(output_blob).upload_from_string("enhanced")
+        index.complete(dedup_key, {"job_id": first["job_id"], "output_blob": output_blob, "output_filename": first["output_filename"]})
+
+        third = client.post("/api/v1/enhancer/process", files=files, data={"credits_text": "Team"}).json()
+
+    assert mock_task.call_count == 2
+    assert third == {**first, "deduplicated": True}
+    mock_mark.assert_called_once_with(first["job_id"], {"status": "complete", "output_blob": output_blob})
+
+
+def test_dedup_claim_covers_the_queue_wait_and_is_refreshed_on_start():
+    from unittest.mock import MagicMock
+    from config.dedup import JobDedupIndex
+    from backend.app.main import settings
+
+    redis_client = MagicMock()
+    redis_client.set.return_value = True
+    index = JobDedupIndex("redis://unused", ttl_seconds=60, client=redis_client)
+    with patch.object(settings, 'dedup_queue_wait_seconds', 3600), \
+         patch.object(settings, 'task_time_limit_seconds', 1800):
+        assert index.claim("k", {"job_id": "j"}) is None
+        index.refresh("k")
+
+    assert redis_client.set.call_args.kwargs["ex"] == 5400
+    redis_client.expire.assert_called_once_with("dedup:k:inflight", 5400)
+
+
+def test_failed_enqueue_releases_the_dedup_claim():
+    """
+    A submission that fails after claiming its dedup key must not leave
+    identical resubmissions pointed at a job that was never queued.
+    """
+    from config.dedup import JobDedupIndex
+    from backend.app.main import settings
+
+    redis_client = InMemoryRedis()
+    index = JobDedupIndex("redis://unused", ttl_seconds=60, client=redis_client)
+    files = {"ppt_file": ("retry.pptx", b"deck that fails to enqueue", "application/octet-stream")}
+    failing_client = TestClient(app, raise_server_exceptions=False)
+    with patch.object(settings, 'enable_job_dedup', True), \
+         patch('backend.app.main.dedup_index', index), \
+         patch('backend.app.main.enhance_ppt_task.apply_async', side_effect=[ConnectionError("broker down"), None]) as mock_task:
+        failed = failing_client.post("/api/v1/enhancer/process", files=files)
+        assert failed.status_code == 500
+        assert not [key for key in redis_client.data if key.endswith(":inflight")]
+
+        retried = client.post("/api/v1/enhancer/process", files=files).json()
+
+    assert mock_task.call_count == 2
+    assert "deduplicated" not in retried
@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+
+from worker import blob_cache
+from worker.blob_cache import BlobCache
+
+
+def _downloader(payload, calls):
+    def download(path):
+        calls.append(path)
+        with open(path, "wb") as fh:
+            fh.write(payload)
+    return download
+
+
+def test_second_fetch_is_a_copied_hit(tmp_path):
+    cache = BlobCache(tmp_path / "cache", max_bytes=1024)
+    calls = []
+    key = BlobCache.key_for("bucket", "job/image.png", generation=7)
+    first, second = tmp_path / "job1.png", tmp_path / "job2.png"
+
+    assert cache.fetch(key, 5, first, _downloader(b"image", calls)) is False
+    assert cache.fetch(key, 5, second, _downloader(b"image", calls)) is True
+
+    assert len(calls) == 1
+    assert second.read_bytes() == b"image"
+    assert first.stat().st_ino != second.stat().st_ino
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bytes_saved"]) == (1, 1, 5)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_new_generation_misses_and_lru_entries_are_evicted(tmp_path):
+    cache = BlobCache(tmp_path / "cache", max_bytes=10)
+    calls = []
+    old_key = BlobCache.key_for("bucket", "job/a.png", generation=1)
+    new_key = BlobCache.key_for("bucket", "job/a.png", generation=2)
+
+    cache.fetch(old_key, 6, tmp_path / "a1", _downloader(b"aaaaaa", calls))
+    cache.fetch(new_key, 6, tmp_path / "a2", _downloader(b"bbbbbb", calls))
+
+    assert len(calls) == 2
+    assert (tmp_path / "a2").read_bytes() == b"bbbbbb"
+    # Both entries no longer fit in 10 bytes: the older one is gone, job files survive.
+    assert not (cache.root / "objects" / old_key).exists()
+    assert (tmp_path / "a1").read_bytes() == b"aaaaaa"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_tasks_rewriting_their_copy_leave_the_entry_intact(tmp_path):
+    cache = BlobCache(tmp_path / "cache", max_bytes=1024)
+    calls = []
+    key = BlobCache.key_for("bucket", "job/image.png", generation=1)
+
+    for job in ("job1.png", "job2.png"):
+        cache.fetch(key, 5, tmp_path / job, _downloader(b"image", calls))
+        with open(tmp_path / job, "r+b") as fh:  # edited in place, as root could even if read-only
+            fh.write(b"EDIT!")
+
+    assert (cache.root / "objects" / key).read_bytes() == b"image"
+    assert cache.fetch(key, 5, tmp_path / "job3.png", _downloader(b"image", calls)) is True
+    assert (tmp_path / "job3.png").read_bytes() == b"image"
+    assert len(calls) == 1
+
+
+def test_entry_evicted_before_the_copy_is_downloaded_again(tmp_path, monkeypatch):
+    cache = BlobCache(tmp_path / "cache", max_bytes=1024)
+    calls = []
+    key = BlobCache.key_for("bucket", "job/image.png", generation=1)
+    entry = cache.root / "objects" / key
+    cache.fetch(key, 5, tmp_path / "job1.png", _downloader(b"image", calls))
+
+    real_copy = blob_cache.clone_or_copy
+
+    def evicting_copy(src, dst):
+        if Path(src) == entry and entry.exists():
+            os.unlink(entry)  # another worker's eviction wins the race
+        real_copy(src, dst)
+
+    monkeypatch.setattr(blob_cache, "clone_or_copy", evicting_copy)
+    assert cache.fetch(key, 5, tmp_path / "job2.png", _downloader(b"image", calls)) is False
+
+    assert len(calls) == 2
+    assert (tmp_path / "job2.png").read_bytes() == b"image"
+    assert cache.stats()["misses"] == 2
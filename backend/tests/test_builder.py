@@ -1,4 +1,5 @@
 import json # <-- Add this import
+import zipfile
 from pathlib import Path
 from pptx import Presentation
 from PIL import Image
@@ -67,4 +68,29 @@ def test_build_presentation_with_wide_image(tmp_path):
             break
             
     assert image_shape is not None, "Image shape not found on slide"
-    assert image_shape.width > image_shape.height * 2
\ No newline at end of file
+    assert image_shape.width > image_shape.height * 2
+
+def test_build_presentation_streaming(tmp_path):
+    """
+    Tests that the streaming writer produces a valid deck with every slide,
+    its notes and a single copy of a repeated image.
+    """
+    job_dir = tmp_path
+    slide_plan = [
+        {"slide_title": f"Slide {i}", "slide_content": ["- Point"], "speaker_notes": f"Note {i}"}
+        for i in range(5)
+    ]
+    with open(job_dir / "slides.json", "w") as f:
+        json.dump(slide_plan, f)
+    for i in range(3):
+        Image.new('RGB', (100, 100), color='red').save(job_dir / f"image_{i}.png")
+
+    output_path = build_presentation_from_plan(job_dir, "streamed.pptx", streaming=True)
+
+    prs = Presentation(output_path)
+    assert len(prs.slides) == 5
+    assert [s.notes_slide.notes_text_frame.text for s in prs.slides] == [f"Note {i}" for i in range(5)]
+    assert sum(1 for s in prs.slides for shape in s.shapes if hasattr(shape, 'image')) == 3
+    with zipfile.ZipFile(output_path) as zf:
+        media = [n for n in zf.namelist() if n.startswith("ppt/media/")]
+    assert len(media) == 1
@@ -0,0 +1,114 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from pptx import Presentation
+
+from config import settings
+from worker import celery_app as worker
+from worker.checkpoints import CheckpointStore, RedeliveryLimitExceeded
+
+
+@pytest.fixture
+def eager(monkeypatch):
+    monkeypatch.setattr(worker.celery.conf, "task_always_eager", True)
+
+
+def test_notes_task_resumes_from_checkpointed_slides(tmp_path, eager):
+    job_id = f"resume-{uuid.uuid4().hex}"
+    prs = Presentation()
+    for title in ("One", "Two", "Three"):
+        prs.slides.add_slide(prs.slide_layouts[5]).shapes.title.text = title
+    deck = tmp_path / "staged.pptx"
+    prs.save(deck)
+    worker.upload_blob(str(deck), f"{job_id}/staged/enhanced_deck.pptx")
+    checkpoints = CheckpointStore(worker.get_bucket(), job_id)
+    checkpoints.save("notes/1", {"text": "Saved note 1"})
+    checkpoints.save("notes/2", {"text": "Saved note 2"})
+
+    generated = []
+
+    def fake_notes(slide):
+        generated.append(slide.shapes.title.text)
+        slide.notes_slide.notes_text_frame.text = "Fresh note"
+        return "Fresh note"
+
+    output_blob = f"{job_id}/enhanced_deck.pptx"
+    with patch("worker.celery_app.generate_and_add_speaker_notes", side_effect=fake_notes), \
+         patch.object(CheckpointStore, "save", autospec=True, side_effect=CheckpointStore.save) as save:
+        worker.add_speaker_notes_task.apply(args=(f"{job_id}/staged/enhanced_deck.pptx", output_blob)).get()
+
+    assert generated == ["Three"]
+    # Each slide's note is its own object; earlier notes are not re-uploaded.
+    saved = [call.args[1:] for call in save.call_args_list if call.args[1].startswith("notes")]
+    assert saved == [("notes/3", {"text": "Fresh note"})]
+    worker.download_blob(output_blob, str(tmp_path / "out.pptx"))
+    notes = [s.notes_slide.notes_text_frame.text for s in Presentation(tmp_path / "out.pptx").slides]
+    assert notes == ["Saved note 1", "Saved note 2", "Fresh note"]
+    assert checkpoints.load_all("notes") == {}
+
+
+def test_plan_task_only_regenerates_missing_batches(tmp_path, eager, monkeypatch):
+    job_id = f"resume-{uuid.uuid4().hex}"
+    monkeypatch.setattr(settings, "plan_batch_size", 1)
+    source = tmp_path / "source.txt"
+    source.write_text("Source material")
+    worker.upload_blob(str(source), f"{job_id}/source.txt")
+    images = ["a.png", "b.png", "c.png"]
+    for name in images:
+        (tmp_path / name).write_bytes(b"png")
+        worker.upload_blob(str(tmp_path / name), f"{job_id}/{name}")
+
+    calls = []
+
+    def generate(source_text, paths):
+        calls.append([p.name for p in paths])
+        if len(calls) == 2:
+            raise MemoryError("worker recycled")
+        return [{"slide_title": paths[0].stem, "slide_content": [], "speaker_notes": ""}]
+
+    with patch("worker.celery_app.generate_content_for_batch", side_effect=generate):
+        with pytest.raises(MemoryError):
+            worker.generate_slide_plan_task.apply(args=(job_id, images)).get()
+        result = worker.generate_slide_plan_task.apply(args=(job_id, images)).get()
+
+    assert calls == [["a.png"], ["b.png"], ["b.png"], ["c.png"]]
+    assert result["slide_count"] == 3
+    assert CheckpointStore(worker.get_bucket(), job_id).load("plan") is None
+
+
+def test_failed_plan_leaves_no_checkpoints(tmp_path, eager):
+    job_id = f"failed-{uuid.uuid4().hex}"
+    source = tmp_path / "source.txt"
+    source.write_text("Source material")
+    worker.upload_blob(str(source), f"{job_id}/source.txt")
+
+    with patch("worker.celery_app.generate_content_for_batch", return_value=[]):
+        result = worker.generate_slide_plan_task.apply(args=(job_id, [])).get()
+    missing = worker.generate_slide_plan_task.apply(args=(f"empty-{uuid.uuid4().hex}", [])).get()
+
+    assert "error" in result and "error" in missing
+    assert CheckpointStore(worker.get_bucket(), job_id).load("starts-generate_slide_plan_task") is None
+    assert list(worker.list_blobs(f"checkpoints/{job_id}/")) == []
+
+
+def test_task_that_keeps_killing_its_worker_is_failed(tmp_path, eager, monkeypatch):
+    job_id = f"poison-{uuid.uuid4().hex}"
+    monkeypatch.setattr(settings, "max_worker_lost_redeliveries", 2)
+    checkpoints = CheckpointStore(worker.get_bucket(), job_id)
+    # A retry is a new delivery and starts counting again.
+    assert checkpoints.record_start("enhance_ppt_task", retries=1) == 1
+    # Three deliveries at the same retry count already died mid-task.
+    for expected in (1, 2, 3):
+        assert checkpoints.record_start("enhance_ppt_task", retries=0) == expected
+
+    with patch.object(worker.dedup_index, "release") as release, \
+         patch("worker.celery_app.download_blob") as download:
+        with pytest.raises(RedeliveryLimitExceeded):
+            worker.enhance_ppt_task.apply(
+                args=(f"{job_id}/deck.pptx", f"{job_id}/enhanced_deck.pptx"), kwargs={"dedup_key": "k"},
+            ).get()
+
+    download.assert_not_called()
+    release.assert_called_once_with("k")
+    assert checkpoints.load("starts-enhance_ppt_task") is None
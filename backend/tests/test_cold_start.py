@@ -0,0 +1,49 @@
+"""Import-time benchmarks: cold starts must not pay for clients, models or the worker stack."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+WORKER_STACK = ["worker", "pptx", "PIL", "fitz", "imagehash", "google.generativeai"]
+# Generous ceiling for slow CI machines; locally the API imports in well under a second.
+API_IMPORT_BUDGET_SECONDS = 4.0
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module} as target
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "loaded": [name for name in {stack!r} if name in sys.modules],
+    "lazy": {{name: getattr(target, name).initialized for name in {lazy!r}}},
+}}))
+"""
+
+
+def _probe(module, lazy):
+    code = _PROBE.format(module=module, stack=WORKER_STACK, lazy=lazy)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    print(f"import {module}: {result['seconds']:.2f}s, {result['modules']} modules")
+    return result
+
+
+def test_api_import_skips_worker_stack_and_builds_nothing():
+    result = _probe("app.main", ["storage_client"])
+
+    assert result["loaded"] == []
+    assert result["lazy"] == {"storage_client": False}
+    assert result["seconds"] < API_IMPORT_BUDGET_SECONDS
+
+
+def test_worker_import_defers_clients_and_models():
+    result = _probe("worker.celery_app", ["storage_client", "model"])
+
+    assert "google.generativeai" not in result["loaded"]
+    assert result["lazy"] == {"storage_client": False, "model": False}
@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks import creator
+from benchmarks.documents import LINES_PER_PAGE, write_images, write_source
+from worker.creator_logic import extract_text_from_document
+from worker.ppt_builder import classify_image
+
+
+@pytest.mark.parametrize("fmt", ["pdf", "docx", "txt"])
+def test_sources_extract_to_one_line_per_generated_line(tmp_path, fmt):
+    stats = write_source(tmp_path / f"source.{fmt}", fmt, pages=3)
+    text = extract_text_from_document(str(tmp_path / f"source.{fmt}"))
+
+    assert stats["pages"] == 3 and stats["bytes"] > 0
+    assert len([line for line in text.splitlines() if line.strip()]) == 3 * LINES_PER_PAGE
+
+
+def test_image_sets_cover_every_layout_class(tmp_path):
+    images = write_images(tmp_path, 4)
+
+    assert {classify_image(tmp_path / name) for name in images["names"]} == {
+        "small-small", "large-small", "small-large", "large-large",
+    }
+
+
+def test_case_runs_both_creator_tasks_end_to_end(tmp_path):
+    result = creator.run_case("txt", pages=2, images=3, workdir=tmp_path)
+
+    assert result["slides"] == 3
+    assert result["output_bytes"] > result["image_bytes"]
+    assert [result["stages"][name]["calls"] for name in creator.STAGES] == [1, 1, 1]
+    assert all(stage["peak_rss_mb"] > 0 for stage in result["stages"].values())
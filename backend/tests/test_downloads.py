@@ -0,0 +1,101 @@
+import uuid
+from fastapi.testclient import TestClient
+from backend.app.main import app, storage_client, GCS_BUCKET_NAME
+
+client = TestClient(app)
+
+
+def _store_output(payload: bytes):
+    job_id = str(uuid.uuid4())
+    storage_client.bucket(GCS_BUCKET_NAME).blob(f"{job_id}/presentation.pptx").upload_from_string(payload.decode())
+    return job_id
+
+
+def test_download_reports_length_and_etag():
+    payload = b"x" * 4096
+    job_id = _store_output(payload)
+
+    response = client.get(f"/api/v1/creator/download/{job_id}")
+
+    assert response.status_code == 200
+    assert response.content == payload
+    assert response.headers["content-length"] == str(len(payload))
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "etag" in response.headers
+
+
+def test_download_supports_byte_ranges():
+    payload = bytes(range(256)).hex().encode()
+    job_id = _store_output(payload)
+
+    response = client.get(f"/api/v1/creator/download/{job_id}", headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.content == payload[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(payload)}"
+
+
+def test_download_conditional_get_returns_not_modified():
+    job_id = _store_output(b"cached deck")
+    etag = client.get(f"/api/v1/creator/download/{job_id}").headers["etag"]
+
+    response = client.get(f"/api/v1/creator/download/{job_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_download_missing_file_returns_404():
+    response = client.get(f"/api/v1/creator/download/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+
+def test_signed_urls_and_signer_email_are_cached():
+    from unittest.mock import MagicMock, patch
+    from backend.app import main
+
+    bucket = MagicMock()
+    bucket.blob.return_value.exists.return_value = True
+    bucket.blob.return_value.generate_signed_url.return_value = "https://signed.example/deck"
+    main._signed_url_cache.clear()
+    main._signer_email_cache.clear()
+    hits_before = main.signed_url_stats.snapshot()["hits"]
+
+    with patch.object(main.settings, "use_local_storage", False), \
+         patch.object(main.storage_client, "bucket", return_value=bucket), \
+         patch.object(main, "_get_runtime_service_account_email", return_value="sa@example.com") as mock_email:
+        first = main.generate_download_signed_url_v4("job/deck.pptx")
+        second = main.generate_download_signed_url_v4("job/deck.pptx")
+        main.generate_download_signed_url_v4("job/other.pptx")
+
+    assert first == second == "https://signed.example/deck"
+    assert bucket.blob.return_value.generate_signed_url.call_count == 2
+    mock_email.assert_called_once()
+    assert main.signed_url_stats.snapshot()["hits"] == hits_before + 1
+    main._signed_url_cache.clear()
+
+
+def test_gcs_stream_is_pinned_to_the_served_generation():
+    import io
+    import pytest
+    from unittest.mock import MagicMock, patch
+    from fastapi import HTTPException
+    from google.cloud.exceptions import PreconditionFailed
+    from backend.app import main
+
+    blob = MagicMock(size=10, generation=7)
+    blob.open.return_value = io.BytesIO(b"0123456789")
+    bucket = MagicMock()
+    bucket.blob.return_value = blob
+
+    with patch.object(main.settings, "use_local_storage", False), \
+         patch.object(main.storage_client, "bucket", return_value=bucket):
+        response = main._stream_blob_response("job/presentation.pptx", "presentation.pptx")
+        blob.open.assert_called_once_with("rb", if_generation_match=7)
+        assert response.headers["etag"] == '"7"'
+
+        # Rebuilt between the metadata reload and the first read.
+        blob.open.return_value = MagicMock(read=MagicMock(side_effect=PreconditionFailed("generation changed")))
+        with pytest.raises(HTTPException) as excinfo:
+            main._stream_blob_response("job/presentation.pptx", "presentation.pptx")
+    assert excinfo.value.status_code == 412
@@ -0,0 +1,56 @@
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from benchmarks import enhancer
+from benchmarks.decks import WATERMARK_TEXT, build_deck
+
+
+def _pictures(shapes):
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from _pictures(shape.shapes)
+        elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            yield shape
+
+
+def test_synthetic_deck_contains_what_it_reports(tmp_path):
+    stats = build_deck(tmp_path / "deck.pptx", slides=4, media_kb=20, group_every=2, watermark_every=2)
+    prs = Presentation(str(tmp_path / "deck.pptx"))
+
+    assert stats["slides"] == len(prs.slides) == 4
+    assert (stats["groups"], stats["watermarks"]) == (2, 2)
+    assert stats["pictures"] == sum(len(list(_pictures(slide.shapes))) for slide in prs.slides) == 4 * 2 + 2 * 3
+    assert any(shape.has_text_frame and shape.text_frame.text == WATERMARK_TEXT for shape in prs.slide_master.shapes)
+
+
+def test_every_stage_runs_and_strips_the_repeated_logo(tmp_path):
+    result = enhancer.run_benchmark(
+        {"slides": 4, "media_kb": 20, "group_every": 2, "watermark_every": 2}, repeat=1,
+    )
+
+    assert list(result["stages"]) == list(enhancer.STAGES)
+    assert all(stage["seconds"] > 0 and stage["peak_rss_mb"] > 0 for stage in result["stages"].values())
+    assert result["peak_rss_mb"] == max(stage["peak_rss_mb"] for stage in result["stages"].values())
+
+    deck = tmp_path / "deck.pptx"
+    build_deck(deck, slides=4, media_kb=20, group_every=0, watermark_every=0)
+    prs = Presentation(str(deck))
+    enhancer.enhancer.remove_frequent_images(prs, min_occurrences=3, hash_tolerance=5)
+    assert sum(len(list(_pictures(slide.shapes))) for slide in prs.slides) == 4
+
+
+def test_compare_flags_slow_stages_and_memory_growth_but_ignores_noise():
+    baseline = {
+        "stages": {"load": {"seconds": 1.0}, "save": {"seconds": 0.5}, "remove_watermarks_from_masters": {"seconds": 0.001}},
+        "peak_rss_mb": 200.0,
+    }
+    result = {
+        "stages": {"load": {"seconds": 1.2}, "save": {"seconds": 0.8}, "remove_watermarks_from_masters": {"seconds": 0.01}},
+        "peak_rss_mb": 240.0,
+    }
+
+    assert enhancer.compare(result, baseline, time_threshold=0.3, memory_threshold=0.25) == [
+        "save: 0.800s vs baseline 0.500s (+60%)",
+    ]
+    result["peak_rss_mb"] = 260.0
+    assert enhancer.compare(result, baseline, time_threshold=0.3, memory_threshold=0.25)[-1].startswith("peak RSS")
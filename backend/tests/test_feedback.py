@@ -0,0 +1,61 @@
+import csv
+import io
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from config.feedback import FEEDBACK_CSV, SHARD_PREFIX, FeedbackStore
+from config.storage import LocalStorageClient
+
+client = TestClient(app)
+
+
+def _rows(text):
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def test_feedback_is_appended_and_exported():
+    message = f"Great tool {uuid.uuid4()}"
+    response = client.post("/api/v1/feedback", json={"feedback_type": "praise", "message": message})
+    assert response.status_code == 201
+
+    export = client.get("/api/v1/feedback/export")
+    assert export.status_code == 200
+    assert message in [row["message"] for row in _rows(export.text)]
+
+
+def test_compaction_merges_closed_shards_with_legacy_csv(tmp_path):
+    bucket = LocalStorageClient(str(tmp_path)).bucket("test-bucket")
+    bucket.blob(FEEDBACK_CSV).upload_from_string("name,email,feedback_type,message\nAnju,,bug,old row\n")
+    store = FeedbackStore(bucket)
+    last_hour = datetime.now(timezone.utc) - timedelta(hours=1)
+    store.append({"name": "A", "feedback_type": "idea", "message": "first"}, now=last_hour)
+    store.append({"name": "B", "feedback_type": "idea", "message": "second"}, now=last_hour + timedelta(seconds=1))
+    store.append({"name": "C", "feedback_type": "idea", "message": "current hour"})
+
+    assert store.compact() == 2
+
+    consolidated = _rows(bucket.blob(FEEDBACK_CSV).download_as_text())
+    assert [row["message"] for row in consolidated] == ["old row", "first", "second"]
+    assert consolidated[1]["submitted_at"]
+    remaining = [b.name for b in bucket.list_blobs(prefix=SHARD_PREFIX)]
+    assert len(remaining) == 1
+    assert [row["message"] for row in _rows("".join(store.iter_csv()))] == ["old row", "first", "second", "current hour"]
+
+
+def test_compaction_interrupted_before_deleting_shards_does_not_duplicate_rows(tmp_path):
+    from unittest.mock import patch
+    from config.storage import LocalBlob
+
+    bucket = LocalStorageClient(str(tmp_path)).bucket("test-bucket")
+    store = FeedbackStore(bucket)
+    store.append({"name": "A", "feedback_type": "idea", "message": "once"}, now=datetime.now(timezone.utc) - timedelta(hours=1))
+
+    with patch.object(LocalBlob, "delete", side_effect=TimeoutError("worker killed")), pytest.raises(TimeoutError):
+        store.compact()
+    assert store.compact() == 0
+
+    assert [row["message"] for row in _rows(bucket.blob(FEEDBACK_CSV).download_as_text())] == ["once"]
+    assert list(bucket.list_blobs(prefix=SHARD_PREFIX)) == []
+    assert list(_rows("".join(store.iter_csv()))[0]) == ["name", "email", "feedback_type", "message", "submitted_at"]
@@ -0,0 +1,74 @@
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import health
+from health import ReadinessMonitor
+
+client = TestClient(health.app)
+
+
+def _counting_checks(fail=False):
+    calls = {"redis": 0, "storage": 0}
+
+    def redis_ping():
+        calls["redis"] += 1
+
+    def storage_read():
+        calls["storage"] += 1
+        if fail:
+            raise RuntimeError("bucket unreachable")
+
+    return {"redis": redis_ping, "storage": storage_read}, calls
+
+
+def test_probes_serve_the_cached_check_result():
+    checks, calls = _counting_checks(fail=True)
+    monitor = ReadinessMonitor(checks, interval_seconds=60)
+    monitor.run_checks()
+
+    with patch.object(health, "readiness", monitor):
+        responses = [client.get("/readyz") for _ in range(5)]
+        live = client.get("/livez")
+
+    assert calls == {"redis": 1, "storage": 1}
+    assert {r.status_code for r in responses} == {503}
+    body = responses[0].json()
+    assert body["checks"]["redis"]["status"] == "ok"
+    assert (body["checks"]["storage"]["status"], body["checks"]["storage"]["error"]) == ("failed", "bucket unreachable")
+    assert live.status_code == 200
+
+
+def test_background_checker_refreshes_and_goes_unready_when_stale():
+    checks, calls = _counting_checks()
+    monitor = ReadinessMonitor(checks, interval_seconds=0.02)
+    assert monitor.snapshot() == {"ready": False, "reason": "first check has not finished"}
+
+    monitor.start()
+    deadline = time.monotonic() + 2
+    while calls["redis"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    monitor.stop()
+
+    assert calls["redis"] >= 3
+    time.sleep(0.02 * (health.READINESS_STALE_INTERVALS + 2))
+    snapshot = monitor.snapshot()
+    assert snapshot["ready"] is False
+    assert snapshot["reason"].startswith("last check is")
+
+
+def test_limiter_stats_reuse_one_pooled_client():
+    from unittest.mock import MagicMock
+
+    redis_client = MagicMock()
+    redis_client.hgetall.return_value = {}
+    redis_client.get.return_value = None
+    redis_client.zcard.return_value = 0
+    with patch.dict(health._clients, clear=True), \
+         patch.object(health.redis, "from_url", return_value=redis_client) as from_url:
+        first = client.get("/llm-limiter").json()
+        client.get("/llm-limiter")
+
+    from_url.assert_called_once()
+    assert all(stats["available"] for stats in first.values())
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from backend.app.events import QUEUE_SIZE, ProgressHub
+from backend.app.main import app
+
+client = TestClient(app)
+
+
+class FakePubSub:
+    def __init__(self):
+        self.patterns = []
+        self.pending = []
+        self.closed = False
+
+    async def psubscribe(self, pattern):
+        self.patterns.append(pattern)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+        if not self.pending:
+            await asyncio.sleep(0.001)
+            return None
+        channel, data = self.pending.pop(0)
+        return {"type": "pmessage", "channel": channel, "data": data}
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """Publishes `messages` once the endpoint reads the last event, i.e. after it subscribed."""
+
+    def __init__(self, last_event, messages):
+        self._last_event = last_event
+        self._messages = list(messages)
+        self.pubsubs = []
+
+    def pubsub(self):
+        self.pubsubs.append(FakePubSub())
+        return self.pubsubs[-1]
+
+    def publish(self, channel, data):
+        for pubsub in self.pubsubs:
+            pubsub.pending.append((channel, data))
+
+    async def get(self, key):
+        for channel, data in self._messages:
+            self.publish(channel, data)
+        self._messages = []
+        return self._last_event
+
+
+def _events(body: str):
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+def _stream(fake, job_id, max_subscribers=10):
+    hub = ProgressHub(lambda: fake, max_subscribers)
+    with patch('backend.app.main._get_progress_redis', return_value=fake), \
+         patch('backend.app.main.progress_hub', hub):
+        return hub, client.get(f"/api/v1/jobs/events/{job_id}")
+
+
+def test_job_events_stream_until_terminal_stage():
+    """
+    Tests that the SSE endpoint replays the last known stage and forwards
+    published events until the job completes.
+    """
+    last = json.dumps({"job_id": "job-1", "stage": "downloaded"})
+    published = [
+        (b"job-progress:job-1", json.dumps({"job_id": "job-1", "stage": "notes", "current": 1, "total": 2}).encode()),
+        (b"job-progress:job-9", json.dumps({"job_id": "job-9", "stage": "notes"}).encode()),
+        (b"job-progress:job-1", json.dumps({"job_id": "job-1", "stage": "complete"}).encode()),
+        (b"job-progress:job-1", json.dumps({"job_id": "job-1", "stage": "never-sent"}).encode()),
+    ]
+    fake = FakeRedis(last, published)
+    hub, response = _stream(fake, "job-1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [e["stage"] for e in _events(response.text)] == ["downloaded", "notes", "complete"]
+    assert [p.patterns for p in fake.pubsubs] == [["job-progress:*"]]
+    assert hub.subscriber_count == 0
+
+
+def test_job_events_for_finished_job_without_events():
+    fake = FakeRedis(None, [])
+    with patch('backend.app.main._finished_event', return_value=json.dumps({"job_id": "job-2", "stage": "complete"})):
+        hub, response = _stream(fake, "job-2")
+
+    assert [e["stage"] for e in _events(response.text)] == ["complete"]
+    assert hub.subscriber_count == 0
+
+
+def test_job_events_are_refused_once_the_process_is_full():
+    hub, response = _stream(FakeRedis(None, []), "job-3", max_subscribers=0)
+
+    assert response.status_code == 503
+    assert hub.subscriber_count == 0
+
+
+def test_streams_share_one_subscription_and_only_see_their_job():
+    fake = FakeRedis(None, [])
+    hub = ProgressHub(lambda: fake, max_subscribers=10)
+
+    async def scenario():
+        first, second = await hub.subscribe("job-1"), await hub.subscribe("job-1")
+        other = await hub.subscribe("job-2")
+        fake.publish(b"job-progress:job-1", b"event")
+        received = [await first.get(timeout=1), await second.get(timeout=1), await other.get(timeout=0.05)]
+        for subscription in (first, second, other):
+            subscription.close()
+        return received
+
+    assert asyncio.run(scenario()) == [b"event", b"event", None]
+    assert len(fake.pubsubs) == 1
+    assert hub.subscriber_count == 0
+
+
+def test_slow_streams_keep_only_the_newest_events():
+    fake = FakeRedis(None, [])
+    hub = ProgressHub(lambda: fake, max_subscribers=10)
+
+    async def scenario():
+        subscription = await hub.subscribe("job-1")
+        for index in range(QUEUE_SIZE * 2):
+            hub._dispatch("job-progress:job-1", index)
+        received = []
+        while (event := await subscription.get(timeout=0.05)) is not None:
+            received.append(event)
+        subscription.close()
+        return received
+
+    assert asyncio.run(scenario()) == list(range(QUEUE_SIZE, QUEUE_SIZE * 2))
@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from worker.llm_limiter import LLMLimiter, RateLimitedModel
+
+
+class ScriptRedis:
+    """Records limiter script calls; slots and tokens are always granted."""
+
+    def __init__(self, slots=(), token_wait="0"):
+        self.adjustments = []
+        self.stats = {}
+        self.released = 0
+        self.blocked = []
+        self._slots = list(slots)
+        self._token_wait = token_wait
+
+    def register_script(self, source):
+        if "ZCARD" in source:
+            return lambda keys, args: self._slots.pop(0) if self._slots else 1
+        if "HMGET" in source:
+            return lambda keys, args: self._token_wait
+        return lambda keys, args: self.adjustments.append(args[0]) or "4"
+
+    def blpop(self, keys, timeout=0):
+        self.blocked.append((keys, timeout))
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class _Pipe:
+            def hincrbyfloat(self, key, field, delta):
+                redis.stats[field] = redis.stats.get(field, 0) + delta
+
+            def zrem(self, key, member):
+                pass
+
+            def lpush(self, key, value):
+                redis.released += 1
+
+            def ltrim(self, key, start, end):
+                pass
+
+            def expire(self, key, seconds):
+                pass
+
+            def execute(self):
+                pass
+
+        return _Pipe()
+
+
+def _flaky(failures, exc_factory):
+    calls = []
+
+    def generate_content(prompt):
+        calls.append(prompt)
+        if len(calls) <= failures:
+            raise exc_factory()
+        return MagicMock(text="Speaker note")
+
+    return generate_content, calls
+
+
+@patch("worker.llm_limiter.time.sleep")
+def test_throttled_calls_are_retried_and_shrink_the_limit(_sleep):
+    redis = ScriptRedis()
+    generate, calls = _flaky(2, lambda: api_exceptions.TooManyRequests("quota"))
+    model = RateLimitedModel(MagicMock(generate_content=generate), LLMLimiter("test", "redis://unused", client=redis))
+
+    assert model.generate_content("prompt").text == "Speaker note"
+    assert len(calls) == 3
+    assert redis.adjustments == ["decrease", "decrease", "increase"]
+    assert (redis.stats["throttled"], redis.stats["retries"], redis.stats["acquired"]) == (2, 2, 3)
+
+
+@patch("worker.llm_limiter.time.sleep")
+def test_waiters_block_on_releases_and_sleep_until_their_token(sleep):
+    redis = ScriptRedis(slots=[0, 0, 1], token_wait="1.5")
+    limiter = LLMLimiter("test", "redis://unused", client=redis)
+
+    lease = limiter.acquire()
+    limiter.release(lease)
+
+    # Two blocking waits for a free slot, one sleep for the reserved token: no polling.
+    assert redis.blocked == [(["llm:test:released"], 1)] * 2
+    sleep.assert_called_once_with(1.5)
+    assert redis.released == 1
+
+
+@patch("worker.llm_limiter.time.sleep")
+def test_other_errors_are_not_retried_and_unreachable_redis_steps_aside(_sleep):
+    limiter = LLMLimiter("test", "redis://127.0.0.1:1")
+    generate, calls = _flaky(1, lambda: ValueError("bad prompt"))
+    with pytest.raises(ValueError):
+        limiter.call(generate, "prompt")
+    assert len(calls) == 1
+
+    generate, calls = _flaky(1, lambda: api_exceptions.ResourceExhausted("quota"))
+    assert limiter.call(generate, "prompt").text == "Speaker note"
+    assert limiter.stats() == {"available": False}
@@ -0,0 +1,93 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+
+from benchmarks import load
+
+
+class FakeApi:
+    """Answers the client flows; each job needs two status polls, and one enhancer submission fails."""
+
+    def __init__(self):
+        self.polls = {}
+        self.jobs = 0
+        self.enhancements = 0
+        self.clients = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.clients.add(request.headers.get("x-forwarded-for"))
+        if path == "/api/v1/enhancer/process":
+            self.jobs += 1
+            self.enhancements += 1
+            if self.enhancements == 2:
+                return httpx.Response(500)
+            return httpx.Response(202, json={"job_id": f"e{self.jobs}", "output_filename": "enhanced_deck.pptx"})
+        if path == "/api/v1/creator/generate-plan":
+            self.jobs += 1
+            return httpx.Response(202, json={"job_id": f"c{self.jobs}"})
+        if path.startswith("/api/v1/jobs/status/"):
+            job_id = path.rsplit("/", 1)[1]
+            self.polls[job_id] = self.polls.get(job_id, 0) + 1
+            state = "SUCCESS" if self.polls[job_id] >= 2 else "STARTED"
+            return httpx.Response(200, json={"job_id": job_id, "status": state, "result": None})
+        if path.startswith("/api/v1/creator/plan/"):
+            return httpx.Response(200, json=[{"slide_title": "One", "slide_content": [], "speaker_notes": ""}])
+        if path.startswith("/api/v1/creator/build/"):
+            assert json.loads(request.content)[0]["slide_title"] == "One"
+            return httpx.Response(202, json={"build_job_id": "build-" + path.rsplit("/", 1)[1]})
+        if "/download/" in path:
+            return httpx.Response(200, content=b"pptx")
+        return httpx.Response(404)
+
+
+def _options(**overrides):
+    defaults = dict(
+        enhancer_rate=40.0, creator_rate=20.0, duration=0.25, clients=3,
+        poll_interval=0.001, job_timeout=5.0, seed=3,
+    )
+    return SimpleNamespace(**{**defaults, **overrides})
+
+
+async def _run(api, options):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(api), base_url="http://load") as client:
+        return await load.run_load(client, {"deck": b"deck", "source": b"pdf", "images": [("a.jpg", b"jpg")]}, options)
+
+
+def test_load_run_reports_latency_errors_and_completions_per_flow():
+    api = FakeApi()
+    report = asyncio.run(_run(api, _options()))
+
+    enhancer, creator = report["jobs"]["enhancer"], report["jobs"]["creator"]
+    assert enhancer["submitted"] > 2 and creator["submitted"] > 0
+    assert (enhancer["completed"], enhancer["failed"]) == (enhancer["submitted"] - 1, 1)
+    assert (creator["completed"], creator["failed"]) == (creator["submitted"], 0)
+    assert creator["jobs_per_second"] > 0 and creator["p50_seconds"] is not None
+
+    endpoints = report["endpoints"]
+    assert endpoints["POST /enhancer/process"]["errors"] == 1
+    assert endpoints["GET /jobs/status"]["requests"] == 2 * (enhancer["completed"] + 2 * creator["completed"])
+    assert endpoints["GET /creator/download"]["requests"] == creator["completed"]
+    assert all(row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] for row in endpoints.values())
+    assert len(api.clients) == 3
+
+
+def test_jobs_that_never_finish_are_reported_as_timed_out():
+    def stuck(request):
+        if request.url.path.startswith("/api/v1/jobs/status/"):
+            return httpx.Response(200, json={"status": "PENDING"})
+        return httpx.Response(202, json={"job_id": "j", "output_filename": "x.pptx"})
+
+    report = asyncio.run(_run(stuck, _options(creator_rate=0, duration=0.05, job_timeout=0.05)))
+
+    enhancer = report["jobs"]["enhancer"]
+    assert enhancer["timed_out"] == enhancer["submitted"] > 0
+    assert enhancer["completed"] == 0
+
+
+def test_percentiles_use_nearest_rank():
+    samples = list(range(1, 101))
+    assert [load._percentile(samples, q) for q in (50, 95, 99)] == [50, 95, 99]
+    assert load._percentile([], 50) is None
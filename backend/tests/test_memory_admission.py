@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+import pytest
+from celery.app.task import Context
+
+from config import settings
+from config.admission import estimate_enhancement
+from worker import memory
+
+MiB = 1024 * 1024
+
+
+class DeferrableTask:
+    name = "enhance_ppt_task"
+
+    def __init__(self, queue, retries=0):
+        self.request = Context(id="job-1", retries=retries, delivery_info={"routing_key": queue, "priority": 2})
+        self.retried_with = None
+
+    def retry(self, **options):
+        self.retried_with = options
+        return RuntimeError("retry")
+
+
+def test_media_heavy_decks_are_predicted_large_even_when_quick():
+    small = estimate_enhancement({"slides": 10, "media": 5, "media_bytes": 20 * MiB})
+    heavy = estimate_enhancement({"slides": 10, "media": 5, "media_bytes": 600 * MiB})
+
+    assert small["lane"] == "small"
+    assert heavy["estimated_seconds"] < settings.large_job_seconds
+    assert heavy["estimated_memory_bytes"] > settings.large_job_memory_bytes
+    assert heavy["lane"] == "large"
+
+
+@patch.object(memory, "headroom_bytes", return_value=300 * MiB)
+def test_tasks_without_headroom_move_to_the_large_lane_then_wait(_headroom):
+    task = DeferrableTask("cpu")
+    with pytest.raises(RuntimeError):
+        memory.ensure_headroom(task, 800 * MiB)
+    assert task.retried_with == {
+        "countdown": 0, "max_retries": settings.memory_max_deferrals, "priority": 2, "queue": "cpu-large",
+    }
+
+    task = DeferrableTask("cpu-large", retries=1)
+    with pytest.raises(RuntimeError):
+        memory.ensure_headroom(task, 800 * MiB)
+    assert (task.retried_with["queue"], task.retried_with["countdown"]) == ("cpu-large", settings.memory_defer_seconds)
+
+    fits, exhausted = DeferrableTask("cpu"), DeferrableTask("cpu-large", retries=settings.memory_max_deferrals)
+    memory.ensure_headroom(fits, 200 * MiB)
+    memory.ensure_headroom(exhausted, 800 * MiB)
+    assert fits.retried_with is None and exhausted.retried_with is None
+
+
+def test_headroom_uses_the_cgroup_limit_minus_working_set(tmp_path, monkeypatch):
+    (tmp_path / "memory.max").write_text(f"{1024 * MiB}\n")
+    (tmp_path / "memory.current").write_text(f"{700 * MiB}\n")
+    (tmp_path / "memory.stat").write_text(f"anon {500 * MiB}\ninactive_file {200 * MiB}\n")
+    monkeypatch.setattr(memory, "_CGROUP_V2", tmp_path)
+    monkeypatch.setattr(memory, "_CGROUP_V1", tmp_path / "missing")
+
+    assert memory.headroom_bytes() == 524 * MiB
+
+    (tmp_path / "memory.max").write_text("max\n")
+    with patch.object(memory.psutil, "virtual_memory") as vm:
+        vm.return_value.total, vm.return_value.available = 16 * 1024 * MiB, 3 * 1024 * MiB
+        assert memory.headroom_bytes() == 3 * 1024 * MiB
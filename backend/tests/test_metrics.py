@@ -0,0 +1,131 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import redis
+from celery.app.task import Context
+from fastapi.testclient import TestClient
+
+from config import settings
+from config.metrics import MetricsStore, metrics as shared_metrics
+from health import app as health_app
+from worker import celery_app as worker
+
+
+class HashRedis:
+    """Just enough of Redis for the metrics store: hashes, lists and one sorted set."""
+
+    def __init__(self, lists=None):
+        self.hashes = {}
+        self.lists = lists or {}
+        self.zset = {}
+        self.reads = 0
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def zadd(self, key, mapping):
+        self.zset.update(mapping)
+
+    def zrem(self, key, member):
+        self.zset.pop(member, None)
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._results = []
+
+    def _bump(self, key, field, amount):
+        fields = self._redis.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+        self._results.append(fields[field])
+
+    hincrby = hincrbyfloat = _bump
+
+    def hgetall(self, key):
+        self._results.append({k.encode(): str(v).encode() for k, v in self._redis.hashes.get(key, {}).items()})
+
+    def llen(self, key):
+        self._results.append(self._redis.lists.get(key, 0))
+
+    def zremrangebyscore(self, key, low, high):
+        self._results.append(0)
+
+    def zrange(self, key, start, end):
+        self._results.append([member.encode() for member in self._redis.zset])
+
+    def execute(self):
+        self._redis.reads += 1
+        return self._results
+
+
+class DownRedis:
+    def pipeline(self, transaction=True):
+        raise redis.ConnectionError("refused")
+
+
+def test_exposition_sums_priority_lists_and_accumulates_buckets():
+    fake = HashRedis(lists={"cpu": 2, "cpu\x06\x169": 3, "io-large": 1})
+    store = MetricsStore("redis://unused", client=fake)
+    store.observe("task_runtime_seconds", 3, task="enhance_ppt_task", state="SUCCESS")
+    store.observe("task_runtime_seconds", 45, task="enhance_ppt_task", state="SUCCESS")
+    store.observe("llm_call_seconds", 500, model="gemini-1.5-flash", outcome="ok")
+    store.task_started("t1", "add_speaker_notes_task")
+    store.task_started("t2", "add_speaker_notes_task")
+    store.task_finished("t1", "add_speaker_notes_task")
+
+    text = store.render(["cpu", "io-large"])
+
+    assert 'ppt_studio_queue_depth{queue="cpu"} 5' in text
+    assert 'ppt_studio_queue_depth{queue="io-large"} 1' in text
+    assert 'ppt_studio_tasks_in_flight{task="add_speaker_notes_task"} 1' in text
+    labels = 'state="SUCCESS",task="enhance_ppt_task"'
+    assert f'ppt_studio_task_runtime_seconds_bucket{{{labels},le="1"}} 0' in text
+    assert f'ppt_studio_task_runtime_seconds_bucket{{{labels},le="5"}} 1' in text
+    assert f'ppt_studio_task_runtime_seconds_bucket{{{labels},le="60"}} 2' in text
+    assert f'ppt_studio_task_runtime_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"ppt_studio_task_runtime_seconds_count{{{labels}}} 2" in text
+    assert f"ppt_studio_task_runtime_seconds_sum{{{labels}}} 48.0" in text
+    assert 'ppt_studio_llm_call_seconds_bucket{model="gemini-1.5-flash",outcome="ok",le="+Inf"} 1' in text
+
+
+def test_scrapes_are_served_from_cache_between_refreshes():
+    fake = HashRedis(lists={"cpu": 4})
+    store = MetricsStore("redis://unused", client=fake)
+    with patch.object(settings, "metrics_cache_seconds", 60):
+        first = store.render(["cpu"])
+        reads = fake.reads
+        fake.lists["cpu"] = 9
+
+        assert store.render(["cpu"]) == first
+    assert fake.reads == reads
+
+
+def test_unreachable_broker_is_reported_not_raised():
+    store = MetricsStore("redis://unused", client=DownRedis())
+
+    assert "ppt_studio_broker_up 0" in store.render(["cpu"])
+
+
+def test_worker_records_runtime_queue_wait_and_clears_in_flight(monkeypatch):
+    fake = HashRedis(lists={"io": 7})
+    monkeypatch.setattr(shared_metrics, "_client", fake)
+    monkeypatch.setattr(worker.celery.conf, "task_always_eager", True)
+
+    worker.compact_feedback_task.apply().get()
+    # A broker-delivered request carries the publish stamp as a top-level header.
+    delivered = SimpleNamespace(name="enhance_ppt_task", request=Context(published_at=time.time() - 20, eta=None))
+    worker._record_task_start(task_id="t1", task=delivered)
+
+    runtime = fake.hashes["metrics:task_runtime_seconds"]
+    assert runtime['state="SUCCESS",task="compact_feedback_task"|count'] == 1
+    wait = fake.hashes["metrics:task_queue_wait_seconds"]
+    assert wait['task="enhance_ppt_task"|30'] == 1
+    assert list(fake.zset) == ["enhance_ppt_task|t1"]
+    worker._record_task_end(task_id="t1", task=delivered, state="SUCCESS")
+    assert fake.zset == {}
+    with patch.object(settings, "metrics_cache_seconds", 0):
+        response = TestClient(health_app).get("/metrics")
+    assert response.status_code == 200
+    assert 'ppt_studio_queue_depth{queue="io"} 7' in response.text
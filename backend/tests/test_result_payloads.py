@@ -0,0 +1,44 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from kombu.serialization import dumps, loads
+
+from backend.app.main import app
+from worker import celery_app as worker
+from config.serialization import JSON_ZLIB, MSGPACK_ZSTD, register_compact_serializers
+
+client = TestClient(app)
+
+PLAN = [{"slide_title": f"Slide {i}", "slide_content": ["point"] * 4, "speaker_notes": "n" * 400} for i in range(50)]
+
+
+def test_plan_result_is_a_pointer_and_plan_is_served_from_storage(tmp_path, monkeypatch):
+    job_id = f"plan-{uuid.uuid4().hex}"
+    source = tmp_path / "notes.txt"
+    source.write_text("Quarterly results")
+    worker.upload_blob(str(source), f"{job_id}/notes.txt")
+    monkeypatch.setattr(worker.celery.conf, "task_always_eager", True)
+
+    with patch("worker.celery_app.generate_content_for_batch", return_value=PLAN):
+        result = worker.generate_slide_plan_task.apply(args=(job_id, [])).get()
+
+    assert result.pop("memory")["peak_rss_bytes"] > 0
+    assert result == {"status": "complete", "plan_blob": f"{job_id}/slides.json", "slide_count": 50}
+    response = client.get(f"/api/v1/creator/plan/{job_id}")
+    assert response.status_code == 200
+    assert response.json() == PLAN
+    assert client.get("/api/v1/creator/plan/missing-job").status_code == 404
+
+
+@pytest.mark.parametrize("name", [JSON_ZLIB, MSGPACK_ZSTD])
+def test_compact_serializers_round_trip_result_meta(name):
+    if name not in register_compact_serializers():
+        pytest.skip(f"{name} dependencies are not installed")
+    meta = {"status": "SUCCESS", "result": {"slide_plan": PLAN}, "task_id": "abc", "children": []}
+
+    content_type, encoding, payload = dumps(meta, serializer=name)
+
+    assert loads(payload, content_type, encoding) == meta
+    assert len(payload) < len(dumps(meta, serializer="json")[2]) / 4
@@ -0,0 +1,35 @@
+import os
+from config.storage import LocalStorageClient
+
+
+def _bucket(tmp_path):
+    return LocalStorageClient(str(tmp_path)).bucket("test-bucket")
+
+
+def test_list_blobs_only_returns_matching_prefix(tmp_path):
+    bucket = _bucket(tmp_path)
+    for name in ["job-1/source.pdf", "job-1/img/a.png", "job-10/source.pdf", "job-2/source.pdf", "root.txt"]:
+        bucket.blob(name).upload_from_string("data")
+
+    assert [b.name for b in bucket.list_blobs(prefix="job-1/")] == ["job-1/img/a.png", "job-1/source.pdf"]
+    assert [b.name for b in bucket.list_blobs(prefix="job-1")] == [
+        "job-1/img/a.png", "job-1/source.pdf", "job-10/source.pdf",
+    ]
+    assert [b.name for b in bucket.list_blobs(prefix="missing/")] == []
+    assert len(list(bucket.list_blobs())) == 5
+
+
+def test_upload_from_filename_links_and_download_copies(tmp_path):
+    bucket = _bucket(tmp_path / "storage")
+    source = tmp_path / "deck.pptx"
+    source.write_bytes(b"deck bytes")
+
+    blob = bucket.blob("job/deck.pptx")
+    blob.upload_from_filename(str(source))
+    assert os.stat(blob.path).st_ino == os.stat(source).st_ino
+    assert [b.name for b in bucket.list_blobs()] == ["job/deck.pptx"]
+
+    downloaded = tmp_path / "downloaded.pptx"
+    blob.download_to_filename(str(downloaded))
+    downloaded.write_bytes(b"modified locally")
+    assert blob.path.read_bytes() == b"deck bytes"
@@ -0,0 +1,50 @@
+import uuid
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from config import settings
+from worker import celery_app as worker
+from worker.pools import worker_args
+
+
+def test_llm_tasks_route_to_io_queue_and_cpu_tasks_to_cpu_queue():
+    router = worker.celery.amqp.router
+    queue_for = lambda name: router.route({}, name)["queue"].name
+
+    assert queue_for("generate_slide_plan_task") == settings.celery_io_queue
+    assert queue_for("add_speaker_notes_task") == settings.celery_io_queue
+    assert queue_for("enhance_ppt_task") == settings.celery_cpu_queue
+    assert queue_for("build_ppt_from_plan_task") == settings.celery_cpu_queue
+    io = settings.celery_io_queue
+    assert f"--queues={io},{io}-large" in worker_args("io")
+    assert f"--pool={settings.worker_io_pool}" in worker_args("io")
+    assert "--pool=prefork" in worker_args("cpu")
+
+
+def test_enhancer_hands_notes_stage_to_io_task(tmp_path, monkeypatch):
+    job_id = f"routing-{uuid.uuid4().hex}"
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Quarterly results"
+    deck = tmp_path / "deck.pptx"
+    prs.save(deck)
+    worker.upload_blob(str(deck), f"{job_id}/deck.pptx")
+
+    notes_calls = []
+    monkeypatch.setattr(worker, "generate_and_add_speaker_notes", lambda s: notes_calls.append(s))
+    monkeypatch.setattr(settings, "enhancer_notes_on_io_queue", True)
+    monkeypatch.setattr(worker.celery.conf, "task_always_eager", True)
+
+    output_blob = f"{job_id}/enhanced_deck.pptx"
+    result = worker.enhance_ppt_task.apply(args=(f"{job_id}/deck.pptx", output_blob)).get()
+
+    memory = result.pop("memory")
+    assert result == {"status": "complete", "output_blob": output_blob}
+    # Samples from the CPU stages travel with the staged deck into the notes task.
+    assert {"hashed", "staged", "notes", "saved"} <= set(memory["stages"])
+    assert memory["peak_rss_bytes"] >= max(memory["stages"].values())
+    assert len(notes_calls) == 1
+    names = [b.name for b in worker.list_blobs(job_id)]
+    assert output_blob in names
+    assert not any("/staged/" in name for name in names)
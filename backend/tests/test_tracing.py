@@ -0,0 +1,78 @@
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from celery.app.task import Context
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from config import celery_app as celery_config
+from config import settings
+from config.tracing import span
+from worker import celery_app as worker
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "spans.jsonl"
+    monkeypatch.setattr(settings, "trace_export_path", str(path))
+
+    def read():
+        return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+    return read
+
+
+def test_enqueue_carries_the_request_trace_to_the_worker_task(trace_file):
+    published = []
+
+    def publish(*_args, **_kwargs):
+        headers = {}
+        celery_config._stamp_headers(headers=headers)
+        published.append(headers)
+
+    with patch("backend.app.main.build_ppt_from_plan_task.apply_async", side_effect=publish):
+        response = client.post("/api/v1/creator/build/trace-job", json=[{"slide_title": "One"}])
+    assert response.status_code == 202
+    delivered = SimpleNamespace(name="build_ppt_from_plan_task", request=Context(**published[0]))
+    worker._start_task_span(task_id="t1", task=delivered)
+    worker._end_task_span(task_id="t1", state="SUCCESS")
+
+    spans = {s["name"]: s for s in trace_file()}
+    request_span, enqueue, task = spans["http.request"], spans["enqueue"], spans["task build_ppt_from_plan_task"]
+    assert request_span["parent_id"] is None
+    assert request_span["attributes"]["status_code"] == 202
+    assert spans["storage.upload"]["parent_id"] == request_span["span_id"]
+    assert enqueue["parent_id"] == request_span["span_id"]
+    assert task["parent_id"] == enqueue["span_id"]
+    assert {s["trace_id"] for s in spans.values()} == {request_span["trace_id"]}
+
+
+def test_worker_stages_nest_under_the_task_span(tmp_path, trace_file, monkeypatch):
+    job_id = f"trace-{uuid.uuid4().hex}"
+    source = tmp_path / "notes.txt"
+    source.write_text("Quarterly results")
+    worker.upload_blob(str(source), f"{job_id}/notes.txt")
+    monkeypatch.setattr(worker.celery.conf, "task_always_eager", True)
+    plan = [{"slide_title": "One", "slide_content": [], "speaker_notes": ""}]
+
+    with span("caller") as caller, \
+         patch("worker.celery_app.generate_content_for_batch", side_effect=RuntimeError("model down")):
+        result = worker.generate_slide_plan_task.apply(args=(job_id, []))
+    with patch("worker.celery_app.generate_content_for_batch", return_value=plan):
+        worker.generate_slide_plan_task.apply(args=(job_id, [])).get()
+
+    assert result.failed()
+    spans = trace_file()
+    failed_task, task = [s for s in spans if s["name"] == "task generate_slide_plan_task"]
+    assert failed_task["parent_id"] == caller.span_id
+    assert failed_task["status"] == "error"
+    assert task["parent_id"] is None
+    children = [s["name"] for s in spans if s["parent_id"] == task["span_id"]]
+    assert children == ["storage.download", "extract_text_from_document", "plan_batch", "storage.upload"]
+    failed_batch = next(s for s in spans if s["name"] == "plan_batch" and s["trace_id"] == failed_task["trace_id"])
+    assert failed_batch["attributes"]["error"] == "RuntimeError: model down"
@@ -0,0 +1,46 @@
+from unittest.mock import MagicMock, patch
+
+from google.cloud import storage
+
+from config import settings
+from config.storage import LocalStorageClient
+from worker import transfer
+
+
+def _gcs_blob(size):
+    blob = MagicMock(spec=storage.Blob)
+    blob.size = size
+    return blob
+
+
+def test_large_gcs_objects_use_parallel_ranged_transfers(tmp_path):
+    source = tmp_path / "deck.pptx"
+    source.write_bytes(b"x" * 32)
+    with patch.object(settings, "transfer_parallel_threshold_bytes", 16), \
+         patch.object(transfer.transfer_manager, "download_chunks_concurrently") as download, \
+         patch.object(transfer.transfer_manager, "upload_chunks_concurrently") as upload:
+        big = _gcs_blob(32)
+        transfer.download_file(big, str(tmp_path / "out.pptx"))
+        transfer.upload_file(str(source), big)
+
+        small = _gcs_blob(8)
+        transfer.download_file(small, str(tmp_path / "small.pptx"))
+
+    assert download.call_args.kwargs["crc32c_checksum"] is True
+    assert download.call_args.kwargs["worker_type"] == transfer.transfer_manager.THREAD
+    assert upload.call_count == 1
+    download.assert_called_once()
+    small.download_to_filename.assert_called_once_with(str(tmp_path / "small.pptx"), checksum="crc32c")
+
+
+def test_local_blobs_always_use_the_plain_path(tmp_path):
+    bucket = LocalStorageClient(str(tmp_path / "store")).bucket("bucket")
+    source = tmp_path / "deck.pptx"
+    source.write_bytes(b"y" * 32)
+    with patch.object(settings, "transfer_parallel_threshold_bytes", 1), \
+         patch.object(transfer.transfer_manager, "upload_chunks_concurrently") as upload:
+        transfer.upload_file(str(source), bucket.blob("job/deck.pptx"))
+        transfer.download_file(bucket.blob("job/deck.pptx"), str(tmp_path / "copy.pptx"))
+
+    upload.assert_not_called()
+    assert (tmp_path / "copy.pptx").read_bytes() == b"y" * 32
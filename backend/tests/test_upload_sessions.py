@@ -0,0 +1,91 @@
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from backend.app.main import app
+
+client = TestClient(app)
+
+
+def _upload_in_chunks(url, payload, chunk_size):
+    response = None
+    for start in range(0, len(payload), chunk_size):
+        chunk = payload[start:start + chunk_size]
+        end = start + len(chunk) - 1
+        response = client.put(url, content=chunk, headers={"Content-Range": f"bytes {start}-{end}/{len(payload)}"})
+        if end + 1 < len(payload):
+            assert response.status_code == 308
+            assert response.headers["Range"] == f"bytes=0-{end}"
+    return response
+
+
+def test_creator_upload_session_flow():
+    """
+    Tests the local chunked-upload flow: open a session, upload each file in
+    chunks, then commit to enqueue the plan generation task.
+    """
+    response = client.post("/api/v1/uploads/sessions", json={
+        "kind": "creator",
+        "files": [
+            {"filename": "source.txt", "content_type": "text/plain"},
+            {"filename": "chart.png", "content_type": "image/png"},
+        ],
+    })
+    assert response.status_code == 201
+    session = response.json()
+    uploads = {u["filename"]: u for u in session["uploads"]}
+
+    payload = b"0123456789" * 100
+    last = _upload_in_chunks(uploads["source.txt"]["upload_url"], payload, 256)
+    assert last.status_code == 200
+    assert last.json()["size"] == len(payload)
+
+    with patch('backend.app.main.generate_slide_plan_task.apply_async') as mock_task:
+        early = client.post(f"/api/v1/uploads/sessions/{session['session_id']}/commit")
+        assert early.status_code == 409
+        mock_task.assert_not_called()
+
+        _upload_in_chunks(uploads["chart.png"]["upload_url"], b"fake png content", 8)
+        response = client.post(f"/api/v1/uploads/sessions/{session['session_id']}/commit")
+
+        assert response.status_code == 202
+        assert response.json() == {"job_id": session["session_id"]}
+        mock_task.assert_called_once()
+        assert mock_task.call_args.kwargs["args"] == [session["session_id"], ["chart.png"]]
+
+    # A session can only be committed once.
+    assert client.post(f"/api/v1/uploads/sessions/{session['session_id']}/commit").status_code == 404
+
+
+def test_enhancer_upload_session_requires_deck():
+    response = client.post("/api/v1/uploads/sessions", json={
+        "kind": "enhancer",
+        "files": [{"filename": "logo.png", "content_type": "image/png", "role": "logo_file"}],
+    })
+    assert response.status_code == 422
+
+
+def test_commit_waits_for_the_declared_size_and_survives_enqueue_failures():
+    payload = b"%PDF" + b"x" * 300
+    session = client.post("/api/v1/uploads/sessions", json={
+        "kind": "creator",
+        "files": [{"filename": "source.pdf", "content_type": "application/pdf", "size": len(payload)}],
+    }).json()
+    url = session["uploads"][0]["upload_url"]
+    commit_url = f"/api/v1/uploads/sessions/{session['session_id']}/commit"
+
+    half = client.put(url, content=payload[:100], headers={"Content-Range": f"bytes 0-99/{len(payload)}"})
+    assert half.status_code == 308
+    with patch('backend.app.main.generate_slide_plan_task.apply_async') as mock_task:
+        assert client.post(commit_url).status_code == 409
+        mock_task.assert_not_called()
+
+    # A single-shot PUT (no Content-Range) replaces the partial upload and completes it.
+    whole = client.put(url, content=payload)
+    assert whole.status_code == 200
+    assert whole.json()["size"] == len(payload)
+
+    failing_client = TestClient(app, raise_server_exceptions=False)
+    with patch('backend.app.main.generate_slide_plan_task.apply_async', side_effect=[ConnectionError("broker down"), None]):
+        assert failing_client.post(commit_url).status_code == 500
+        # The session is still there, so the client can simply commit again.
+        assert client.post(commit_url).status_code == 202
+    assert client.post(commit_url).status_code == 404
@@ -0,0 +1,138 @@
+"""Worker-local, content-addressed cache for downloaded blobs.
+
+Entries are keyed by bucket, blob name and blob generation, so a rewritten
+object never serves stale bytes. Tasks receive a private copy in their job
+directory instead of a fresh download (a reflink where the filesystem supports
+it, as ``LocalBlob.download_to_filename`` does), never a hardlink: the workers
+run as root, so no file mode would stop a task that rewrites its input in
+place from corrupting the shared entry. The least recently used entries are
+evicted once the cache grows past its size cap. The cache directory is shared
+by every prefork child on the machine, so all updates are rename-based and the
+hit/miss counters live in a small locked stats file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Callable
+
+from config.storage import clone_or_copy
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+_STATS_FIELDS = ("hits", "misses", "bytes_saved", "bytes_downloaded", "evictions")
+
+
+class BlobCache:
+    def __init__(self, root: str | Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._objects = self.root / "objects"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._stats_path = self.root / "stats.json"
+
+    @staticmethod
+    def key_for(bucket_name: str, blob_name: str, generation) -> str:
+        return hashlib.sha256(f"{bucket_name}/{blob_name}#{generation}".encode("utf-8")).hexdigest()
+
+    def fetch(self, key: str, size: int | None, destination: Path, download: Callable[[str], None]) -> bool:
+        """Place the object for `key` at `destination`; return True on a cache hit.
+
+        `download(path)` is only called on a miss, to fill the cache entry.
+        """
+        entry = self._objects / key
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            stat = None
+        if stat is not None and (size is None or stat.st_size == size):
+            try:
+                os.utime(entry)  # mtime doubles as the LRU clock; atime is unreliable (noatime)
+                self._copy(entry, destination)
+            except FileNotFoundError:
+                pass  # evicted by another worker since the stat: download it again
+            else:
+                self._bump(hits=1, bytes_saved=stat.st_size)
+                return True
+
+        tmp = self._objects / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            download(str(tmp))
+            # Copied while still private: eviction may unlink `entry` as soon as it is published.
+            self._copy(tmp, destination)
+            os.replace(tmp, entry)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._bump(misses=1, bytes_downloaded=destination.stat().st_size)
+        self.evict()
+        return False
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits `max_bytes`."""
+        entries = []
+        total = 0
+        with os.scandir(self._objects) as it:
+            for e in it:
+                if e.name.startswith("."):
+                    continue
+                try:
+                    st = e.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+        evicted = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)  # job directories hold their own copies
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        if evicted:
+            self._bump(evictions=evicted)
+        return evicted
+
+    def stats(self) -> dict:
+        data = self._read_stats()
+        lookups = data["hits"] + data["misses"]
+        data["hit_rate"] = data["hits"] / lookups if lookups else 0.0
+        data["max_bytes"] = self.max_bytes
+        return data
+
+    @staticmethod
+    def _copy(entry: Path, destination: Path) -> None:
+        """Raises FileNotFoundError if `entry` was evicted in the meantime."""
+        if destination.exists():
+            destination.unlink()
+        clone_or_copy(entry, destination)
+
+    def _read_stats(self) -> dict:
+        try:
+            with open(self._stats_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        return {field: int(data.get(field, 0)) for field in _STATS_FIELDS}
+
+    def _bump(self, **deltas: int) -> None:
+        with open(self.root / "stats.lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._read_stats()
+            for field, delta in deltas.items():
+                data[field] += delta
+            tmp = self._stats_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp, self._stats_path)
@@ -2,8 +2,10 @@ import os
 import io
 import json
 import shutil
+import time
+from datetime import datetime
 from pathlib import Path
-from celery import Celery
+from celery.signals import task_failure, task_postrun, task_prerun, task_success, worker_init
 from pptx import Presentation
 from pptx.slide import Slide
 from pptx.util import Inches, Pt
@@ -12,11 +14,18 @@ from pptx.enum.text import PP_PARAGRAPH_ALIGNMENT
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from PIL import Image
 import imagehash
-import google.generativeai as genai
 from google.cloud import storage
 from google.auth.exceptions import DefaultCredentialsError
 
 from config import settings
+from config.admission import lane_of, lane_queue
+from config.celery_app import celery as celery_app
+from config.dedup import dedup_index
+from config.feedback import FeedbackStore
+from config.lazy import Lazy
+from config.metrics import metrics
+from config.progress import publish_progress
+from config.tracing import span, start_span
 from config.storage import LocalStorageClient
 
 
@@ -30,56 +39,160 @@ def _create_storage_client() -> storage.Client:
     if settings.use_local_storage:
         return LocalStorageClient()
     try:
-        return storage.Client()
+        client = storage.Client()
     except DefaultCredentialsError:
         if settings.is_development:
             return LocalStorageClient()
         raise
+    transfer.configure_connection_pool(client, settings.transfer_max_workers)
+    return client
 
 
 # Import other project modules
-from .creator_logic import extract_text_from_document, generate_content_for_batch
+from .llm_limiter import gemini_model
+from . import transfer
+from .creator_logic import extract_text_from_document, generate_content_for_batch, is_error_batch
 from .ppt_builder import build_presentation_from_plan
+from .blob_cache import BlobCache
+from .checkpoints import CheckpointStore, RedeliveryLimitExceeded
+from .memory import MemoryAccount, ensure_headroom, memory_estimate
 
 # --- Configuration ---
 GCS_BUCKET_NAME = settings.gcs_bucket_name
-storage_client = _create_storage_client()
+# Clients and models are built on first use in each process: nothing is paid
+# at import, and prefork children never inherit the parent's connections.
+storage_client = Lazy(_create_storage_client)
+blob_cache = (
+    BlobCache(settings.worker_blob_cache_dir, settings.worker_blob_cache_bytes)
+    if settings.worker_blob_cache_bytes > 0 else None
+)
 LOGO_PATH = "temp/logo.png"  # Default logo path if none is provided
 WATERMARK_KEYWORDS = ["CONFIDENTIAL", "DRAFT", "INTERNAL USE"]
-if settings.google_api_key:
-    genai.configure(api_key=settings.google_api_key)
-try:
-    model = genai.GenerativeModel('gemini-1.5-flash') if settings.google_api_key else _NoopModel()
-except Exception as exc:
-    print(f"Error configuring speaker notes model: {exc}")
-    model = _NoopModel()
+
+
+def _create_notes_model():
+    if not settings.google_api_key:
+        return _NoopModel()
+    try:
+        return gemini_model('gemini-1.5-flash')
+    except Exception as exc:
+        print(f"Error configuring speaker notes model: {exc}")
+        return _NoopModel()
+
+
+model = Lazy(_create_notes_model)
 
 # --- Initialize Celery ---
-celery_backend = settings.celery_backend_url
-celery = Celery("tasks", broker=settings.celery_broker_url, backend=celery_backend or None)
-celery.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
-    result_expires=settings.celery_result_expires,
-)
-if not celery_backend:
-    celery.conf.update(result_backend=None, task_ignore_result=True)
+# The app and its routing live in config/celery_app.py so the API can enqueue
+# by task name without importing this module.
+celery = celery_app
+
+
+@worker_init.connect
+def _preload_worker_modules(**_kwargs):
+    # Runs once in the worker's main process, before the pool starts, so
+    # prefork children (recycled every few tasks) inherit the imported SDK
+    # instead of re-importing it on their first Gemini call.
+    import google.generativeai  # noqa: F401
+
+
+@task_success.connect
+def _publish_task_success(sender=None, result=None, **_kwargs):
+    failed = isinstance(result, dict) and "error" in result
+    publish_progress(
+        sender.request.id, "failed" if failed else "complete",
+        **({"error": result["error"]} if failed else {}),
+    )
+
+
+@task_failure.connect
+def _publish_task_failure(task_id=None, exception=None, **_kwargs):
+    publish_progress(task_id, "failed", error=str(exception))
+
+
+# Start times of the tasks running in this process, for the runtime histogram.
+_task_started_at = {}
+
+
+# dispatch_uid keeps one receiver even if this module is imported under two
+# names (worker.celery_app and backend.worker.celery_app in the test suite).
+@task_prerun.connect(dispatch_uid="ppt-studio-task-metrics-start")
+def _record_task_start(task_id=None, task=None, **_kwargs):
+    now = time.time()
+    _task_started_at[task_id] = now
+    metrics.task_started(task_id, task.name)
+    published_at = getattr(task.request, "published_at", None)
+    if published_at:
+        # A countdown/ETA is a deliberate delay, not backlog.
+        eta = task.request.eta
+        ready_at = max(published_at, datetime.fromisoformat(eta).timestamp()) if eta else published_at
+        metrics.observe("task_queue_wait_seconds", max(0.0, now - ready_at), task=task.name)
+
+
+@task_postrun.connect(dispatch_uid="ppt-studio-task-metrics-end")
+def _record_task_end(task_id=None, task=None, state=None, **_kwargs):
+    metrics.task_finished(task_id, task.name)
+    started_at = _task_started_at.pop(task_id, None)
+    if started_at is not None:
+        metrics.observe("task_runtime_seconds", time.time() - started_at, task=task.name, state=state or "UNKNOWN")
+
+
+# Open task spans in this process; each is current while its task runs, so
+# stage spans nest under it and anything the task publishes carries it on.
+_task_spans = {}
+
+
+@task_prerun.connect(dispatch_uid="ppt-studio-task-span-start")
+def _start_task_span(task_id=None, task=None, **_kwargs):
+    _task_spans[task_id] = start_span(
+        f"task {task.name}", getattr(task.request, "traceparent", None), task_id=task_id,
+    )
+
+
+@task_postrun.connect(dispatch_uid="ppt-studio-task-span-end")
+def _end_task_span(task_id=None, retval=None, state=None, **_kwargs):
+    task_span = _task_spans.pop(task_id, None)
+    if task_span is None:
+        return
+    task_span.set_attribute("state", state)
+    if state == "FAILURE" and isinstance(retval, BaseException):
+        task_span.record_error(retval)
+    task_span.end()
 
 # --- GCS Helper Functions ---
-def download_blob(blob_name, destination_file_name):
-    bucket = storage_client.bucket(GCS_BUCKET_NAME)
-    blob = bucket.blob(blob_name)
-    blob.download_to_filename(destination_file_name)
+_bucket = None
+
+
+def get_bucket():
+    """Bucket handle shared by every transfer in this process."""
+    global _bucket
+    if _bucket is None:
+        _bucket = storage_client.bucket(GCS_BUCKET_NAME)
+    return _bucket
+
+def download_blob(blob_name, destination_file_name, blob=None):
+    """Download through the worker blob cache; pass `blob` from a listing to reuse its metadata."""
+    with span("storage.download", blob=blob_name) as download:
+        if blob is None:
+            blob = get_bucket().blob(blob_name)
+        if blob.generation is None:
+            blob.reload()  # pins the download to this generation and tells us its size
+        download.set_attribute("bytes", blob.size)
+        if blob_cache is None:
+            transfer.download_file(blob, destination_file_name)
+            return
+        key = BlobCache.key_for(GCS_BUCKET_NAME, blob_name, blob.generation)
+        blob_cache.fetch(
+            key, blob.size, Path(destination_file_name),
+            lambda path: transfer.download_file(blob, path),
+        )
 
 def upload_blob(source_file_name, destination_blob_name):
-    bucket = storage_client.bucket(GCS_BUCKET_NAME)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_file_name)
+    with span("storage.upload", blob=destination_blob_name, bytes=os.path.getsize(source_file_name)):
+        transfer.upload_file(source_file_name, get_bucket().blob(destination_blob_name))
 
 def list_blobs(prefix):
-    bucket = storage_client.bucket(GCS_BUCKET_NAME)
-    return bucket.list_blobs(prefix=prefix)
+    return get_bucket().list_blobs(prefix=prefix)
 
 # --- Other Business Logic (Full versions) ---
 def chunks(lst, n):
@@ -95,26 +208,33 @@ def _iter_picture_shapes(container):
             for inner in _iter_picture_shapes(shape):
                 yield inner
 
-def _image_hash_for_shape(shape):
+def _image_hash_for_shape(shape, hash_cache=None):
+    """Perceptual hash of a picture; `hash_cache` maps image sha1 to a hex phash."""
     try:
+        key = shape.image.sha1
+        if hash_cache is not None and key in hash_cache:
+            return imagehash.hex_to_hash(hash_cache[key])
         with Image.open(io.BytesIO(shape.image.blob)).convert("RGB") as im:
-            return imagehash.phash(im)
+            h = imagehash.phash(im)
+        if hash_cache is not None:
+            hash_cache[key] = str(h)
+        return h
     except Exception:
         return None
 
-def remove_frequent_images(prs: Presentation, min_occurrences: int, hash_tolerance: int):
+def remove_frequent_images(prs: Presentation, min_occurrences: int, hash_tolerance: int, hash_cache=None):
     all_pics_and_hashes = []
     for master in prs.slide_masters:
         for pic in _iter_picture_shapes(master):
-            if h := _image_hash_for_shape(pic):
+            if h := _image_hash_for_shape(pic, hash_cache):
                 all_pics_and_hashes.append({'shape': pic, 'hash': h})
     for layout in prs.slide_layouts:
         for pic in _iter_picture_shapes(layout):
-            if h := _image_hash_for_shape(pic):
+            if h := _image_hash_for_shape(pic, hash_cache):
                 all_pics_and_hashes.append({'shape': pic, 'hash': h})
     for slide in prs.slides:
         for pic in _iter_picture_shapes(slide):
-            if h := _image_hash_for_shape(pic):
+            if h := _image_hash_for_shape(pic, hash_cache):
                 all_pics_and_hashes.append({'shape': pic, 'hash': h})
     if not all_pics_and_hashes: return
     hash_clusters = {}
@@ -145,17 +265,20 @@ def extract_text_from_slide(slide: Slide) -> str:
     return "\n".join(slide_texts)
 
 def generate_and_add_speaker_notes(slide: Slide):
+    """Returns the generated note, or None if there was nothing to add or the call failed."""
     try:
         slide_text = extract_text_from_slide(slide)
-        if not slide_text: return
-        if isinstance(model, _NoopModel):
+        if not slide_text: return None
+        if isinstance(model.get(), _NoopModel):
             raise RuntimeError("Speaker notes model is not configured")
         prompt = f"Generate a concise, professional speaker note for a presentation slide with the following content:\n\n---\n{slide_text}\n---"
         response = model.generate_content(prompt)
         if response.text:
             slide.notes_slide.notes_text_frame.text = response.text
+            return response.text
     except Exception as e:
         slide.notes_slide.notes_text_frame.text = f"Could not generate speaker notes: {e}"
+    return None
 
 def remove_watermarks_from_masters(prs: Presentation):
     for master in prs.slide_masters:
@@ -187,10 +310,99 @@ def add_credits_to_slide(slide: Slide, slide_width, slide_height, text: str, url
     font.size = Pt(10)
     font.color.rgb = RGBColor(150, 150, 150)
 
+def brand_slides(prs: Presentation, logo_path: str, credits_text: str, credits_url: str):
+    """Drops watermark text boxes from every slide, then adds the logo and the credits line."""
+    for slide in prs.slides:
+        shapes_to_delete_text = [
+            shape for shape in slide.shapes
+            if shape.has_text_frame and any(keyword in shape.text.upper() for keyword in WATERMARK_KEYWORDS)
+        ]
+        for shape in shapes_to_delete_text:
+            sp = shape.element
+            sp.getparent().remove(sp)
+        add_logo(slide, logo_path)
+        add_credits_to_slide(slide, prs.slide_width, prs.slide_height, credits_text, credits_url)
+
+def _add_speaker_notes(prs: Presentation, task_id: str, checkpoints: CheckpointStore):
+    # Notes already paid for by an earlier attempt are reused; failures are
+    # not checkpointed so a retry asks the model again.
+    notes = {index: entry["text"] for index, entry in checkpoints.load_all("notes").items()}
+    total_slides = len(prs.slides)
+    with span("speaker_notes", slides=total_slides, checkpointed=len(notes)):
+        for index, slide in enumerate(prs.slides, start=1):
+            if str(index) in notes:
+                slide.notes_slide.notes_text_frame.text = notes[str(index)]
+            elif text := generate_and_add_speaker_notes(slide):
+                notes[str(index)] = text
+                checkpoints.save(f"notes/{index}", {"text": text})
+            publish_progress(task_id, "notes", current=index, total=total_slides)
+
+def _finish_enhancement(task_id, prs, local_job_dir, output_blob, dedup_key, memory: MemoryAccount):
+    local_output_path = local_job_dir / Path(output_blob).name
+    with span("save", slides=len(prs.slides)):
+        prs.save(str(local_output_path))
+    memory.sample("saved")
+    publish_progress(task_id, "saved")
+    upload_blob(str(local_output_path), output_blob)
+    publish_progress(task_id, "uploaded")
+    if dedup_key:
+        dedup_index.complete(dedup_key, {
+            "job_id": Path(output_blob).parts[0], "output_blob": output_blob,
+            "output_filename": Path(output_blob).name,
+        })
+    return {"status": "complete", "output_blob": output_blob, "memory": memory.summary()}
+
 # --- Celery Tasks ---
-@celery.task(name="enhance_ppt_task")
-def enhance_ppt_task(input_blob: str, output_blob: str, logo_blob: str = None, credits_text: str = None):
+# Tasks that checkpoint are acknowledged only after they finish, so a worker
+# recycled or stopped mid-task hands the message back and the next attempt
+# resumes from the last checkpoint (worker/checkpoints.py). The enhancer's
+# in-flight dedup claim is refreshed at every start and outlives a killed
+# worker by at most the queue wait plus this hard time limit (config/dedup.py).
+_RESUMABLE = {
+    "bind": True, "acks_late": True, "reject_on_worker_lost": True,
+    "time_limit": settings.task_time_limit_seconds,
+}
+
+def _guard_redelivery(task, checkpoints: CheckpointStore, dedup_key: str = None) -> None:
+    """Fail the job once its message has killed `max_worker_lost_redeliveries` + 1 workers.
+
+    ``reject_on_worker_lost`` puts the message back however often the worker
+    dies, so a deck that OOM-kills every child would otherwise loop forever.
+    """
+    starts = checkpoints.record_start(task.name, task.request.retries or 0)
+    if starts <= settings.max_worker_lost_redeliveries + 1:
+        if dedup_key:
+            dedup_index.refresh(dedup_key)
+        return
+    if dedup_key:
+        dedup_index.release(dedup_key)
+    checkpoints.clear()
+    raise RedeliveryLimitExceeded(
+        f"{task.name} {task.request.id} lost its worker {starts - 1} times; giving up"
+    )
+
+def _hand_off_notes(task, staged_blob, output_blob, dedup_key):
+    # The notes task inherits this task id, so status polling and progress
+    # events carry on under the id the client already has.
+    delivery = task.request.delivery_info or {}
+    return task.replace(add_speaker_notes_task.s(staged_blob, output_blob, dedup_key=dedup_key).set(
+        queue=lane_queue(settings.celery_io_queue, lane_of(delivery.get("routing_key"))),
+        priority=delivery.get("priority"),
+    ))
+
+@celery.task(name="enhance_ppt_task", **_RESUMABLE)
+def enhance_ppt_task(self, input_blob: str, output_blob: str, logo_blob: str = None, credits_text: str = None, dedup_key: str = None):
     job_id = Path(input_blob).parts[0]
+    task_id = self.request.id
+    checkpoints = CheckpointStore(get_bucket(), job_id)
+    staged_blob = f"{job_id}/staged/{Path(output_blob).name}"
+    _guard_redelivery(self, checkpoints, dedup_key)
+    if settings.enhancer_notes_on_io_queue and checkpoints.load("staged"):
+        return _hand_off_notes(self, staged_blob, output_blob, dedup_key)
+    memory = MemoryAccount(memory_estimate(task_id))
+    ensure_headroom(self, memory.estimated_bytes)
+    memory.sample("started")
+
     local_job_dir = Path("/tmp") / job_id
     local_job_dir.mkdir(parents=True, exist_ok=True)
     try:
@@ -201,76 +413,184 @@ def enhance_ppt_task(input_blob: str, output_blob: str, logo_blob: str = None, c
         if logo_blob:
             local_logo_path = local_job_dir / Path(logo_blob).name
             download_blob(logo_blob, str(local_logo_path))
+        publish_progress(task_id, "downloaded")
         
         prs = Presentation(local_input_path)
+        memory.sample("parsed")
         final_credits_text = credits_text if credits_text else "Processed by PPT Studio"
         final_credits_url = "https://mybrand.com" if credits_text else "https://www.example.com"
         final_logo_path = str(local_logo_path) if local_logo_path and local_logo_path.exists() else LOGO_PATH
         
-        remove_watermarks_from_masters(prs)
-        remove_frequent_images(prs, min_occurrences=3, hash_tolerance=5)
-
-        for slide in prs.slides:
-            shapes_to_delete_text = [
-                shape for shape in slide.shapes
-                if shape.has_text_frame and any(keyword in shape.text.upper() for keyword in WATERMARK_KEYWORDS)
-            ]
-            for shape in shapes_to_delete_text:
-                sp = shape.element
-                sp.getparent().remove(sp)
-            add_logo(slide, final_logo_path)
-            add_credits_to_slide(slide, prs.slide_width, prs.slide_height, final_credits_text, final_credits_url)
-            generate_and_add_speaker_notes(slide)
-        
-        local_output_path = local_job_dir / Path(output_blob).name
-        prs.save(str(local_output_path))
-        upload_blob(str(local_output_path), output_blob)
-        return {"status": "complete", "output_blob": output_blob}
+        with span("remove_watermarks_from_masters"):
+            remove_watermarks_from_masters(prs)
+        hash_cache = (checkpoints.load("image-hashes") or {}).get("hashes", {})
+        with span("remove_frequent_images", slides=len(prs.slides), cached_hashes=len(hash_cache)):
+            remove_frequent_images(prs, min_occurrences=3, hash_tolerance=5, hash_cache=hash_cache)
+        checkpoints.save("image-hashes", {"hashes": hash_cache})
+        memory.sample("hashed")
+        publish_progress(task_id, "hashed")
+
+        with span("decorate_slides", slides=len(prs.slides)):
+            brand_slides(prs, final_logo_path, final_credits_text, final_credits_url)
+        memory.sample("decorated")
+
+        if not settings.enhancer_notes_on_io_queue:
+            _add_speaker_notes(prs, task_id, checkpoints)
+            memory.sample("notes")
+            result = _finish_enhancement(task_id, prs, local_job_dir, output_blob, dedup_key, memory)
+            checkpoints.clear()
+            return result
+
+        # Stage the CPU-processed deck and let the I/O pool wait on the model.
+        local_staged_path = local_job_dir / f"staged-{Path(output_blob).name}"
+        with span("save", slides=len(prs.slides), staged=True):
+            prs.save(str(local_staged_path))
+        memory.sample("staged")
+        upload_blob(str(local_staged_path), staged_blob)
+        # The notes task folds these samples into the job's result.
+        checkpoints.save("staged", {"blob": staged_blob, "memory": memory.summary()})
+    except Exception:
+        if dedup_key:
+            dedup_index.release(dedup_key)
+        raise
+    finally:
+        shutil.rmtree(local_job_dir, ignore_errors=True)
+    return _hand_off_notes(self, staged_blob, output_blob, dedup_key)
+
+@celery.task(name="add_speaker_notes_task", **_RESUMABLE)
+def add_speaker_notes_task(self, staged_blob: str, output_blob: str, dedup_key: str = None):
+    task_id = self.request.id
+    job_id = Path(staged_blob).parts[0]
+    checkpoints = CheckpointStore(get_bucket(), job_id)
+    _guard_redelivery(self, checkpoints, dedup_key)
+    staged = checkpoints.load("staged") or {}
+    memory = MemoryAccount(memory_estimate(task_id), carried=staged.get("memory"))
+    ensure_headroom(self, memory.estimated_bytes)
+    local_job_dir = Path("/tmp") / f"{job_id}-notes"
+    local_job_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        local_staged_path = local_job_dir / Path(staged_blob).name
+        download_blob(staged_blob, str(local_staged_path))
+        prs = Presentation(local_staged_path)
+        memory.sample("staged_parsed")
+        _add_speaker_notes(prs, task_id, checkpoints)
+        memory.sample("notes")
+        result = _finish_enhancement(task_id, prs, local_job_dir, output_blob, dedup_key, memory)
+    except Exception:
+        if dedup_key:
+            dedup_index.release(dedup_key)
+        raise
     finally:
         shutil.rmtree(local_job_dir, ignore_errors=True)
+    try:
+        get_bucket().blob(staged_blob).delete()
+        checkpoints.clear()
+    except Exception as exc:
+        print(f"Could not clean up staged deck {staged_blob}: {exc}")
+    return result
 
-@celery.task(name="generate_slide_plan_task")
-def generate_slide_plan_task(job_id: str, image_filenames: list):
+@celery.task(name="generate_slide_plan_task", **_RESUMABLE)
+def generate_slide_plan_task(self, job_id: str, image_filenames: list):
+    task_id = self.request.id
+    checkpoints = CheckpointStore(get_bucket(), job_id)
+    _guard_redelivery(self, checkpoints)
+    memory = MemoryAccount(memory_estimate(task_id))
+    ensure_headroom(self, memory.estimated_bytes)
+    memory.sample("started")
     local_job_dir = Path("/tmp") / job_id
     local_job_dir.mkdir(parents=True, exist_ok=True)
     try:
         blobs = list(list_blobs(job_id))
-        source_doc_blob = next((b for b in blobs if Path(b.name).name not in image_filenames), None)
-        if not source_doc_blob: return {"error": "No source document found in GCS."}
+        source_doc_blob = next(
+            (b for b in blobs if Path(b.name).name not in image_filenames and Path(b.name).name != "slides.json"),
+            None,
+        )
+        if not source_doc_blob:
+            checkpoints.clear()  # the start records; there is nothing to resume
+            return {"error": "No source document found in GCS."}
         
         local_source_path = local_job_dir / Path(source_doc_blob.name).name
-        download_blob(source_doc_blob.name, str(local_source_path))
-        source_text = extract_text_from_document(str(local_source_path))
-        
-        local_image_paths = []
-        for filename in image_filenames:
-            local_path = local_job_dir / filename
-            download_blob(f"{job_id}/{filename}", str(local_path))
-            local_image_paths.append(local_path)
-        
-        slide_plan = generate_content_for_batch(source_text, local_image_paths)
+        download_blob(source_doc_blob.name, str(local_source_path), blob=source_doc_blob)
+        with span("extract_text_from_document", source=source_doc_blob.name):
+            source_text = extract_text_from_document(str(local_source_path))
+        memory.sample("extracted")
+        publish_progress(task_id, "downloaded", images=len(image_filenames))
+
+        # Each batch is checkpointed once the model returns it; a redelivered
+        # task only downloads images for, and pays for, the missing batches.
+        done = (checkpoints.load("plan") or {}).get("batches", {})
+        batch_size = settings.plan_batch_size if settings.plan_batch_size > 0 else max(1, len(image_filenames))
+        batches = list(chunks(image_filenames, batch_size)) or [[]]
+        slide_plan = []
+        for index, filenames in enumerate(batches):
+            if str(index) not in done:
+                with span("plan_batch", batch=index, images=len(filenames)):
+                    local_image_paths = []
+                    for filename in filenames:
+                        local_path = local_job_dir / filename
+                        download_blob(f"{job_id}/{filename}", str(local_path))
+                        local_image_paths.append(local_path)
+                    batch_plan = generate_content_for_batch(source_text, local_image_paths)
+                if batch_plan and not is_error_batch(batch_plan):
+                    done[str(index)] = batch_plan
+                    checkpoints.save("plan", {"batches": done})
+            else:
+                batch_plan = done[str(index)]
+            slide_plan.extend(batch_plan or [])
+            memory.sample(f"batch_{index}")
+            publish_progress(task_id, "plan", current=index + 1, total=len(batches))
+
         if slide_plan:
             plan_path = local_job_dir / "slides.json"
             with open(plan_path, "w") as f:
                 json.dump(slide_plan, f, indent=2)
             upload_blob(str(plan_path), f"{job_id}/slides.json")
-            return {"status": "complete", "slide_plan": slide_plan}
-        else: return {"error": "Failed to generate a slide plan."}
+            checkpoints.clear()
+            publish_progress(task_id, "uploaded", slides=len(slide_plan))
+            # The plan itself stays in storage; clients fetch it from
+            # /api/v1/creator/plan/{job_id}.
+            return {
+                "status": "complete", "plan_blob": f"{job_id}/slides.json", "slide_count": len(slide_plan),
+                "memory": memory.summary(),
+            }
+        # A failed job is not redelivered, so its start records and partial
+        # batches would never be read again.
+        checkpoints.clear()
+        return {"error": "Failed to generate a slide plan."}
     finally:
         shutil.rmtree(local_job_dir, ignore_errors=True)
 
-@celery.task(name="build_ppt_from_plan_task")
-def build_ppt_from_plan_task(job_id: str):
+@celery.task(name="build_ppt_from_plan_task", bind=True)
+def build_ppt_from_plan_task(self, job_id: str):
+    task_id = self.request.id
+    memory = MemoryAccount(memory_estimate(task_id))
+    ensure_headroom(self, memory.estimated_bytes)
+    memory.sample("started")
     local_job_dir = Path("/tmp") / job_id
     local_job_dir.mkdir(parents=True, exist_ok=True)
     try:
+        output_filename = "presentation.pptx"
         blobs = list_blobs(job_id)
         for blob in blobs:
-            download_blob(blob.name, str(local_job_dir / Path(blob.name).name))
+            # Skip a previous build's output: it is rewritten below, so
+            # downloading it would be wasted.
+            if Path(blob.name).name == output_filename:
+                continue
+            download_blob(blob.name, str(local_job_dir / Path(blob.name).name), blob=blob)
+        memory.sample("downloaded")
+        publish_progress(task_id, "downloaded")
         
-        output_filename = "presentation.pptx"
-        local_output_path = build_presentation_from_plan(local_job_dir, output_filename)
+        with span("build_presentation_from_plan"):
+            local_output_path = build_presentation_from_plan(local_job_dir, output_filename)
+        memory.sample("built")
+        publish_progress(task_id, "saved")
         upload_blob(str(local_output_path), f"{job_id}/{output_filename}")
-        return {"status": "complete", "output_file": f"{job_id}/{output_filename}"}
+        publish_progress(task_id, "uploaded")
+        return {"status": "complete", "output_file": f"{job_id}/{output_filename}", "memory": memory.summary()}
     finally:
         shutil.rmtree(local_job_dir, ignore_errors=True)
+
+@celery.task(name="compact_feedback_task")
+def compact_feedback_task():
+    merged = FeedbackStore(get_bucket()).compact()
+    return {"status": "complete", "merged": merged}
@@ -0,0 +1,74 @@
+"""Stage checkpoints that let a redelivered task resume instead of restarting.
+
+Checkpoints are small JSON objects under ``checkpoints/{job_id}/`` - kept out
+of the job prefix because the creator tasks treat every blob under
+``{job_id}/`` as an input. Tasks save a checkpoint after each paid-for unit of
+work (a slide's notes, a plan batch, the image hash table), load them on
+start, and clear them once the job's output is uploaded. Tasks using them are
+declared ``acks_late`` with ``reject_on_worker_lost`` so that a worker killed
+mid-task returns the message to the queue.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from google.cloud.exceptions import NotFound
+
+PREFIX = "checkpoints"
+
+
+class RedeliveryLimitExceeded(RuntimeError):
+    """The same task message keeps killing its worker; the job is failed instead of redelivered again."""
+
+
+class CheckpointStore:
+    def __init__(self, bucket, job_id: str) -> None:
+        self._bucket = bucket
+        self._prefix = f"{PREFIX}/{job_id}/"
+
+    def _blob(self, stage: str):
+        return self._bucket.blob(f"{self._prefix}{stage}.json")
+
+    def load(self, stage: str) -> Optional[dict]:
+        try:
+            return json.loads(self._blob(stage).download_as_text())
+        except (NotFound, FileNotFoundError):
+            return None
+
+    def save(self, stage: str, data: dict) -> None:
+        self._blob(stage).upload_from_string(json.dumps(data), content_type="application/json")
+
+    def load_all(self, stage: str) -> dict:
+        """Every ``save(f"{stage}/{name}", ...)`` checkpoint, keyed by name.
+
+        Stages that grow one unit at a time store one small object per unit,
+        so each save uploads only the new unit rather than everything so far.
+        """
+        prefix = f"{self._prefix}{stage}/"
+        entries = {}
+        for blob in self._bucket.list_blobs(prefix=prefix):
+            if blob.name.endswith(".json"):
+                entries[blob.name[len(prefix):-len(".json")]] = json.loads(blob.download_as_text())
+        return entries
+
+    def record_start(self, task_name: str, retries: int) -> int:
+        """Count a start of `task_name`; returns how often this delivery has started.
+
+        A message handed back by ``reject_on_worker_lost`` is redelivered with
+        the same retry count, so repeated starts at one count mean the earlier
+        workers died running it (e.g. OOM-killed). A retry resets the count.
+        """
+        stage = f"starts-{task_name}"
+        previous = self.load(stage) or {}
+        starts = previous.get("starts", 0) + 1 if previous.get("retries") == retries else 1
+        self.save(stage, {"retries": retries, "starts": starts})
+        return starts
+
+    def clear(self) -> None:
+        for blob in self._bucket.list_blobs(prefix=self._prefix):
+            try:
+                blob.delete()
+            except (NotFound, FileNotFoundError):
+                pass
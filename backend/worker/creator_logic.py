@@ -4,9 +4,10 @@ import docx
 from pathlib import Path
 from typing import List
 from PIL import Image
-import google.generativeai as genai
 
 from config import settings
+from config.lazy import Lazy
+from .llm_limiter import gemini_model
 
 
 class _NoopModel:
@@ -14,15 +15,21 @@ class _NoopModel:
         raise RuntimeError("Google AI Model is not configured. Check API Key.")
 
 
-# --- Configure the AI Model ---
-try:
-    if not settings.google_api_key:
-        raise ValueError("GOOGLE_API_KEY is not configured")
-    genai.configure(api_key=settings.google_api_key)
-    model = genai.GenerativeModel('gemini-2.0-flash')
-except Exception as e:
-    print(f"Error configuring Google AI: {e}")
-    model = _NoopModel()
+# --- Configure the AI Model (on first use) ---
+def _create_model():
+    try:
+        if not settings.google_api_key:
+            raise ValueError("GOOGLE_API_KEY is not configured")
+        return gemini_model('gemini-2.0-flash')
+    except Exception as e:
+        print(f"Error configuring Google AI: {e}")
+        return _NoopModel()
+
+
+model = Lazy(_create_model)
+
+ERROR_SLIDE_TITLE = "AI Generation Error"
+
 
 def extract_text_from_document(filepath: str) -> str:
     """
@@ -54,7 +61,7 @@ def generate_content_for_batch(source_text: str, image_paths: List[Path]) -> Lis
     Takes the full source text and a BATCH of images, prompts the vision model,
     and returns a list of slide content dictionaries for that batch.
     """
-    if isinstance(model, _NoopModel):
+    if isinstance(model.get(), _NoopModel):
         raise RuntimeError("Google AI Model is not configured. Check API Key.")
 
     # --- FINAL, OPTIMIZED PROMPT WITH YOUR SCHEMA ---
@@ -127,20 +134,25 @@ def generate_content_for_batch(source_text: str, image_paths: List[Path]) -> Lis
         # Return a list of error slides matching the batch size
         return [
             {
-                "slide_title": "AI Generation Error",
+                "slide_title": ERROR_SLIDE_TITLE,
                 "slide_content": ["The AI failed to generate content for this batch."],
                 "speaker_notes": "This might be due to an API issue or a problem with the prompt."
             }
         ] * len(image_paths)
 
 
+def is_error_batch(slides: List[dict]) -> bool:
+    """True for the placeholder slides returned when the model call failed."""
+    return any(slide.get("slide_title") == ERROR_SLIDE_TITLE for slide in slides)
+
+
 def generate_slide_plan(source_text: str, image_filenames: List[str]) -> List[dict]:
     """Lightweight wrapper to create a slide plan from raw text and image names.
 
     The CI tests mock the underlying Gemini call; this helper keeps the real
     implementation centralized while providing an easy seam for testing.
     """
-    if isinstance(model, _NoopModel):
+    if isinstance(model.get(), _NoopModel):
         raise RuntimeError("Google AI Model is not configured. Check API Key.")
 
     image_catalog = "\n".join(f"- {name}" for name in image_filenames)
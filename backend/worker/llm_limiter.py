@@ -0,0 +1,260 @@
+"""Cluster-wide rate limiting for Gemini calls.
+
+Every worker process shares three pieces of Redis state per model:
+
+* a token bucket refilled at ``settings.llm_requests_per_minute`` (burst
+  ``settings.llm_burst``) - the hard cap matching the API quota;
+* a concurrency limit adjusted AIMD-style: +1/limit after each success,
+  halved (at most once per cooldown) when the API answers 429;
+* leased in-flight slots, so a crashed worker's slots expire on their own.
+
+Waiting costs Redis next to nothing: a caller without a slot blocks on a
+release notification list, and a token is reserved up front (the bucket may go
+negative) so the caller sleeps exactly until its refill time.
+
+Calls that are throttled by the API are retried after a backoff instead of
+surfacing as failed slides. Time spent waiting on the limiter is accumulated
+in a stats hash exposed by the worker health server. If Redis is unreachable
+the limiter steps aside (calls run unthrottled, 429s are still retried) and
+reconnects after a short pause, like the progress publisher.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from typing import Optional
+
+import redis
+from google.api_core import exceptions as api_exceptions
+
+from config import settings
+from config.metrics import metrics
+from config.tracing import span
+
+KEY_PREFIX = "llm"
+_RETRY_AFTER_SECONDS = 30
+# Upper bound on one wait for a release notification; a slot freed by an
+# expired lease (crashed worker) sends none.
+_SLOT_WAIT_SECONDS = 1
+_MAX_BACKOFF_SECONDS = 30.0
+
+# Reserves a token and returns the seconds until it is refilled (0 when one
+# was available). Reservations queue up as a negative balance.
+_TAKE_TOKEN = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - 1
+local wait = 0
+if tokens < 0 then
+  wait = -tokens / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+# Leases an in-flight slot if fewer than floor(limit) are held; returns 1 or 0.
+_TAKE_SLOT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local limit = tonumber(redis.call('GET', KEYS[2]) or ARGV[3])
+if redis.call('ZCARD', KEYS[1]) < math.max(1, math.floor(limit)) then
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+  redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])) + 60)
+  return 1
+end
+return 0
+"""
+
+# ARGV: "increase" | "decrease", min, max, initial, cooldown seconds. Returns the new limit.
+_ADJUST_LIMIT = """
+local limit = tonumber(redis.call('GET', KEYS[1]) or ARGV[4])
+local low, high = tonumber(ARGV[2]), tonumber(ARGV[3])
+if ARGV[1] == 'increase' then
+  limit = math.min(high, limit + 1 / limit)
+elseif redis.call('SET', KEYS[2], '1', 'NX', 'EX', tonumber(ARGV[5])) then
+  limit = math.max(low, limit / 2)
+end
+redis.call('SET', KEYS[1], tostring(limit))
+return tostring(limit)
+"""
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    return isinstance(exc, (api_exceptions.TooManyRequests, api_exceptions.ResourceExhausted)) or (
+        getattr(exc, "code", None) == 429
+    )
+
+
+class LLMLimiter:
+    def __init__(self, name: str, redis_url: str, client=None) -> None:
+        self.name = name
+        self._redis_url = redis_url
+        self._client = client
+        self._scripts = None
+        self._disabled_until = 0.0
+
+    def _key(self, suffix: str) -> str:
+        return f"{KEY_PREFIX}:{self.name}:{suffix}"
+
+    def _get_client(self):
+        if self._client is None and time.monotonic() >= self._disabled_until:
+            self._client = redis.from_url(self._redis_url, socket_connect_timeout=1, socket_timeout=2)
+        if self._client is not None and self._scripts is None:
+            self._scripts = {
+                name: self._client.register_script(source)
+                for name, source in (("token", _TAKE_TOKEN), ("slot", _TAKE_SLOT), ("adjust", _ADJUST_LIMIT))
+            }
+        return self._client
+
+    def _disable(self, exc: Exception) -> None:
+        print(f"LLM limiter {self.name} unavailable, running unthrottled: {exc}")
+        self._client = None
+        self._scripts = None
+        self._disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+
+    def acquire(self) -> Optional[str]:
+        """Block until a slot and a token are available; returns the slot lease id."""
+        client = self._get_client()
+        if client is None:
+            return None
+        lease = uuid.uuid4().hex
+        started = time.monotonic()
+        try:
+            while not self._scripts["slot"](
+                keys=[self._key("inflight"), self._key("limit")],
+                args=[lease, settings.llm_call_timeout_seconds, settings.llm_initial_concurrency],
+            ):
+                client.blpop([self._key("released")], timeout=_SLOT_WAIT_SECONDS)
+            wait = float(self._scripts["token"](
+                keys=[self._key("bucket")],
+                args=[settings.llm_requests_per_minute / 60.0, settings.llm_burst],
+            ))
+            if wait > 0:
+                time.sleep(wait)
+            self._record(wait_seconds=time.monotonic() - started, acquired=1)
+        except redis.RedisError as exc:
+            self._disable(exc)
+            return None
+        return lease
+
+    def release(self, lease: Optional[str], throttled: bool = False) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            if lease:
+                pipe = client.pipeline(transaction=False)
+                pipe.zrem(self._key("inflight"), lease)
+                # Wakes one acquire() blocked on a free slot.
+                pipe.lpush(self._key("released"), 1)
+                pipe.ltrim(self._key("released"), 0, settings.llm_max_concurrency - 1)
+                pipe.expire(self._key("released"), 60)
+                pipe.execute()
+            self._scripts["adjust"](
+                keys=[self._key("limit"), self._key("cooldown")],
+                args=[
+                    "decrease" if throttled else "increase",
+                    settings.llm_min_concurrency, settings.llm_max_concurrency,
+                    settings.llm_initial_concurrency, settings.llm_backoff_cooldown_seconds,
+                ],
+            )
+            if throttled:
+                self._record(throttled=1)
+        except redis.RedisError as exc:
+            self._disable(exc)
+
+    def call(self, fn, *args, **kwargs):
+        """Run `fn` under the limiter, retrying calls the API rejects with 429."""
+        for attempt in range(settings.llm_max_retries + 1):
+            with span("llm.acquire", model=self.name):
+                lease = self.acquire()
+            started = time.monotonic()
+            try:
+                with span("llm.generate", model=self.name, attempt=attempt):
+                    result = fn(*args, **kwargs)
+            except Exception as exc:
+                throttled = is_rate_limited(exc)
+                metrics.observe(
+                    "llm_call_seconds", time.monotonic() - started,
+                    model=self.name, outcome="throttled" if throttled else "error",
+                )
+                self.release(lease, throttled=throttled)
+                if not throttled or attempt == settings.llm_max_retries:
+                    raise
+                self._record(retries=1)
+                time.sleep(min(_MAX_BACKOFF_SECONDS, 2 ** attempt) * (0.5 + random.random()))
+                continue
+            metrics.observe("llm_call_seconds", time.monotonic() - started, model=self.name, outcome="ok")
+            self.release(lease)
+            return result
+
+    def _record(self, **deltas) -> None:
+        client = self._client
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for field, delta in deltas.items():
+                pipe.hincrbyfloat(self._key("stats"), field, delta)
+            pipe.execute()
+        except redis.RedisError:
+            pass
+
+    def stats(self) -> dict:
+        """Wait time, throttling and the current concurrency limit, cluster-wide."""
+        client = self._get_client()
+        if client is None:
+            return {"available": False}
+        try:
+            raw = client.hgetall(self._key("stats"))
+            limit = client.get(self._key("limit"))
+            inflight = client.zcard(self._key("inflight"))
+        except redis.RedisError as exc:
+            return {"available": False, "error": str(exc)}
+        data = {k.decode() if isinstance(k, bytes) else k: float(v) for k, v in raw.items()}
+        acquired = data.get("acquired", 0.0)
+        return {
+            "available": True,
+            "acquired": int(acquired),
+            "throttled": int(data.get("throttled", 0)),
+            "retries": int(data.get("retries", 0)),
+            "wait_seconds_total": round(data.get("wait_seconds", 0.0), 3),
+            "avg_wait_seconds": round(data.get("wait_seconds", 0.0) / acquired, 3) if acquired else 0.0,
+            "concurrency_limit": float(limit) if limit else float(settings.llm_initial_concurrency),
+            "in_flight": inflight,
+        }
+
+
+class RateLimitedModel:
+    """Wraps a GenerativeModel so every ``generate_content`` goes through a limiter."""
+
+    def __init__(self, model, limiter: LLMLimiter) -> None:
+        self._model = model
+        self.limiter = limiter
+
+    def generate_content(self, *args, **kwargs):
+        return self.limiter.call(self._model.generate_content, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+def rate_limited(model, model_name: str):
+    return RateLimitedModel(model, LLMLimiter(model_name, settings.redis_url))
+
+
+def gemini_model(model_name: str) -> RateLimitedModel:
+    """Configure the Gemini SDK and build a rate-limited model; called on first use."""
+    import google.generativeai as genai  # grpc/protobuf stack: kept off the import path
+
+    genai.configure(api_key=settings.google_api_key)
+    return rate_limited(genai.GenerativeModel(model_name), model_name)
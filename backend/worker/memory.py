@@ -0,0 +1,135 @@
+"""Per-task memory accounting and headroom checks.
+
+The API predicts each job's peak RSS from the deck's slide and media counts
+(config/admission.py) and stores it with the job's estimate. Before a
+memory-heavy task starts working, it compares that prediction with the
+container's free memory. If the job does not fit, it moves to the large lane
+and then defers itself, rather than starting and getting the child killed
+mid-task. ``MemoryAccount`` samples RSS at each stage. Its summary, including
+the peak, goes into the task result so the model's coefficients can be
+checked against real runs.
+
+On the thread pool every task shares one process, so the samples there
+measure the whole worker, not just the task.
+"""
+
+from __future__ import annotations
+
+import resource
+from pathlib import Path
+from typing import Optional
+
+import psutil
+
+from config import settings
+from config.admission import admission, lane_of, lane_queue
+
+_CGROUP_V2 = Path("/sys/fs/cgroup")
+_CGROUP_V1 = Path("/sys/fs/cgroup/memory")
+
+
+def rss_bytes() -> int:
+    return psutil.Process().memory_info().rss
+
+
+def _max_rss_bytes() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+
+
+def _read_int(path: Path) -> Optional[int]:
+    try:
+        value = path.read_text().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None  # cgroup v2 writes "max" when unlimited
+
+
+def _inactive_file_bytes(stat_path: Path) -> int:
+    # Reclaimable page cache (e.g. the blob cache's files) is not pressure.
+    try:
+        for line in stat_path.read_text().splitlines():
+            key, _, value = line.partition(" ")
+            if key in ("inactive_file", "total_inactive_file"):
+                return int(value)
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def headroom_bytes() -> int:
+    """Memory the container can still use: its cgroup limit minus working set, else free RAM."""
+    total = psutil.virtual_memory().total
+    for root, limit_name, usage_name in (
+        (_CGROUP_V2, "memory.max", "memory.current"),
+        (_CGROUP_V1, "memory.limit_in_bytes", "memory.usage_in_bytes"),
+    ):
+        limit, usage = _read_int(root / limit_name), _read_int(root / usage_name)
+        if limit and usage is not None and limit < total:
+            return max(0, limit - (usage - _inactive_file_bytes(root / "memory.stat")))
+    return psutil.virtual_memory().available
+
+
+def memory_estimate(job_id: str) -> Optional[int]:
+    """The peak RSS the API predicted for `job_id`, if it is still on record."""
+    record = admission.estimates([job_id])[0]
+    return record.get("estimated_memory_bytes") if record else None
+
+
+def ensure_headroom(task, estimated_bytes: Optional[int]) -> None:
+    """Retry `task` later, on the large lane, while its predicted peak does not fit.
+
+    After ``settings.memory_max_deferrals`` deferrals the task runs anyway, so
+    an optimistic headroom reading can delay a job but never starve it.
+    """
+    if not estimated_bytes:
+        return
+    headroom = headroom_bytes()
+    if estimated_bytes <= headroom or task.request.retries >= settings.memory_max_deferrals:
+        return
+    delivery = task.request.delivery_info or {}
+    queue = delivery.get("routing_key")
+    options = {"priority": delivery.get("priority")}
+    countdown = settings.memory_defer_seconds
+    if queue and lane_of(queue) == "small":
+        # Another worker may have room now; move over without waiting.
+        options["queue"] = lane_queue(queue, "large")
+        countdown = 0
+    elif queue:
+        options["queue"] = queue
+    print(
+        f"Deferring {task.name} {task.request.id}: needs ~{estimated_bytes // 2**20} MiB, "
+        f"{headroom // 2**20} MiB free; retrying on {options.get('queue', 'the same queue')} in {countdown}s"
+    )
+    raise task.retry(countdown=countdown, max_retries=settings.memory_max_deferrals, **options)
+
+
+class MemoryAccount:
+    """RSS samples for one task run; ``summary()`` is recorded in the task result."""
+
+    def __init__(self, estimated_bytes: Optional[int] = None, carried: Optional[dict] = None) -> None:
+        self.estimated_bytes = estimated_bytes
+        # Samples from an earlier task of the same job (the enhancer's CPU
+        # stages, before the notes hand-off).
+        self.stages = dict((carried or {}).get("stages", {}))
+        self._carried_peak = (carried or {}).get("peak_rss_bytes", 0)
+        self._start_max_rss = _max_rss_bytes()
+
+    def sample(self, stage: str) -> int:
+        rss = rss_bytes()
+        self.stages[stage] = rss
+        return rss
+
+    @property
+    def peak_rss_bytes(self) -> int:
+        peak = max([self._carried_peak, *self.stages.values()])
+        # A new process high-water mark set during this task is its true peak,
+        # including whatever happened between samples.
+        max_rss = _max_rss_bytes()
+        return max(peak, max_rss) if max_rss > self._start_max_rss else peak
+
+    def summary(self) -> dict:
+        return {
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "estimated_bytes": self.estimated_bytes,
+            "stages": self.stages,
+        }
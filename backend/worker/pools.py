@@ -0,0 +1,49 @@
+"""Celery worker command-line options for each pool role.
+
+``worker_entrypoint.sh`` starts one worker per role from ``WORKER_ROLE``:
+
+* ``io``  - thread (or gevent) pool on the I/O queue for LLM-bound tasks.
+* ``cpu`` - prefork pool sized to the cores on the CPU queue.
+* ``split`` - both of the above in one container.
+* ``all`` - the previous single prefork child consuming every queue; only a
+  local-development fallback, since a build then waits behind any plan
+  generation stuck on the LLM. Deployments set ``split`` (or run ``io`` and
+  ``cpu`` separately).
+
+    celery -A worker.celery_app.celery worker $(python -m worker.pools cpu)
+"""
+
+from __future__ import annotations
+
+import sys
+
+from config import settings
+from config.admission import lane_queue
+
+# Prefork children are recycled to cap leaks from python-pptx/Pillow.
+# Big jobs are kept from starting without headroom by worker/memory.py.
+_RECYCLE = ["--max-tasks-per-child=10", f"--max-memory-per-child={settings.worker_max_memory_per_child_kb}"]
+
+
+def worker_args(role: str) -> list[str]:
+    # Both lanes of a queue: kombu cycles between them, so small jobs keep
+    # moving while a large one runs.
+    io_queue = f"{settings.celery_io_queue},{lane_queue(settings.celery_io_queue, 'large')}"
+    cpu_queue = f"{settings.celery_cpu_queue},{lane_queue(settings.celery_cpu_queue, 'large')}"
+    if role == "io":
+        return [
+            "--hostname=io@%h", f"--queues={io_queue}",
+            f"--pool={settings.worker_io_pool}", f"--concurrency={settings.worker_io_concurrency}",
+        ]
+    if role == "cpu":
+        return [
+            "--hostname=cpu@%h", f"--queues={cpu_queue}",
+            "--pool=prefork", f"--concurrency={settings.worker_cpu_concurrency}", *_RECYCLE,
+        ]
+    if role == "all":
+        return [f"--queues={cpu_queue},{io_queue}", "--pool=prefork", "--concurrency=1", *_RECYCLE]
+    raise ValueError(f"Unknown worker role: {role!r}")
+
+
+if __name__ == "__main__":
+    print(" ".join(worker_args(sys.argv[1] if len(sys.argv) > 1 else "all")))
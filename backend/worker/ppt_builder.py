@@ -6,6 +6,9 @@ from pptx.util import Inches, Pt
 from pptx.enum.text import PP_PARAGRAPH_ALIGNMENT
 from PIL import Image
 
+from config import settings
+from .pptx_stream import StreamingPresentationWriter
+
 # --- Constants ---
 SLIDE_W_IN, SLIDE_H_IN = 10.0, 7.5
 MARGIN_IN, TITLE_H_IN = 0.5, 0.8
@@ -112,13 +115,82 @@ def add_image_scaled(slide, img_path, x_in, y_in, max_w_in, max_h_in):
 
 # --- Main Builder Function ---
 
-def build_presentation_from_plan(job_dir: Path, output_filename: str):
+def _populate_slide(slide, spec, img_path):
+    """Fills a blank slide with the title, bullets, image and notes from `spec`."""
+    title_shape = slide.shapes.add_textbox(Inches(MARGIN_IN), Inches(MARGIN_IN), Inches(USABLE_W_IN), Inches(TITLE_H_IN))
+    title_shape.text_frame.text = spec.get("slide_title", " ")
+    title_shape.text_frame.paragraphs[0].font.size = Pt(32)
+    title_shape.text_frame.paragraphs[0].alignment = PP_PARAGRAPH_ALIGNMENT.CENTER
+    
+    content_top_in = MARGIN_IN + TITLE_H_IN
+    classification = classify_image(img_path)
+    bullets = spec.get("slide_content", [])
+    
+    if not classification:
+        add_bullets(slide, bullets, MARGIN_IN, content_top_in, USABLE_W_IN, USABLE_H_IN)
+    elif classification in ["small-small", "small-large"]:
+        variant = random.choice(["left", "right"])
+        panel_w = USABLE_W_IN / 2.1
+        gap = 0.2
+        text_w = USABLE_W_IN - panel_w - gap
+        if variant == "left":
+            add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, panel_w, USABLE_H_IN)
+            add_bullets(slide, bullets, MARGIN_IN + panel_w + gap, content_top_in, text_w, USABLE_H_IN)
+        else:
+            add_bullets(slide, bullets, MARGIN_IN, content_top_in, text_w, USABLE_H_IN)
+            add_image_scaled(slide, img_path, MARGIN_IN + text_w + gap, content_top_in, panel_w, USABLE_H_IN)
+    elif classification == "large-small":
+        panel_h = USABLE_H_IN / 2.1
+        gap = 0.2
+        text_h = USABLE_H_IN - panel_h - gap
+        add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, USABLE_W_IN, panel_h)
+        add_bullets(slide, bullets, MARGIN_IN, content_top_in + panel_h + gap, USABLE_W_IN, text_h)
+    elif classification == "large-large":
+        # If there are many bullets, use a left-right (side-by-side) layout to avoid overflow.
+        if len(bullets) > 4:
+            gap = 0.2
+            # Give the image a bit more width since it's large in both dims
+            panel_w = USABLE_W_IN * 0.55
+            text_w = USABLE_W_IN - panel_w - gap
+
+            # Randomize which side the image goes on (optional)
+            variant = random.choice(["left", "right"])
+            if variant == "left":
+                # Image on left, bullets on right
+                add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, panel_w, USABLE_H_IN)
+                add_bullets(slide, bullets, MARGIN_IN + panel_w + gap, content_top_in, text_w, USABLE_H_IN)
+            else:
+                # Bullets on left, image on right
+                add_bullets(slide, bullets, MARGIN_IN, content_top_in, text_w, USABLE_H_IN)
+                add_image_scaled(slide, img_path, MARGIN_IN + text_w + gap, content_top_in, panel_w, USABLE_H_IN)
+        else:
+            # Fewer bullets: keep original top-bottom layout
+            img_h = USABLE_H_IN * 0.7
+            text_h = USABLE_H_IN - img_h
+            add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, USABLE_W_IN, img_h)
+            add_bullets(slide, bullets, MARGIN_IN, content_top_in + img_h, USABLE_W_IN, text_h)
+
+    if spec.get("speaker_notes"):
+        slide.notes_slide.notes_text_frame.text = spec.get("speaker_notes")
+
+
+def build_presentation_from_plan(job_dir: Path, output_filename: str, streaming: bool | None = None):
+    """Builds the deck described by `job_dir/slides.json` and saves it as `output_filename`.
+
+    With `streaming` enabled each slide (and its media) is written to the output
+    zip as soon as it is populated, keeping peak memory flat for very large plans.
+    When `streaming` is None it is enabled for plans with at least
+    `settings.pptx_streaming_min_slides` slides.
+    """
     json_path = job_dir / "slides.json"
     output_path = job_dir / output_filename
 
     with open(json_path, 'r', encoding='utf-8') as f:
         specs = json.load(f)
 
+    if streaming is None:
+        streaming = 0 < settings.pptx_streaming_min_slides <= len(specs)
+
     prs = Presentation()
     prs.slide_width = Inches(SLIDE_W_IN)
     prs.slide_height = Inches(SLIDE_H_IN)
@@ -126,65 +198,16 @@ def build_presentation_from_plan(job_dir: Path, output_filename: str):
 
     image_files = sorted([f for f in job_dir.iterdir() if f.suffix.lower() in ['.png', '.jpg', '.jpeg']])
 
+    writer = StreamingPresentationWriter(prs, output_path) if streaming else None
     for i, spec in enumerate(specs):
         slide = prs.slides.add_slide(blank_layout)
-        
-        title_shape = slide.shapes.add_textbox(Inches(MARGIN_IN), Inches(MARGIN_IN), Inches(USABLE_W_IN), Inches(TITLE_H_IN))
-        title_shape.text_frame.text = spec.get("slide_title", " ")
-        title_shape.text_frame.paragraphs[0].font.size = Pt(32)
-        title_shape.text_frame.paragraphs[0].alignment = PP_PARAGRAPH_ALIGNMENT.CENTER
-        
-        content_top_in = MARGIN_IN + TITLE_H_IN
         img_path = image_files[i] if i < len(image_files) else None
-        classification = classify_image(img_path)
-        bullets = spec.get("slide_content", [])
-        
-        if not classification:
-            add_bullets(slide, bullets, MARGIN_IN, content_top_in, USABLE_W_IN, USABLE_H_IN)
-        elif classification in ["small-small", "small-large"]:
-            variant = random.choice(["left", "right"])
-            panel_w = USABLE_W_IN / 2.1
-            gap = 0.2
-            text_w = USABLE_W_IN - panel_w - gap
-            if variant == "left":
-                add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, panel_w, USABLE_H_IN)
-                add_bullets(slide, bullets, MARGIN_IN + panel_w + gap, content_top_in, text_w, USABLE_H_IN)
-            else:
-                add_bullets(slide, bullets, MARGIN_IN, content_top_in, text_w, USABLE_H_IN)
-                add_image_scaled(slide, img_path, MARGIN_IN + text_w + gap, content_top_in, panel_w, USABLE_H_IN)
-        elif classification == "large-small":
-            panel_h = USABLE_H_IN / 2.1
-            gap = 0.2
-            text_h = USABLE_H_IN - panel_h - gap
-            add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, USABLE_W_IN, panel_h)
-            add_bullets(slide, bullets, MARGIN_IN, content_top_in + panel_h + gap, USABLE_W_IN, text_h)
-        elif classification == "large-large":
-            # If there are many bullets, use a left-right (side-by-side) layout to avoid overflow.
-            if len(bullets) > 4:
-                gap = 0.2
-                # Give the image a bit more width since it's large in both dims
-                panel_w = USABLE_W_IN * 0.55
-                text_w = USABLE_W_IN - panel_w - gap
-
-                # Randomize which side the image goes on (optional)
-                variant = random.choice(["left", "right"])
-                if variant == "left":
-                    # Image on left, bullets on right
-                    add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, panel_w, USABLE_H_IN)
-                    add_bullets(slide, bullets, MARGIN_IN + panel_w + gap, content_top_in, text_w, USABLE_H_IN)
-                else:
-                    # Bullets on left, image on right
-                    add_bullets(slide, bullets, MARGIN_IN, content_top_in, text_w, USABLE_H_IN)
-                    add_image_scaled(slide, img_path, MARGIN_IN + text_w + gap, content_top_in, panel_w, USABLE_H_IN)
-            else:
-                # Fewer bullets: keep original top-bottom layout
-                img_h = USABLE_H_IN * 0.7
-                text_h = USABLE_H_IN - img_h
-                add_image_scaled(slide, img_path, MARGIN_IN, content_top_in, USABLE_W_IN, img_h)
-                add_bullets(slide, bullets, MARGIN_IN, content_top_in + img_h, USABLE_W_IN, text_h)
-
-        if spec.get("speaker_notes"):
-            slide.notes_slide.notes_text_frame.text = spec.get("speaker_notes")
-            
-    prs.save(output_path)
-    return output_path
\ No newline at end of file
+        _populate_slide(slide, spec, img_path)
+        if writer:
+            writer.flush()
+
+    if writer:
+        writer.close()
+    else:
+        prs.save(output_path)
+    return output_path
@@ -0,0 +1,157 @@
+"""Incremental .pptx writer that keeps memory flat for very large decks.
+
+python-pptx holds every slide part (and every embedded image) in memory until
+``Presentation.save``. ``StreamingPresentationWriter`` instead writes each
+finished slide, its notes slide and its media straight into the output zip and
+detaches them from the package graph, so only the shared parts (masters,
+layouts, theme, presentation.xml) stay resident. The content types stream and
+the presentation parts are written last, once all slides are known.
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+
+# Relationships from a slide (or its notes) to parts shared by the whole deck.
+# Those targets stay in the package and are written once, on close().
+_SHARED_RELTYPES = {RT.SLIDE_LAYOUT, RT.NOTES_MASTER, RT.SLIDE}
+_PARTNAME_IDX = re.compile(r"\d*(\.[^./]+)$")
+
+
+class _WrittenPart:
+    """Partname/content-type record for a part already flushed to the zip."""
+
+    def __init__(self, partname: PackURI, content_type: str) -> None:
+        self.partname = partname
+        self.content_type = content_type
+
+
+class _FlushedSlidePart(Part):
+    """Placeholder re-attached to the presentation part for a flushed slide.
+
+    It gives presentation.xml a real relationship to point at while carrying
+    no payload of its own; ``close()`` never writes it.
+    """
+
+
+class StreamingPresentationWriter:
+    """Write the slides of ``prs`` to ``output_path`` as soon as they are done.
+
+    Usage::
+
+        with StreamingPresentationWriter(prs, output_path) as writer:
+            for spec in specs:
+                slide = prs.slides.add_slide(layout)
+                ...  # populate the slide
+                writer.flush()
+    """
+
+    def __init__(self, prs, output_path) -> None:
+        self._prs = prs
+        self._package = prs.part.package
+        self._zipf = zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._written: List[_WrittenPart] = []
+        self._slide_partnames: List[PackURI] = []
+        self._media_by_sha1: Dict[str, PackURI] = {}
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._reserved: Set[str] = {str(p.partname) for p in self._package.iter_parts()}
+        self._closed = False
+
+    def __enter__(self) -> "StreamingPresentationWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._zipf.close()
+
+    @property
+    def slide_count(self) -> int:
+        return len(self._slide_partnames)
+
+    def flush(self) -> None:
+        """Write every slide currently in the presentation and release it."""
+        prs_part = self._prs.part
+        sldIdLst = prs_part._element.get_or_add_sldIdLst()
+        for sldId in list(sldIdLst):
+            rId = sldId.rId
+            self._write_slide(prs_part.related_part(rId))
+            sldIdLst.remove(sldId)
+            prs_part.drop_rel(rId)
+
+    def close(self) -> None:
+        """Write presentation.xml, the remaining shared parts and content types."""
+        if self._closed:
+            return
+        self.flush()
+        prs_part = self._prs.part
+        sldIdLst = prs_part._element.get_or_add_sldIdLst()
+        for partname in self._slide_partnames:
+            stub = _FlushedSlidePart(partname, CT.PML_SLIDE, self._package)
+            sldIdLst.add_sldId(prs_part.relate_to(stub, RT.SLIDE))
+
+        parts = [
+            part for part in self._package.iter_parts()
+            if not isinstance(part, _FlushedSlidePart)
+        ]
+        for part in parts:
+            self._write_part(part)
+        self._zipf.writestr(PACKAGE_URI.rels_uri.membername, self._package._rels.xml)
+        content_types = _ContentTypesItem.xml_for(parts + self._written)
+        self._zipf.writestr(CONTENT_TYPES_URI.membername, serialize_part_xml(content_types))
+        self._zipf.close()
+        self._closed = True
+
+    # --- internals ---
+    def _write_slide(self, slide_part) -> None:
+        owned = [slide_part]
+        self._collect_owned(slide_part, owned)
+        # Rename everything first: rels XML is rendered from target partnames.
+        to_write = []
+        for part in owned:
+            sha1 = getattr(part, "sha1", None)
+            if sha1 is not None and sha1 in self._media_by_sha1:
+                part.partname = self._media_by_sha1[sha1]
+                continue
+            part.partname = self._next_partname(part.partname)
+            if sha1 is not None:
+                self._media_by_sha1[sha1] = part.partname
+            to_write.append(part)
+        for part in to_write:
+            self._write_part(part)
+            self._written.append(_WrittenPart(part.partname, part.content_type))
+        self._slide_partnames.append(slide_part.partname)
+
+    def _collect_owned(self, part, owned: list) -> None:
+        for rel in part.rels.values():
+            if rel.is_external or rel.reltype in _SHARED_RELTYPES:
+                continue
+            target = rel.target_part
+            if target in owned:
+                continue
+            owned.append(target)
+            self._collect_owned(target, owned)
+
+    def _next_partname(self, partname: PackURI) -> PackURI:
+        tmpl = _PARTNAME_IDX.sub(r"%d\1", str(partname))
+        while True:
+            self._counters[tmpl] += 1
+            candidate = tmpl % self._counters[tmpl]
+            if candidate not in self._reserved:
+                self._reserved.add(candidate)
+                return PackURI(candidate)
+
+    def _write_part(self, part) -> None:
+        self._zipf.writestr(part.partname.membername, part.blob)
+        if part._rels:
+            self._zipf.writestr(part.partname.rels_uri.membername, part.rels.xml)
@@ -24,12 +24,29 @@ python health.py &
 pids+=($!)
 echo "Health server PID=${pids[-1]}"
 
-# 2) Start Celery worker (background)
-celery -A worker.celery_app.celery worker \
-  --loglevel=info --concurrency=1 \
-  --max-tasks-per-child=10 --max-memory-per-child=500000 &
-pids+=($!)
-echo "Celery PID=${pids[-1]}"
+# 2) Start Celery worker(s) (background). WORKER_ROLE picks the pool layout:
+#    io | cpu | split (io + cpu in this container) | all (single prefork child,
+#    the local-development default) | beat (the scheduler only)
+start_worker() {
+  # shellcheck disable=SC2046  # word-splitting the generated options is intended
+  celery -A worker.celery_app.celery worker --loglevel=info $(python -m worker.pools "$1") &
+  pids+=($!)
+  echo "Celery ($1) PID=${pids[-1]}"
+}
+# beat runs the periodic schedule (feedback compaction) and no worker; deploy
+# exactly one container with it, or scheduled tasks are sent more than once.
+start_beat() {
+  celery -A worker.celery_app.celery beat --loglevel=info --schedule=/tmp/celerybeat-schedule &
+  pids+=($!)
+  echo "Celery beat PID=${pids[-1]}"
+}
+case "${WORKER_ROLE:-all}" in
+  io)    start_worker io ;;
+  cpu)   start_worker cpu ;;
+  split) start_worker io; start_worker cpu ;;
+  beat)  start_beat ;;
+  *)     start_worker all ;;
+esac
 
 # 3) Run diagnostics NON-FATAL (log only)
 ( set +e
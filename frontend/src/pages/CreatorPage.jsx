@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { generateSlidePlan, buildPresentation, getJobStatus, API_BASE_URL } from '../services/api';
+import { generateSlidePlan, buildPresentation, getSlidePlan, watchJob, API_BASE_URL } from '../services/api';
 import SlideEditor from '../components/SlideEditor';
 import { Container, Title, Text, Button, Group, Loader, Alert, SimpleGrid, Stack, Stepper, Center, Card } from '@mantine/core';
 import { IconCircleCheck, IconAlertCircle, IconFileTypePdf, IconPhoto, IconBrain, IconX } from '@tabler/icons-react';
@@ -24,32 +24,28 @@ export default function CreatorPage() {
     const currentJobId = status === 'generating' ? planJobId : buildJobId;
     if (!currentJobId) return;
 
-    const intervalId = setInterval(async () => {
-      try {
-        const statusResult = await getJobStatus(currentJobId);
-        if (statusResult.status === 'SUCCESS') {
-          clearInterval(intervalId);
+    const fail = (message) => {
+      setError(message);
+      setStatus('error');
+    };
+
+    return watchJob(currentJobId, {
+      onComplete: async () => {
+        try {
           if (status === 'generating') {
-            setSlidePlan(statusResult.result.slide_plan); 
+            setSlidePlan(await getSlidePlan(currentJobId));
             setStatus('review');
           } else {
             const downloadUrl = `${API_BASE_URL}/api/v1/creator/download/${planJobId}`;
             setFinalUrl(downloadUrl);
             setStatus('complete');
           }
-        } else if (statusResult.status === 'FAILURE') {
-          clearInterval(intervalId);
-          setError('An error occurred during backend processing.');
-          setStatus('error');
+        } catch (err) {
+          fail(err.message);
         }
-      } catch (err) {
-        clearInterval(intervalId);
-        setError(err.message);
-        setStatus('error');
-      }
-    }, 5000);
-
-    return () => clearInterval(intervalId);
+      },
+      onFailed: fail,
+    });
   }, [status, planJobId, buildJobId]);
 
   const handleGeneratePlan = async () => {
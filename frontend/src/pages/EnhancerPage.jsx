@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { enhancePresentation, getJobStatus, API_BASE_URL } from '../services/api';
+import { enhancePresentation, watchJob, API_BASE_URL } from '../services/api';
 import { Container, Stack, Title, Text, Alert, Loader, Group, Button, TextInput, Stepper, Center, FileInput, Card } from '@mantine/core';
 import { IconCircleCheck, IconFileUpload, IconPhoto, IconTag, IconSparkles, IconAlertCircle, IconX } from '@tabler/icons-react';
 import { FileDropzone } from '../components/FileDropzone';
@@ -19,26 +19,14 @@ export default function EnhancerPage() {
 
   useEffect(() => {
     if (status !== 'processing' || !jobId) return;
-    
-    const intervalId = setInterval(async () => {
-      try {
-        const statusResult = await getJobStatus(jobId);
-        if (statusResult.status === 'SUCCESS') {
-          clearInterval(intervalId);
-          setStatus('complete');
-        } else if (statusResult.status === 'FAILURE') {
-          clearInterval(intervalId);
-          setError('An error occurred during backend processing.');
-          setStatus('error');
-        }
-      } catch (err) {
-        clearInterval(intervalId);
-        setError(err.message);
-        setStatus('error');
-      }
-    }, 5000);
 
-    return () => clearInterval(intervalId);
+    return watchJob(jobId, {
+      onComplete: () => setStatus('complete'),
+      onFailed: (message) => {
+        setError(message);
+        setStatus('error');
+      },
+    });
   }, [status, jobId]);
 
   const handleSubmit = async (event) => {
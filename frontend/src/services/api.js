@@ -81,6 +81,73 @@ export async function getJobStatus(jobId) {
   return response.json();
 }
 
+const JOB_POLL_INTERVAL_MS = 5000;
+const JOB_FAILED_MESSAGE = 'An error occurred during backend processing.';
+
+/**
+ * Follows a job over the Server-Sent Events stream until it completes or
+ * fails. Polls the status endpoint instead if the stream errors.
+ * @param {string} jobId - The ID of the job to follow.
+ * @param {{onComplete: Function, onFailed: Function}} handlers - `onFailed` receives an error message.
+ * @returns {Function} - Stops following the job.
+ */
+export function watchJob(jobId, { onComplete, onFailed }) {
+  let source = null;
+  let intervalId = null;
+  let stopped = false;
+
+  const stop = () => {
+    stopped = true;
+    if (source) source.close();
+    clearInterval(intervalId);
+  };
+  const finish = (callback, ...args) => {
+    if (stopped) return;
+    stop();
+    callback(...args);
+  };
+  const poll = () => {
+    intervalId = setInterval(async () => {
+      try {
+        const statusResult = await getJobStatus(jobId);
+        if (statusResult.status === 'SUCCESS') finish(onComplete);
+        else if (statusResult.status === 'FAILURE') finish(onFailed, JOB_FAILED_MESSAGE);
+      } catch (err) {
+        finish(onFailed, err.message);
+      }
+    }, JOB_POLL_INTERVAL_MS);
+  };
+
+  if (typeof EventSource === 'undefined') {
+    poll();
+    return stop;
+  }
+  source = new EventSource(`${API_BASE_URL}/api/v1/jobs/events/${jobId}`);
+  source.onmessage = (message) => {
+    const { stage } = JSON.parse(message.data);
+    if (stage === 'complete') finish(onComplete);
+    else if (stage === 'failed') finish(onFailed, JOB_FAILED_MESSAGE);
+  };
+  source.onerror = () => {
+    // Don't let EventSource keep reconnecting (e.g. on a 503): poll instead.
+    source.close();
+    source = null;
+    if (!stopped) poll();
+  };
+  return stop;
+}
+
+/**
+ * Fetches the slide plan generated for a creator job.
+ * @param {string} jobId - The ID of the plan generation job.
+ * @returns {Promise<object[]>}
+ */
+export async function getSlidePlan(jobId) {
+  const response = await fetch(`${API_BASE_URL}/api/v1/creator/plan/${jobId}`);
+  if (!response.ok) throw new Error(`API Error: ${response.statusText}`);
+  return response.json();
+}
+
 // ... (all existing functions)
 
 /**